@@ -0,0 +1,76 @@
+# /app/bulk_upsert.py
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Table, bindparam, insert, update
+
+Row = Dict[str, Any]
+
+
+def _dialect_insert(dialect: str, table: Table):
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        return mysql_insert(table)
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        return sqlite_insert(table)
+    return insert(table)
+
+
+def upsert_rows(
+    s,
+    table: Table,
+    rows: List[Row],
+    *,
+    key: Sequence[str],
+    update_columns: Sequence[str],
+) -> None:
+    """
+    Insert ``rows`` in one executemany. A row whose ``key`` columns already
+    exist updates ``update_columns`` instead: ON DUPLICATE KEY UPDATE on
+    MySQL, ON CONFLICT DO UPDATE on SQLite. Other dialects get a plain INSERT.
+    """
+    if not rows:
+        return
+    dialect = s.get_bind().dialect.name
+    stmt = _dialect_insert(dialect, table)
+    if dialect == "mysql":
+        stmt = stmt.on_duplicate_key_update(
+            {name: stmt.inserted[name] for name in update_columns}
+        )
+    elif dialect == "sqlite":
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={name: stmt.excluded[name] for name in update_columns},
+        )
+    s.execute(stmt, rows)
+
+
+def insert_rows(s, table: Table, rows: List[Row]) -> None:
+    if rows:
+        s.execute(insert(table), rows)
+
+
+def update_rows(s, table: Table, rows: List[Row], *, pk: str = "id") -> None:
+    """
+    UPDATE rows by primary key with one executemany per set of columns.
+    Each row holds ``pk`` plus the columns to set.
+    """
+    groups: Dict[tuple, List[Row]] = {}
+    for row in rows:
+        columns = tuple(sorted(name for name in row if name != pk))
+        if columns:
+            groups.setdefault(columns, []).append(row)
+    for columns, group in groups.items():
+        # Bind names must not clash with column names in an UPDATE.
+        stmt = (
+            update(table)
+            .where(table.c[pk] == bindparam(f"b_{pk}"))
+            .values({name: bindparam(f"b_{name}") for name in columns})
+        )
+        s.execute(
+            stmt, [{f"b_{name}": value for name, value in row.items()} for row in group]
+        )
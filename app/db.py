@@ -108,15 +108,21 @@ def make_engine(db_url: str):
     elif db_url.startswith("sqlite"):
         # The dashboard and tests can share SQLite connections across threads.
         connect_args["check_same_thread"] = False
+    pool_args = {}
+    if not db_url.startswith("sqlite"):
+        # SQLite's pool classes reject sizing arguments, even as None.
+        pool_args = {
+            "pool_size": 10,
+            "max_overflow": 5,
+            "pool_timeout": 30,
+            "pool_recycle": 1800,
+        }
     engine = create_engine(
         db_url,
         future=True,
         pool_pre_ping=True,
-        pool_size=10 if not db_url.startswith("sqlite") else None,
-        max_overflow=5 if not db_url.startswith("sqlite") else None,
-        pool_timeout=30 if not db_url.startswith("sqlite") else None,
-        pool_recycle=1800 if not db_url.startswith("sqlite") else None,
         connect_args=connect_args,
+        **pool_args,
     )
     if db_url.startswith("mysql+pymysql://"):
         # MySQL DATETIME does not retain timezone metadata, so every connection
@@ -0,0 +1,177 @@
+# /app/devtools.py
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+# URL patterns for Network.setBlockedURLs, grouped so steps.json can opt into
+# categories by name. Stylesheets are available but not a default because
+# some boards rely on CSS to hide overlays that would block clicks.
+RESOURCE_BLOCK_PATTERNS: Dict[str, List[str]] = {
+    "images": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg",
+        "*.ico", "*.bmp",
+    ],
+    "media": ["*.mp4", "*.webm", "*.m4v", "*.mov", "*.mp3", "*.m4a", "*.ogg", "*.wav"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheets": ["*.css"],
+    "trackers": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*googleadservices.com*",
+        "*connect.facebook.net*",
+        "*hotjar.com*",
+        "*segment.com*",
+        "*segment.io*",
+        "*optimizely.com*",
+        "*fullstory.com*",
+        "*nr-data.net*",
+        "*js-agent.newrelic.com*",
+        "*clarity.ms*",
+        "*snap.licdn.com*",
+        "*px.ads.linkedin.com*",
+        "*bat.bing.com*",
+        "*onetrust.com*",
+        "*cookielaw.org*",
+    ],
+}
+DEFAULT_BLOCK_CATEGORIES = ("images", "media", "fonts", "trackers")
+
+# Blocked requests never download, so savings use typical transfer sizes per
+# Chrome resource type. Treat the logged figure as an estimate.
+_ESTIMATED_BLOCKED_BYTES: Dict[str, int] = {
+    "Image": 40_000,
+    "Media": 500_000,
+    "Font": 35_000,
+    "Stylesheet": 30_000,
+    "Script": 60_000,
+}
+_ESTIMATED_OTHER_BYTES = 10_000
+
+_REQUEST_STARTED = "Network.requestWillBeSent"
+_REQUEST_FINISHED = "Network.loadingFinished"
+_REQUEST_FAILED = "Network.loadingFailed"
+
+
+def parse_block_categories(value: Any) -> List[str]:
+    """Normalize a block_resources setting (bool, list, or comma string)."""
+    if value is None or value is False:
+        return []
+    if value is True:
+        return list(DEFAULT_BLOCK_CATEGORIES)
+    if isinstance(value, str):
+        low = value.strip().lower()
+        if low in ("", "false", "0", "no", "off"):
+            return []
+        if low in ("true", "1", "yes", "on"):
+            return list(DEFAULT_BLOCK_CATEGORIES)
+        value = low.split(",")
+    if isinstance(value, Iterable):
+        cats = [str(v).strip().lower() for v in value]
+        return [c for c in cats if c in RESOURCE_BLOCK_PATTERNS]
+    return []
+
+
+def env_block_categories() -> List[str]:
+    return parse_block_categories(os.getenv("BLOCK_RESOURCES", ""))
+
+
+def block_patterns(categories: Iterable[str]) -> List[str]:
+    patterns: List[str] = []
+    for cat in categories:
+        patterns.extend(RESOURCE_BLOCK_PATTERNS.get(cat, []))
+    return patterns
+
+
+def apply_resource_blocking(driver: Any, patterns: List[str]) -> None:
+    """Set (or clear, with an empty list) the driver's blocked URL patterns."""
+    if getattr(driver, "_jobscrape_blocked_urls", None) == patterns:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    setattr(driver, "_jobscrape_blocked_urls", list(patterns))
+
+
+class NetworkLog:
+    """
+    Running view of a driver's network activity, built from the Chrome
+    performance log. The log can only be read once, so adaptive waits and
+    resource-blocking stats share this per-driver reader.
+    """
+
+    # Requests that never report completion (long polls, beacons cut off by a
+    # navigation) stop counting as in flight after this long.
+    STALE_SECS = 30.0
+
+    def __init__(self) -> None:
+        self.available = True
+        self.inflight: Dict[str, float] = {}
+        self.last_activity = 0.0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.bytes_loaded = 0
+        self.blocked: Dict[str, int] = {}
+
+    def drain(self, driver: Any) -> bool:
+        """Apply buffered events; returns False if performance logging is off."""
+        if not self.available:
+            return False
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            self.available = False
+            return False
+
+        for entry in entries:
+            try:
+                message = json.loads(entry.get("message") or "{}").get("message") or {}
+            except ValueError:
+                continue
+            method = message.get("method")
+            params = message.get("params") or {}
+            request_id = params.get("requestId")
+            if not request_id:
+                continue
+            # Log timestamps are wall-clock ms, so a page that went quiet
+            # before a wait started is recognized as idle immediately.
+            stamp = float(entry.get("timestamp") or 0) / 1000.0
+            if method == _REQUEST_STARTED:
+                self.inflight[request_id] = stamp
+            elif method == _REQUEST_FINISHED:
+                self.inflight.pop(request_id, None)
+                self.bytes_loaded += int(params.get("encodedDataLength") or 0)
+            elif method == _REQUEST_FAILED:
+                self.inflight.pop(request_id, None)
+                if params.get("blockedReason"):
+                    kind = str(params.get("type") or "Other")
+                    self.blocked[kind] = self.blocked.get(kind, 0) + 1
+            else:
+                continue
+            self.last_activity = max(self.last_activity, stamp)
+
+        cutoff = time.time() - self.STALE_SECS
+        for request_id, started in list(self.inflight.items()):
+            if started and started < cutoff:
+                del self.inflight[request_id]
+        return True
+
+    def blocked_count(self) -> int:
+        return sum(self.blocked.values())
+
+    def estimated_bytes_saved(self) -> int:
+        return sum(
+            count * _ESTIMATED_BLOCKED_BYTES.get(kind, _ESTIMATED_OTHER_BYTES)
+            for kind, count in self.blocked.items()
+        )
+
+
+def network_log(driver: Any) -> NetworkLog:
+    log: Optional[NetworkLog] = getattr(driver, "_jobscrape_network_log", None)
+    if log is None:
+        log = NetworkLog()
+        setattr(driver, "_jobscrape_network_log", log)
+    return log
@@ -0,0 +1,71 @@
+# /app/driver_memory.py
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _children_by_parent() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r", encoding="utf-8") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces or parens; fields after it don't.
+        fields = stat.rsplit(")", 1)[-1].split()
+        if len(fields) > 1:
+            children.setdefault(int(fields[1]), []).append(int(name))
+    return children
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm", "r", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def process_tree_pids(root_pid: int) -> List[int]:
+    """A process and all its descendants, root first. Only the root off Linux."""
+    if not os.path.isdir("/proc"):
+        return [root_pid]
+    children = _children_by_parent()
+    pids: List[int] = []
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        if pid in pids:
+            continue
+        pids.append(pid)
+        pending.extend(children.get(pid, ()))
+    return pids
+
+
+def process_tree_rss(root_pid: int) -> Optional[int]:
+    """
+    Resident bytes of a process and all its descendants, read from /proc.
+    Pages shared between Chrome processes are counted once per process, so
+    this overstates real usage, but it tracks growth well. None off Linux.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    return sum(_rss_bytes(pid) for pid in process_tree_pids(root_pid))
+
+
+def driver_rss_bytes(driver: Any) -> Optional[int]:
+    """RSS of chromedriver plus the Chrome processes it started."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    pid = getattr(process, "pid", None)
+    if not pid:
+        return None
+    try:
+        return process_tree_rss(int(pid))
+    except OSError:
+        return None
@@ -0,0 +1,278 @@
+# /app/fixtures.py
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import urldefrag, urlparse
+
+# Reads what the scraper sees after rendering. Non-HTML documents (JSON APIs)
+# are stored as their text so replay shows Chrome the same body.
+_PAGE_SNAPSHOT_JS = (
+    "return [document.contentType || 'text/html',"
+    " document.documentElement ? document.documentElement.outerHTML : '',"
+    " document.body ? document.body.innerText : ''];"
+)
+_SCRIPT_RE = re.compile(r"<script\b.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+
+
+@dataclass
+class Fixture:
+    url: str
+    status: int
+    content_type: str
+    body: str
+    location: Optional[str] = None
+
+
+def _fixture_url(url: str) -> str:
+    return urldefrag(url)[0]
+
+
+class FixtureStore:
+    """
+    Directory of gzip-compressed JSON fixtures, one file per URL. Later saves
+    of the same URL replace earlier ones, so the stored page is the last state
+    the scraper read.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def path_for(self, url: str) -> str:
+        digest = hashlib.sha1(_fixture_url(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, f"{digest[:20]}.json.gz")
+
+    def save(self, fixture: Fixture) -> None:
+        doc = {
+            "url": _fixture_url(fixture.url),
+            "status": fixture.status,
+            "content_type": fixture.content_type,
+            "body": fixture.body,
+            "location": fixture.location,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        path = self.path_for(fixture.url)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False)
+        with self._lock:
+            os.replace(tmp, path)
+
+    def load(self, url: str) -> Optional[Fixture]:
+        path = self.path_for(url)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            doc = json.load(f)
+        return Fixture(
+            url=doc.get("url") or url,
+            status=int(doc.get("status") or 200),
+            content_type=doc.get("content_type") or "text/html; charset=utf-8",
+            body=doc.get("body") or "",
+            location=doc.get("location"),
+        )
+
+    def count(self) -> int:
+        return sum(1 for name in os.listdir(self.root) if name.endswith(".json.gz"))
+
+
+class FixtureSession:
+    """No-op base; StepScraper calls these hooks at every page it reads."""
+
+    mode = "live"
+
+    def nav_url(self, url: str) -> str:
+        return url
+
+    def live_url(self, url: str) -> str:
+        return url
+
+    def chrome_arguments(self) -> list[str]:
+        return []
+
+    def record_driver_page(self, driver: Any, requested_url: Optional[str] = None) -> None:
+        return None
+
+    def record_http_page(self, requested_url: str, page: Any) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class FixtureRecorder(FixtureSession):
+    """Saves every page a live scraper run reads into a FixtureStore."""
+
+    mode = "record"
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+
+    def record_driver_page(self, driver: Any, requested_url: Optional[str] = None) -> None:
+        try:
+            url = driver.current_url
+            content_type, html, text = driver.execute_script(_PAGE_SNAPSHOT_JS)
+        except Exception as e:
+            print(f"[warn] fixture snapshot failed: {e}")
+            return
+        if "html" in (content_type or ""):
+            body = "<!DOCTYPE html>\n" + (html or "")
+            content_type = "text/html; charset=utf-8"
+        else:
+            body = text or ""
+            content_type = f"{content_type}; charset=utf-8"
+        self.store.save(Fixture(url=url, status=200, content_type=content_type, body=body))
+        self._record_redirect(requested_url, url)
+
+    def record_http_page(self, requested_url: str, page: Any) -> None:
+        if not page.ok:
+            return
+        self.store.save(
+            Fixture(
+                url=page.url,
+                status=page.status,
+                content_type="text/html; charset=utf-8",
+                body=page.text,
+            )
+        )
+        self._record_redirect(requested_url, page.url)
+
+    def _record_redirect(self, requested_url: Optional[str], final_url: str) -> None:
+        # Replay requests the URL the steps ask for, so keep the hop to the
+        # page that was actually stored.
+        if requested_url and _fixture_url(requested_url) != _fixture_url(final_url):
+            self.store.save(
+                Fixture(
+                    url=requested_url,
+                    status=302,
+                    content_type="text/plain",
+                    body="",
+                    location=final_url,
+                )
+            )
+
+
+class FixtureReplayer(FixtureSession):
+    """
+    Serves a FixtureStore from a local HTTP stand-in. A live URL such as
+    https://host/a?b maps to http://127.0.0.1:<port>/https/host/a?b, so
+    relative links keep resolving inside the mirror. Chrome is started with
+    every other host unresolvable, which keeps replays offline.
+    """
+
+    mode = "replay"
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+        # Requests are served on handler threads, several drivers at a time.
+        self._miss_lock = threading.Lock()
+        self.misses = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fixture-replay", daemon=True
+        )
+        self._thread.start()
+
+    def nav_url(self, url: str) -> str:
+        if not url or url.startswith(self.base):
+            return url
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            return url
+        mirrored = f"{self.base}/{parsed.scheme}/{parsed.netloc}{parsed.path or '/'}"
+        if parsed.query:
+            mirrored += f"?{parsed.query}"
+        if parsed.fragment:
+            mirrored += f"#{parsed.fragment}"
+        return mirrored
+
+    def live_url(self, url: str) -> str:
+        if not url or not url.startswith(self.base + "/"):
+            return url
+        scheme, _, rest = url[len(self.base) + 1 :].partition("/")
+        if scheme not in ("http", "https"):
+            return url
+        netloc, _, tail = rest.partition("/")
+        return f"{scheme}://{netloc}/{tail}"
+
+    def chrome_arguments(self) -> list[str]:
+        return ["--host-resolver-rules=MAP * ~NOTFOUND , EXCLUDE 127.0.0.1"]
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self) -> type:
+        replayer = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                replayer._serve(self)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return None
+
+        return _Handler
+
+    def _serve(self, handler: BaseHTTPRequestHandler) -> None:
+        live = self.live_url(self.base + handler.path)
+        if live == self.base + handler.path:
+            # A root-relative link ("/jobs/1") clicked inside a mirrored page
+            # lost its /scheme/host prefix; recover it from the Referer.
+            referer = self.live_url(handler.headers.get("Referer") or "")
+            parsed = urlparse(referer)
+            if parsed.scheme and parsed.netloc:
+                self._send(
+                    handler,
+                    302,
+                    "text/plain",
+                    b"",
+                    self.nav_url(f"{parsed.scheme}://{parsed.netloc}{handler.path}"),
+                )
+                return
+            self._send(handler, 404, "text/plain", b"no fixture")
+            return
+
+        fixture = self.store.load(live)
+        if fixture is None:
+            with self._miss_lock:
+                self.misses += 1
+            self._send(handler, 404, "text/plain", f"no fixture for {live}".encode())
+            return
+        if fixture.location:
+            self._send(handler, fixture.status, "text/plain", b"", self.nav_url(fixture.location))
+            return
+        body = fixture.body
+        if "html" in fixture.content_type:
+            # Snapshots are already rendered; running the page's scripts again
+            # would only try to reach the live site.
+            body = _SCRIPT_RE.sub("", body)
+        self._send(handler, fixture.status, fixture.content_type, body.encode("utf-8"))
+
+    @staticmethod
+    def _send(
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        content_type: str,
+        body: bytes,
+        location: Optional[str] = None,
+    ) -> None:
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        if location:
+            handler.send_header("Location", location)
+        handler.end_headers()
+        handler.wfile.write(body)
@@ -0,0 +1,184 @@
+# /app/http_fetch.py
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+import urllib3
+
+from .rate_limit import DomainRateLimiter, registrable_domain, shared_rate_limiter
+
+# Some boards serve an empty shell or a 403 to library user agents.
+_DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+@dataclass
+class HttpPage:
+    url: str
+    status: int
+    text: str
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 400
+
+
+def cookie_header(url: str, cookies: Optional[List[Dict[str, Any]]]) -> str:
+    """Build a Cookie header from Selenium-style cookie dicts for one URL."""
+    if not cookies:
+        return ""
+    host = (urlparse(url).hostname or "").lower()
+    pairs: List[str] = []
+    for cookie in cookies:
+        name = cookie.get("name")
+        if not name:
+            continue
+        domain = str(cookie.get("domain") or "").lower().lstrip(".")
+        # Selenium only returns cookies visible to the current page, but detail
+        # links can point at a sibling host, so keep the usual domain match.
+        if domain and host != domain and not host.endswith("." + domain):
+            continue
+        pairs.append(f"{name}={cookie.get('value', '')}")
+    return "; ".join(pairs)
+
+
+def _decode_body(data: bytes, content_type: str) -> str:
+    charset = "utf-8"
+    for part in content_type.split(";"):
+        key, _, value = part.strip().partition("=")
+        if key.lower() == "charset" and value:
+            charset = value.strip().strip('"')
+    try:
+        return data.decode(charset, errors="replace")
+    except LookupError:
+        return data.decode("utf-8", errors="replace")
+
+
+class HttpFetcher:
+    """
+    Pooled keep-alive HTTP client for pages that do not need a browser.
+
+    Connections are reused per host by urllib3. Each registrable domain gets
+    at most HTTP_PER_DOMAIN_LIMIT requests in flight, and every request takes
+    a token from the shared DomainRateLimiter, which also retries after a
+    429/503 backoff.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: Optional[float] = None,
+        per_domain_limit: Optional[int] = None,
+        limiter: Optional[DomainRateLimiter] = None,
+    ):
+        self.timeout = timeout or _env_float("HTTP_FETCH_TIMEOUT_SEC", 20.0)
+        self.per_domain_limit = max(
+            1, per_domain_limit or _env_int("HTTP_PER_DOMAIN_LIMIT", 4)
+        )
+        self._pool = urllib3.PoolManager(
+            num_pools=32,
+            maxsize=self.per_domain_limit,
+            # 429/503 Retry-After is handled by the shared limiter, so every
+            # request to the domain waits, not just this one.
+            retries=urllib3.Retry(
+                connect=2,
+                read=1,
+                redirect=5,
+                backoff_factor=0.5,
+                respect_retry_after_header=False,
+            ),
+            timeout=urllib3.Timeout(total=self.timeout),
+        )
+        self.user_agent = os.getenv("HTTP_USER_AGENT") or _DEFAULT_USER_AGENT
+        self.limiter = limiter or shared_rate_limiter()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._slots_lock = threading.Lock()
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        domain = registrable_domain(url)
+        with self._slots_lock:
+            slot = self._slots.get(domain)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_domain_limit)
+                self._slots[domain] = slot
+            return slot
+
+    def get(
+        self,
+        url: str,
+        *,
+        cookies: Optional[List[Dict[str, Any]]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> HttpPage:
+        request_headers = {"User-Agent": self.user_agent}
+        request_headers.update(headers or {})
+        cookie = cookie_header(url, cookies)
+        if cookie:
+            request_headers["Cookie"] = cookie
+        for attempt in range(self.limiter.retries + 1):
+            # Wait for a token before taking a slot, so a throttled domain does
+            # not hold connections while it sleeps.
+            self.limiter.acquire(url)
+            try:
+                with self._slot(url):
+                    resp = self._pool.request("GET", url, headers=request_headers)
+            except Exception as e:
+                return HttpPage(url=url, status=0, text="", error=str(e))
+            backoff = self.limiter.observe(
+                url, resp.status, resp.headers.get("Retry-After")
+            )
+            if not backoff:
+                break
+
+        # resp.url is only the request path, so follow the redirect history to
+        # get an absolute final URL for current_url columns and link joins.
+        final_url = url
+        for entry in getattr(resp.retries, "history", None) or ():
+            if entry.redirect_location:
+                final_url = urljoin(final_url, entry.redirect_location)
+        text = _decode_body(resp.data or b"", resp.headers.get("Content-Type", ""))
+        return HttpPage(url=final_url, status=resp.status, text=text)
+
+    def get_many(
+        self,
+        urls: List[str],
+        *,
+        cookies: Optional[List[Dict[str, Any]]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> List[HttpPage]:
+        """Fetch URLs concurrently; results keep the order of ``urls``."""
+        if not urls:
+            return []
+        domains = {registrable_domain(u) for u in urls}
+        workers = max(1, min(len(urls), self.per_domain_limit * len(domains), 16))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(
+                pool.map(
+                    lambda u: self.get(u, cookies=cookies, headers=headers), urls
+                )
+            )
+
+    def close(self) -> None:
+        self._pool.clear()
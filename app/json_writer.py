@@ -11,3 +11,39 @@ def save_site_json(output_dir: str, site: str, jobs: list[dict]) -> str:
     os.replace(tmp, out)
     print(f"[save] {out}")
     return out
+
+
+class SiteJsonStream:
+    """
+    Writes the same file as save_site_json for a site that arrives in
+    chunks, appending each chunk instead of holding the whole list.
+    """
+
+    def __init__(self, output_dir: str, site: str):
+        os.makedirs(output_dir, exist_ok=True)
+        self.out = os.path.join(output_dir, f"{site}_job_postings.json")
+        self._tmp = self.out + ".tmp"
+        self._f = open(self._tmp, "w", encoding="utf-8")
+        self.count = 0
+
+    def write(self, jobs: list[dict]) -> None:
+        for job in jobs:
+            body = json.dumps(job, ensure_ascii=False, indent=4)
+            self._f.write("[\n" if not self.count else ",\n")
+            self._f.write("\n".join("    " + line for line in body.splitlines()))
+            self.count += 1
+
+    def close(self) -> str:
+        self._f.write("\n]" if self.count else "[]")
+        self._f.close()
+        os.replace(self._tmp, self.out)
+        print(f"[save] {self.out}")
+        return self.out
+
+    def discard(self) -> None:
+        """Abandon an unfinished file; the last complete one stays in place."""
+        self._f.close()
+        try:
+            os.remove(self._tmp)
+        except FileNotFoundError:
+            pass
@@ -113,6 +113,11 @@ class Job(Base):
 
     # Delta tracking on the job itself
     content_hash = Column(String(64))  # sha256 of canonical fields
+    # sha256 of the raw list-page fields; lets incremental runs skip detail pages
+    list_fingerprint = Column(String(64), nullable=True)
+    # sha256 of the scraped fields before normalization (run.NORMALIZER_VERSION
+    # included); a match means the job needs no normalizing
+    raw_hash = Column(String(64), nullable=True)
     is_active = Column(Boolean, nullable=False, server_default="1")
     first_seen_run_id = Column(Integer)
     last_seen_run_id = Column(Integer)
@@ -174,6 +179,68 @@ class JobChange(Base):
     job = relationship("Job", back_populates="changes")
 
 
+class SiteCheckpoint(Base):
+    """
+    Progress of one site within a run, written in the same transaction as the
+    site's job rows so ``run.py steps --resume`` knows what was committed.
+    """
+
+    __tablename__ = "site_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("run_id", "site", name="uq_checkpoint_run_site"),
+        {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(
+        Integer, ForeignKey("integration_runs.id", ondelete="CASCADE"), nullable=False
+    )
+    site = Column(String(255), nullable=False)
+    status = Column(String(16), nullable=False)  # 'running' | 'done'
+    jobs_saved = Column(Integer, server_default="0", nullable=False)
+    # The site's share of the run's delta counters, as JSON
+    counters = Column(Text, nullable=True)
+    # JSON list of the site's canned sentences once every job is in (or once
+    # its descriptions share none); NULL while they are still being gathered.
+    canned_sentences = Column(LONGTEXT().with_variant(Text, "sqlite"), nullable=True)
+    # Why the scrape of the site ended early (time budget, crash); NULL when
+    # it finished. Row-level errors only show in counters.
+    site_error = Column(Text, nullable=True)
+    updated_at = Column(
+        DateTime(timezone=False), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class SiteQueueItem(Base):
+    """
+    One site of a run waiting for, or held by, a ``run.py worker`` process.
+    A claim is a lease: a worker that stops renewing it loses the site to the
+    next worker once ``lease_expires_at`` passes.
+    """
+
+    __tablename__ = "site_queue"
+    __table_args__ = (
+        UniqueConstraint("run_id", "site", name="uq_site_queue_run_site"),
+        {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(
+        Integer, ForeignKey("integration_runs.id", ondelete="CASCADE"), nullable=False
+    )
+    site = Column(String(255), nullable=False)
+    status = Column(
+        String(16), nullable=False, server_default="pending"
+    )  # 'pending' | 'claimed' | 'done' | 'failed'
+    worker = Column(String(255), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=False), nullable=True)
+    attempts = Column(Integer, server_default="0", nullable=False)
+    last_error = Column(Text, nullable=True)
+    updated_at = Column(
+        DateTime(timezone=False), server_default=func.now(), onupdate=func.now()
+    )
+
+
 # ---------- DB URL resolution (env-first, enforced utf8mb4 for MySQL) ----------
 # Keep these public names stable for scripts that import app.models directly.
 DATABASE_URL = resolve_db_url()
@@ -198,6 +265,32 @@ def ensure_job_reference_fields_column(bind=None) -> None:
         conn.execute(text(f"ALTER TABLE jobs ADD COLUMN reference_fields {column_type}"))
 
 
+def ensure_job_list_fingerprint_column(bind=None) -> None:
+    """Add the incremental-scrape list fingerprint column on existing databases."""
+    target = bind or engine
+    inspector = sa_inspect(target)
+    if "jobs" not in inspector.get_table_names():
+        return
+    columns = {col["name"] for col in inspector.get_columns("jobs")}
+    if "list_fingerprint" in columns:
+        return
+    with target.begin() as conn:
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN list_fingerprint VARCHAR(64)"))
+
+
+def ensure_job_raw_hash_column(bind=None) -> None:
+    """Add the pre-normalization content hash column on existing databases."""
+    target = bind or engine
+    inspector = sa_inspect(target)
+    if "jobs" not in inspector.get_table_names():
+        return
+    columns = {col["name"] for col in inspector.get_columns("jobs")}
+    if "raw_hash" in columns:
+        return
+    with target.begin() as conn:
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN raw_hash VARCHAR(64)"))
+
+
 def ensure_job_compensation_columns(bind=None) -> None:
     """Add structured compensation columns to existing databases."""
     target = bind or engine
@@ -229,8 +322,31 @@ def ensure_job_compensation_columns(bind=None) -> None:
                 conn.execute(text(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}"))
 
 
+def ensure_checkpoint_columns(bind=None) -> None:
+    """Add site checkpoint columns newer than the table on existing databases."""
+    target = bind or engine
+    inspector = sa_inspect(target)
+    if "site_checkpoints" not in inspector.get_table_names():
+        return
+    existing = {col["name"] for col in inspector.get_columns("site_checkpoints")}
+    text_type = "LONGTEXT" if target.dialect.name == "mysql" else "TEXT"
+    definitions = {
+        "canned_sentences": text_type,
+        "site_error": "TEXT",
+    }
+    with target.begin() as conn:
+        for name, column_type in definitions.items():
+            if name not in existing:
+                conn.execute(
+                    text(f"ALTER TABLE site_checkpoints ADD COLUMN {name} {column_type}")
+                )
+
+
 def init_db() -> None:
     """Create tables and apply the small additive runtime schema updates."""
     Base.metadata.create_all(bind=engine)
     ensure_job_reference_fields_column(engine)
     ensure_job_compensation_columns(engine)
+    ensure_job_list_fingerprint_column(engine)
+    ensure_job_raw_hash_column(engine)
+    ensure_checkpoint_columns(engine)
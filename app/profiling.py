@@ -0,0 +1,112 @@
+# /app/profiling.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+@dataclass
+class StepStats:
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    items: int = 0
+
+
+class StepProfiler:
+    """
+    Aggregates time per executed step, keyed by site and steps.json path.
+
+    Wall time comes from perf_counter and CPU time from the calling thread's
+    thread_time, so the difference is time spent waiting on the browser,
+    network, or sleeps. "step" rows are top-level steps; "inner" rows are the
+    extract/redirect/sleep/pagination work nested inside them, so the two
+    kinds overlap and should not be added together.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str, str, str], StepStats] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+    @staticmethod
+    def start() -> Tuple[float, float]:
+        return time.perf_counter(), time.thread_time()
+
+    def stop(
+        self,
+        probe: Tuple[float, float],
+        *,
+        site: str,
+        path: str,
+        action: str,
+        kind: str = "step",
+        items: int = 0,
+    ) -> None:
+        wall = time.perf_counter() - probe[0]
+        cpu = time.thread_time() - probe[1]
+        key = (site, path, action, kind)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StepStats()
+            stats.calls += 1
+            stats.wall += wall
+            stats.cpu += min(cpu, wall)
+            stats.items += items
+
+    @contextmanager
+    def measure(
+        self, *, site: str, path: str, action: str, kind: str = "inner", items: int = 1
+    ) -> Iterator[None]:
+        probe = self.start()
+        try:
+            yield
+        finally:
+            self.stop(probe, site=site, path=path, action=action, kind=kind, items=items)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            snapshot = list(self._stats.items())
+        rows = [
+            {
+                "site": site,
+                "path": path,
+                "action": action,
+                "kind": kind,
+                "calls": stats.calls,
+                "wall_s": round(stats.wall, 4),
+                "cpu_s": round(stats.cpu, 4),
+                "wait_s": round(stats.wall - stats.cpu, 4),
+                "items": stats.items,
+            }
+            for (site, path, action, kind), stats in snapshot
+        ]
+        rows.sort(key=lambda row: row["wall_s"], reverse=True)
+        return rows
+
+    def site_rows(self, site: str) -> List[Dict[str, Any]]:
+        return [r for r in self.rows() if r["site"] == site and r["kind"] == "step"]
+
+    def top(self, n: int) -> List[Dict[str, Any]]:
+        return self.rows()[: max(0, n)]
+
+    def write_json(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        doc = {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "steps": self.rows(),
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        return path
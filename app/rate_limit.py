@@ -0,0 +1,247 @@
+# /app/rate_limit.py
+from __future__ import annotations
+
+import ipaddress
+import os
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+# Statuses that mean "slow down" rather than "this page is broken".
+BACKOFF_STATUSES = frozenset({429, 503})
+
+# Enough of the public suffix list for the hosts job boards live on; anything
+# else is grouped by its last two labels.
+_TWO_LEVEL_SUFFIXES = {
+    "co.uk",
+    "org.uk",
+    "ac.uk",
+    "gov.uk",
+    "com.au",
+    "net.au",
+    "org.au",
+    "co.nz",
+    "co.jp",
+    "co.in",
+    "co.za",
+    "com.br",
+    "com.mx",
+    "com.sg",
+}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def registrable_domain(url_or_host: str) -> str:
+    """
+    Group hosts by the domain that owns them, so acme.wd5.myworkdayjobs.com
+    and other.wd1.myworkdayjobs.com share one limit.
+    """
+    value = (url_or_host or "").strip()
+    host = urlparse(value).hostname if "//" in value else value.split(":")[0]
+    host = (host or "").lower().strip(".")
+    if not host:
+        return ""
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    labels = host.split(".")
+    if len(labels) <= 2:
+        return host
+    if ".".join(labels[-2:]) in _TWO_LEVEL_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """Retry-After as seconds; it may be a number or an HTTP date."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(text).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class _DomainState:
+    rps: float
+    burst: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    strikes: int = 0
+
+
+class DomainRateLimiter:
+    """
+    Token bucket per registrable domain, shared by every thread that talks to
+    the same hosts (pooled drivers, HTTP hydration, discovery crawling).
+
+    Each domain refills at ``rps`` tokens per second up to ``burst``; rps 0
+    means no steady-state limit. A 429 or 503 blocks the whole domain for an
+    exponentially growing window (or the server's Retry-After), and the next
+    successful response resets it.
+    """
+
+    def __init__(
+        self,
+        *,
+        rps: Optional[float] = None,
+        burst: Optional[int] = None,
+        backoff_sec: Optional[float] = None,
+        backoff_max_sec: Optional[float] = None,
+        retries: Optional[int] = None,
+        enabled: bool = True,
+    ):
+        self.rps = max(
+            0.0, rps if rps is not None else _env_float("RATE_LIMIT_RPS", 0.0)
+        )
+        if burst is None:
+            burst = _env_int("RATE_LIMIT_BURST", 0)
+        self.burst = max(1, burst or int(self.rps) or 1)
+        self.backoff_sec = max(
+            0.0,
+            backoff_sec
+            if backoff_sec is not None
+            else _env_float("RATE_LIMIT_BACKOFF_SEC", 5.0),
+        )
+        self.backoff_max_sec = max(
+            self.backoff_sec,
+            backoff_max_sec
+            if backoff_max_sec is not None
+            else _env_float("RATE_LIMIT_BACKOFF_MAX_SEC", 300.0),
+        )
+        self.retries = max(
+            0, retries if retries is not None else _env_int("RATE_LIMIT_RETRIES", 2)
+        )
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._domains: Dict[str, _DomainState] = {}
+        self._overrides: Dict[str, tuple[float, int]] = {}
+
+    def configure(
+        self, url_or_domain: str, *, rps: float, burst: Optional[int] = None
+    ) -> None:
+        """
+        Set a domain's own limit. When several sites configure the same
+        domain, the slowest rate wins.
+        """
+        domain = registrable_domain(url_or_domain)
+        if not self.enabled or not domain:
+            return
+        rps = max(0.0, float(rps))
+        burst = max(1, int(burst or 0) or int(rps) or 1)
+        with self._lock:
+            current = self._overrides.get(domain)
+            if current is not None and 0 < current[0] <= rps:
+                return
+            self._overrides[domain] = (rps, burst)
+            state = self._domains.get(domain)
+            if state is not None:
+                state.rps = rps
+                state.burst = float(burst)
+                state.tokens = min(state.tokens, state.burst)
+
+    def _state(self, domain: str, now: float) -> _DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            rps, burst = self._overrides.get(domain, (self.rps, self.burst))
+            state = _DomainState(
+                rps=rps, burst=float(burst), tokens=float(burst), updated=now
+            )
+            self._domains[domain] = state
+        return state
+
+    def acquire(self, url: str) -> float:
+        """Block until ``url``'s domain may be requested; returns seconds waited."""
+        domain = registrable_domain(url)
+        if not self.enabled or not domain:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                state = self._state(domain, now)
+                if state.blocked_until > now:
+                    delay = state.blocked_until - now
+                elif state.rps <= 0:
+                    return waited
+                else:
+                    state.tokens = min(
+                        state.burst, state.tokens + (now - state.updated) * state.rps
+                    )
+                    state.updated = now
+                    if state.tokens >= 1.0:
+                        state.tokens -= 1.0
+                        return waited
+                    delay = (1.0 - state.tokens) / state.rps
+            time.sleep(delay)
+            waited += delay
+
+    def observe(
+        self, url: str, status: Optional[int], retry_after: Any = None
+    ) -> float:
+        """
+        Feed back a response status. Returns the backoff in seconds when the
+        server asked to slow down, otherwise 0.
+        """
+        domain = registrable_domain(url)
+        if not self.enabled or not domain or not status:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(domain, now)
+            if status not in BACKOFF_STATUSES:
+                if status < 400:
+                    state.strikes = 0
+                return 0.0
+            state.strikes += 1
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = self.backoff_sec * (2 ** (state.strikes - 1))
+            delay = min(delay, self.backoff_max_sec)
+            state.blocked_until = max(state.blocked_until, now + delay)
+            # Whatever burst was saved up is what got us throttled.
+            state.tokens = 0.0
+            strikes = state.strikes
+        print(
+            f"[rate] {domain}: HTTP {status}, backing off {delay:.1f}s "
+            f"(strike {strikes})"
+        )
+        return delay
+
+
+_shared: Optional[DomainRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter() -> DomainRateLimiter:
+    """The process-wide limiter, configured from RATE_LIMIT_* on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DomainRateLimiter()
+        return _shared
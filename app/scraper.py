@@ -1,13 +1,17 @@
 # /app/scraper.py
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import queue
 import re
 import shutil
 import tempfile
+import threading
 import time
-from typing import Any, Dict, List, Optional, Iterator, Tuple
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Iterator, Tuple
 from urllib.parse import urljoin, urlparse
 
 from bs4 import BeautifulSoup
@@ -24,7 +28,22 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-from app.utils import html_to_text
+from app.devtools import (
+    apply_resource_blocking,
+    block_patterns,
+    env_block_categories,
+    network_log,
+    parse_block_categories,
+)
+from app.driver_memory import driver_rss_bytes
+from app.fixtures import FixtureSession
+from app.http_fetch import HttpFetcher, HttpPage
+from app.profiling import StepProfiler
+from app.rate_limit import DomainRateLimiter, shared_rate_limiter
+from app.step_plan import SitePlan, StepPlan, load_step_plans
+from app.utils import canonical_job_id, html_to_text
+from app.watchdog import SiteWatchdog, kill_driver
+from app.waits import PageWaiter, adaptive_waits_enabled, network_idle_enabled
 
 load_dotenv()
 
@@ -41,6 +60,13 @@ def _to_ms_env(name: str, default_ms: int) -> int:
         return default_ms
 
 
+def _to_int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
 # ---------- Unified delay config ----------
 def _get_item_delay_ms() -> int:
     return max(0, _to_ms_env("ITEM_DELAY_MS", 300))
@@ -58,6 +84,79 @@ def _sleep_default(*, reason: str) -> None:
 
 ITEM_DELAY_MS = _get_item_delay_ms()
 
+# Reads every focus_scope item's markup in a single WebDriver round trip.
+_ITEM_SNAPSHOT_JS = (
+    "return Array.from(document.querySelectorAll(arguments[0]),"
+    " function (el) { return el.outerHTML; });"
+)
+
+_NAV_STATUS_JS = (
+    "var e = performance.getEntriesByType('navigation')[0];"
+    " return e && e.responseStatus ? e.responseStatus : 0;"
+)
+
+# Runs a whole list block in the page: arguments[0] is focus_scope and
+# arguments[1] a [[column, selector, attr], ...] spec. Each item is matched
+# inside a detached copy wrapped like _wrap_item_soups does, and values
+# mirror the BeautifulSoup path: the attribute if present, otherwise
+# get_text(strip=True), with multi-valued attributes split into lists. One
+# array of values comes back per item, or null if Chrome rejects a selector
+# (soupsieve extensions such as :-soup-contains).
+_BULK_EXTRACT_JS = r"""
+var spec = arguments[1];
+try {
+  spec.forEach(function (s) { document.createDocumentFragment().querySelector(s[1]); });
+} catch (e) {
+  return null;
+}
+var SKIP = {SCRIPT: 1, STYLE: 1, TEMPLATE: 1};
+var MULTI = {
+  "class": 1, "rel": 1, "rev": 1, "accept-charset": 1, "headers": 1,
+  "accesskey": 1, "dropzone": 1
+};
+function text(el) {
+  var out = "";
+  var walker = document.createTreeWalker(
+    el, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT,
+    {acceptNode: function (n) {
+      if (n.nodeType === 3) return NodeFilter.FILTER_ACCEPT;
+      return SKIP[n.nodeName] ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_SKIP;
+    }});
+  for (var n = walker.nextNode(); n; n = walker.nextNode()) out += n.nodeValue.trim();
+  return out;
+}
+return Array.from(document.querySelectorAll(arguments[0]), function (item) {
+  var wrap = document.createElement("jobscrape-item");
+  wrap.appendChild(item.cloneNode(true));
+  return spec.map(function (s) {
+    var el = wrap.querySelector(s[1]), attr = s[2];
+    if (!el) return "";
+    if (attr && el.hasAttribute(attr)) {
+      var value = el.getAttribute(attr);
+      return MULTI[attr.toLowerCase()] ? value.split(/\s+/).filter(Boolean) : value;
+    }
+    return text(el);
+  });
+});
+"""
+
+
+def _wrap_item_soups(htmls: List[Optional[str]]) -> List[Any]:
+    """
+    Parse list items' outer HTML in one pass. Each item sits in its own
+    <jobscrape-item> wrapper, as in _BULK_EXTRACT_JS, so a selector can match
+    the item itself; site selectors never name the wrapper.
+    """
+    doc = BeautifulSoup(
+        "".join(f"<jobscrape-item>{h or ''}</jobscrape-item>" for h in htmls),
+        "html.parser",
+    )
+    items = doc.find_all("jobscrape-item", recursive=False)
+    if len(items) != len(htmls):
+        return [BeautifulSoup(h or "", "html.parser") for h in htmls]
+    return items
+
+
 _BROWSER_BINARY_ENV_VARS = (
     "BROWSER_BINARY_PATH",
     "CHROME_BINARY_PATH",
@@ -140,9 +239,34 @@ class StepScraper:
 
     Notes:
       - 'xpath' is a CSS selector (legacy name).
-      - Sleep without 'seconds' falls back to ITEM_DELAY_MS.
+      - Sleep without 'seconds' waits for the page to be ready (see
+        app.waits); ADAPTIVE_WAITS=false restores the fixed ITEM_DELAY_MS.
+      - A top-level 'site_config' step holds per-site settings, such as
+        politeness_ms, the opt-in minimum gap between item actions, and
+        block_resources, which overrides BLOCK_RESOURCES for the site.
       - New: run_iter() yields (site, jobs) as each site finishes.
       - New: data_extract supports optional pagination block.
+      - New: SCRAPER_POOL_SIZE > 1 scrapes sites on a pool of drivers.
+      - New: known_jobs skips detail redirects for unchanged list rows.
+      - New: redirect fetch="tabs" hydrates details in batches of tabs.
+      - New: fixtures (app.fixtures) records every page read, or replays
+        recorded pages offline.
+      - New: site_config engine "http" scrapes server-rendered sites without
+        a browser (load_url, sleep, data_extract, json_* steps only).
+      - New: steps.json is compiled by app.step_plan before any browser
+        starts; schema errors abort the run, and the executor uses the
+        precompiled selectors, JSON paths, and regexes.
+      - New: profiler (app.profiling) times every executed step and its inner
+        extract/redirect/sleep/pagination work: wall, CPU, wait, and items.
+      - New: app.rate_limit token buckets per registrable domain pace every
+        navigation and HTTP fetch, and back off on 429/503 responses.
+      - New: per-site and per-run time budgets stop a site at its deadline
+        with partial results (see site_errors); app.watchdog kills a driver
+        that is still stuck after the grace period.
+      - New: data_extract blocks of plain list extracts run as one
+        execute_script call (_BULK_EXTRACT_JS) instead of BeautifulSoup.
+      - New: run_iter_chunks() streams paginated sites in chunks as pages
+        are hydrated, with a done flag on each site's last chunk.
     """
 
     def __init__(
@@ -150,6 +274,11 @@ class StepScraper:
         steps_path: str,
         headless: Optional[bool] = None,
         default_wait: float = 10.0,
+        pool_size: Optional[int] = None,
+        known_jobs: Optional[Dict[str, Dict[str, Optional[str]]]] = None,
+        fixtures: Optional[FixtureSession] = None,
+        sites: Optional[Iterable[str]] = None,
+        resume_jobs: Optional[Dict[str, set[str]]] = None,
     ):
         self.steps_path = steps_path
         self.default_wait = default_wait
@@ -159,18 +288,82 @@ class StepScraper:
             if headless is not None
             else (env_headless.lower() == "true" if env_headless else False)
         )
+        self.pool_size = max(
+            1,
+            pool_size
+            if pool_size is not None
+            else _to_int_env("SCRAPER_POOL_SIZE", 1),
+        )
+        # site -> {canonical JobID: list fingerprint}. None turns fingerprinting
+        # off; an empty dict records fingerprints without skipping anything.
+        self.known_jobs = known_jobs
+        # Only these steps.json sites are scraped; None means all of them.
+        self.sites = set(sites) if sites is not None else None
+        # site -> canonical JobIDs a resumed run already committed. Paginated
+        # sites click past those jobs without hydrating or returning them.
+        self.resume_jobs = resume_jobs or {}
+        # Record/replay hooks (app.fixtures); the base session is a no-op.
+        self.fixtures = fixtures or FixtureSession()
+        # Per-step wall/CPU/wait totals for the current run.
+        self.profiler = StepProfiler()
+        # Per-thread site context so pooled drivers can look up their own site.
+        self._local = threading.local()
+        # Per-domain token buckets shared with the HTTP client; replays serve
+        # local files, so they are not throttled.
+        self.rate_limiter = (
+            DomainRateLimiter(enabled=False)
+            if self.fixtures.mode == "replay"
+            else shared_rate_limiter()
+        )
+        self._http: Optional[HttpFetcher] = None
+        self._http_lock = threading.Lock()
+        self.adaptive_waits = adaptive_waits_enabled()
+        self.waiter = PageWaiter()
+        # Resource blocking is configured per run in run_iter once steps.json
+        # is loaded; drivers need performance logging for its byte stats.
+        self._blocking_configured = False
+        self._perf_logging = network_idle_enabled()
+        # IMPLICIT_WAIT_MS=0 makes optional lookups return at once; required
+        # elements are already waited for explicitly (wait_css, focus_scope).
+        self.implicit_wait_ms = max(0, _to_ms_env("IMPLICIT_WAIT_MS", 3000))
+        self._miss_lock = threading.Lock()
+        self.miss_count = 0
+        self.miss_wait_secs = 0.0
+        # A driver is restarted once Chrome's RSS or its page count crosses
+        # these ceilings (0 turns a ceiling off), so long runs stay flat.
+        self.driver_max_rss_mb = max(0, _to_int_env("DRIVER_MAX_RSS_MB", 1536))
+        self.driver_max_pages = max(0, _to_int_env("DRIVER_MAX_PAGES", 500))
+        self.driver_recycles = 0
+        self._recycle_lock = threading.Lock()
+        # Time budgets in seconds (0 = none). A site stops at its deadline
+        # and keeps what it collected; the watchdog kills a driver that is
+        # still stuck SITE_WATCHDOG_GRACE_SEC later.
+        self.site_budget_sec = max(0, _to_int_env("SITE_TIME_BUDGET_SEC", 0))
+        self.run_budget_sec = max(0, _to_int_env("RUN_TIME_BUDGET_SEC", 0))
+        self.watchdog = SiteWatchdog(
+            max(0, _to_int_env("SITE_WATCHDOG_GRACE_SEC", 60))
+        )
+        self._run_deadline: Optional[float] = None
+        # site -> error for sites that ended early; their jobs are partial.
+        self.site_errors: Dict[str, str] = {}
+        # run_iter_chunks() hands paginated jobs over in chunks of about this
+        # many as they are hydrated; 0 keeps one list per site.
+        self.stream_chunk_size = max(0, _to_int_env("STREAM_CHUNK_SIZE", 50))
+        # Plain list blocks extract in one browser-side pass; a site_config
+        # js_extract overrides JS_EXTRACT.
+        self.js_extract = os.getenv("JS_EXTRACT", "true").lower() == "true"
 
     # ---------- Driver ----------
-    def _make_driver(self) -> webdriver.Chrome:
+    def _make_driver(self, slot: int = 0) -> webdriver.Chrome:
         try:
-            return self._make_driver_once(headless=self.headless)
+            return self._make_driver_once(headless=self.headless, slot=slot)
         except WebDriverException as first_error:
             if self.headless:
                 raise self._driver_start_error(first_error) from first_error
 
             _dbg("Chrome failed to start in visible mode; retrying headless")
             try:
-                return self._make_driver_once(headless=True)
+                return self._make_driver_once(headless=True, slot=slot)
             except WebDriverException as fallback_error:
                 raise self._driver_start_error(
                     fallback_error,
@@ -181,7 +374,7 @@ class StepScraper:
                     first_error=first_error,
                 ) from fallback_error
 
-    def _make_driver_once(self, *, headless: bool) -> webdriver.Chrome:
+    def _make_driver_once(self, *, headless: bool, slot: int = 0) -> webdriver.Chrome:
         options = webdriver.ChromeOptions()
         browser_binary = _resolve_browser_binary()
         if browser_binary:
@@ -195,6 +388,10 @@ class StepScraper:
 
         chrome_user_data_dir = os.getenv("CHROME_USER_DATA_DIR")
         if chrome_user_data_dir:
+            # Chrome locks a profile directory, so pooled drivers each get
+            # their own sibling profile next to the configured one.
+            if slot:
+                chrome_user_data_dir = f"{chrome_user_data_dir}-{slot}"
             options.add_argument(f"--user-data-dir={chrome_user_data_dir}")
         elif headless and os.name != "nt":
             chrome_user_data_dir = tempfile.mkdtemp(prefix="jobscrape-chrome-")
@@ -209,11 +406,28 @@ class StepScraper:
         options.add_argument("--no-first-run")
         options.add_argument("--no-default-browser-check")
         options.add_argument("--window-size=1400,900")
+        # fetch="tabs" waits on detail pages loading in background tabs;
+        # keep Chrome from throttling their timers and rendering.
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-renderer-backgrounding")
+        options.add_argument("--disable-backgrounding-occluded-windows")
         if headless and os.name != "nt":
-            remote_debugging_port = os.getenv("CHROME_REMOTE_DEBUGGING_PORT", "9222")
-            options.add_argument(f"--remote-debugging-port={remote_debugging_port}")
+            # Offset the port per pool slot so concurrent drivers do not collide.
+            remote_debugging_port = _to_int_env("CHROME_REMOTE_DEBUGGING_PORT", 9222)
+            options.add_argument(
+                f"--remote-debugging-port={remote_debugging_port + slot}"
+            )
+        for argument in self.fixtures.chrome_arguments():
+            options.add_argument(argument)
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option("useAutomationExtension", False)
+        if self._perf_logging:
+            # Network events in the performance log drive the idle signal
+            # used by adaptive waits and the resource-blocking stats.
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            options.add_experimental_option(
+                "perfLoggingPrefs", {"enableNetwork": True, "enablePage": False}
+            )
 
         try:
             chromedriver_path = _resolve_chromedriver_path()
@@ -231,7 +445,7 @@ class StepScraper:
                 shutil.rmtree(chrome_user_data_dir, ignore_errors=True)
             raise
 
-        driver.implicitly_wait(3)
+        driver.implicitly_wait(self.implicit_wait_ms / 1000.0)
         return driver
 
     @staticmethod
@@ -264,6 +478,200 @@ class StepScraper:
             if chrome_user_data_dir:
                 shutil.rmtree(chrome_user_data_dir, ignore_errors=True)
 
+    @staticmethod
+    def _count_page(driver: webdriver.Chrome) -> None:
+        setattr(driver, "_jobscrape_pages", getattr(driver, "_jobscrape_pages", 0) + 1)
+
+    def _recycle_reason(self, driver: webdriver.Chrome) -> Optional[str]:
+        if getattr(driver, "_jobscrape_killed", False):
+            return "killed by watchdog"
+        pages = getattr(driver, "_jobscrape_pages", 0)
+        if self.driver_max_pages and pages >= self.driver_max_pages:
+            return f"pages={pages}"
+        if self.driver_max_rss_mb:
+            rss = driver_rss_bytes(driver)
+            if rss is not None and rss >= self.driver_max_rss_mb * 1024 * 1024:
+                return f"rss_mb={rss // (1024 * 1024)} pages={pages}"
+        return None
+
+    def _maybe_recycle_driver(
+        self, driver: webdriver.Chrome, *, mid_site: bool = False
+    ) -> webdriver.Chrome:
+        """
+        Replace the thread's driver with a fresh one when it crossed a ceiling.
+        Mid-site recycles re-apply the site's resource blocking; cookies and
+        the current page are lost, so callers only recycle before navigating
+        to a URL.
+        """
+        reason = self._recycle_reason(driver)
+        if reason is None:
+            return driver
+        slot = getattr(self._local, "slot", 0)
+        where = "mid-site" if mid_site else "between sites"
+        print(f"[driver] recycling slot {slot} {where}: {reason}")
+        self._quit_driver(driver)
+        driver = self._make_driver(slot=slot)
+        self._local.driver = driver
+        with self._recycle_lock:
+            self.driver_recycles += 1
+        if mid_site:
+            self._start_resource_blocking(driver)
+            self._watch_site(driver)
+        return driver
+
+    # ---------- Chunked results ----------
+    def _streaming(self) -> bool:
+        return getattr(self._local, "emit", None) is not None
+
+    def _emit_chunk(self, jobs: List[Dict[str, Any]]) -> bool:
+        """
+        Hand finished jobs to the caller before the site completes. False when
+        the site is not streaming, in which case the caller keeps them.
+        """
+        emit = getattr(self._local, "emit", None)
+        if emit is None:
+            return False
+        if jobs:
+            emit(list(jobs))
+            self._local.emitted += len(jobs)
+        return True
+
+    # ---------- Time budgets ----------
+    def _begin_site_budget(self, plan: SitePlan) -> None:
+        budget = plan.config.get("time_budget_sec") or self.site_budget_sec
+        deadline = time.monotonic() + float(budget) if budget else None
+        if self._run_deadline is not None:
+            deadline = min(deadline or self._run_deadline, self._run_deadline)
+        self._local.deadline = deadline
+        self._local.timed_out = False
+
+    def _watch_site(self, driver: webdriver.Chrome) -> None:
+        deadline = getattr(self._local, "deadline", None)
+        if deadline is not None:
+            self.watchdog.watch(
+                getattr(self._local, "site", None) or "",
+                deadline,
+                lambda: kill_driver(driver),
+            )
+
+    def _out_of_time(self) -> bool:
+        """True once the current site's deadline passed; loops then stop early."""
+        deadline = getattr(self._local, "deadline", None)
+        if deadline is None or time.monotonic() < deadline:
+            return False
+        if not self._local.timed_out:
+            self._local.timed_out = True
+            print(f"[budget] {self._local.site}: time budget reached, stopping")
+        return True
+
+    def _run_out_of_time(self) -> bool:
+        return self._run_deadline is not None and time.monotonic() >= self._run_deadline
+
+    def _end_site_budget(
+        self, site: str, started: float, jobs: List[Dict[str, Any]], err: Optional[str]
+    ) -> Optional[str]:
+        self.watchdog.unwatch(site)
+        driver = getattr(self._local, "driver", None)
+        if getattr(self._local, "timed_out", False) or getattr(
+            driver, "_jobscrape_killed", False
+        ):
+            timeout = (
+                f"time budget exceeded after {time.monotonic() - started:.0f}s; "
+                f"kept {self._jobs_so_far(jobs)} jobs"
+            )
+            err = f"{timeout} ({err})" if err else timeout
+        self._local.deadline = None
+        if err:
+            self.site_errors[site] = err
+        return err
+
+    def _jobs_so_far(self, jobs: List[Dict[str, Any]]) -> int:
+        return len(jobs) + getattr(self._local, "emitted", 0)
+
+    def _skip_site_out_of_time(self, site: str) -> bool:
+        if not self._run_out_of_time():
+            return False
+        self.site_errors[site] = "run time budget exceeded; site not started"
+        print(f"[budget] {site}: {self.site_errors[site]}")
+        return True
+
+    def _http_fetcher(self) -> HttpFetcher:
+        # One pooled client per scraper so keep-alive connections and the
+        # per-domain limits are shared by every driver in the pool.
+        with self._http_lock:
+            if self._http is None:
+                self._http = HttpFetcher(limiter=self.rate_limiter)
+            return self._http
+
+    def _close_http(self) -> None:
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
+    def _http_get(self, url: str, **kwargs: Any) -> HttpPage:
+        return self._http_get_many([url], **kwargs)[0]
+
+    def _http_get_many(self, urls: List[str], **kwargs: Any) -> List[HttpPage]:
+        fixtures = self.fixtures
+        pages = self._http_fetcher().get_many(
+            [fixtures.nav_url(url) for url in urls], **kwargs
+        )
+        for url, page in zip(urls, pages):
+            page.url = fixtures.live_url(page.url)
+            fixtures.record_http_page(url, page)
+        return pages
+
+    # ---------- Navigation (record/replay aware) ----------
+    def _goto(self, driver: webdriver.Chrome, url: str) -> None:
+        limiter = self.rate_limiter
+        for attempt in range(limiter.retries + 1):
+            limiter.acquire(url)
+            self._count_page(driver)
+            driver.get(self.fixtures.nav_url(url))
+            if not limiter.observe(url, self._navigation_status(driver)):
+                return
+
+    def _navigation_status(self, driver: webdriver.Chrome) -> int:
+        # The browser hides HTTP status from WebDriver; Navigation Timing has
+        # it (0 when unsupported, or for pages served from cache).
+        if not self.rate_limiter.enabled:
+            return 0
+        try:
+            return int(driver.execute_script(_NAV_STATUS_JS) or 0)
+        except (WebDriverException, TypeError, ValueError):
+            return 0
+
+    def _page_url(self, driver: webdriver.Chrome) -> str:
+        return self.fixtures.live_url(driver.current_url)
+
+    def _record_page(
+        self, driver: webdriver.Chrome, requested_url: Optional[str] = None
+    ) -> None:
+        self.fixtures.record_driver_page(driver, requested_url)
+
+    @contextmanager
+    def _profile(self, path: str, action: str, *, items: int = 1) -> Iterator[None]:
+        with self.profiler.measure(
+            site=getattr(self._local, "site", None) or "",
+            path=path,
+            action=action,
+            items=items,
+        ):
+            yield
+
+    def _stop_step(
+        self, probe: Tuple[float, float], step: StepPlan, items: int
+    ) -> None:
+        # Failed steps are recorded too; a timeout is usually the slowest row.
+        self.profiler.stop(
+            probe,
+            site=getattr(self._local, "site", None) or "",
+            path=step.path,
+            action=step.action,
+            items=items,
+        )
+
     # ---------- URL utils ----------
     @staticmethod
     def _normalize_url(current_url: str, candidate: Optional[str]) -> Optional[str]:
@@ -281,15 +689,54 @@ class StepScraper:
             return abs_url
         return None
 
+    def _resolve_detail_url(
+        self,
+        base_url: str,
+        job: Dict[str, Any],
+        step: StepPlan,
+        soup: Optional[BeautifulSoup] = None,
+    ) -> Optional[str]:
+        using_col = step.get("using_column")
+        detail_url = (
+            self._normalize_url(base_url, job.get(using_col)) if using_col else None
+        )
+        if not detail_url and step.link is not None and soup is not None:
+            link_tag = step.link.select_one(soup)
+            if link_tag and link_tag.has_attr("href"):
+                detail_url = self._normalize_url(base_url, link_tag["href"])
+        return detail_url
+
     # ---------- DOM helpers ----------
+    def _find_optional(self, root: Any, css: str) -> Any:
+        """
+        First element under root (a driver or element) matching css, or None.
+        A miss still costs the driver's implicit wait, so that time is counted.
+        """
+        t0 = time.monotonic()
+        found = root.find_elements(By.CSS_SELECTOR, css)
+        if found:
+            return found[0]
+        with self._miss_lock:
+            self.miss_count += 1
+            self.miss_wait_secs += time.monotonic() - t0
+        return None
+
+    def _report_miss_waits(self) -> None:
+        with self._miss_lock:
+            count, secs = self.miss_count, self.miss_wait_secs
+        print(
+            f"[waits] optional lookups missed={count} waited={secs:.1f}s "
+            f"implicit_wait_ms={self.implicit_wait_ms}"
+        )
+
     def _safe_find_text(
         self, driver: webdriver.Chrome, css: Optional[str]
     ) -> Optional[str]:
         if not css:
             return None
         try:
-            el = driver.find_element(By.CSS_SELECTOR, css)
-            return (el.text or "").strip()
+            el = self._find_optional(driver, css)
+            return (el.text or "").strip() if el is not None else None
         except Exception:
             return None
 
@@ -304,6 +751,98 @@ class StepScraper:
         except Exception:
             return None
 
+    def _snapshot_item_soups(
+        self, driver: webdriver.Chrome, css: str
+    ) -> Optional[List[Any]]:
+        try:
+            htmls = driver.execute_script(_ITEM_SNAPSHOT_JS, css)
+        except WebDriverException as e:
+            _dbg(f"DOM snapshot failed, reading items one by one: {e}")
+            return None
+        if not isinstance(htmls, list):
+            return None
+
+        return _wrap_item_soups(htmls)
+
+    def _bulk_extract_spec(
+        self, extract_steps: List[StepPlan]
+    ) -> Optional[List[List[Optional[str]]]]:
+        """
+        The _BULK_EXTRACT_JS spec for a block of plain list-page extracts,
+        optionally followed by replace_text/regex_extract, which run on the
+        rows in Python. None when any step needs per-item work.
+        """
+        enabled = self._current_site_config().get("js_extract", self.js_extract)
+        if not enabled:
+            return None
+        spec: List[List[Optional[str]]] = []
+        transforms = False
+        for step in extract_steps:
+            action = step.get("action")
+            if action in ("replace_text", "regex_extract"):
+                transforms = True
+                continue
+            if (
+                action != "extract"
+                or transforms
+                or (step.get("context") or "list").lower() != "list"
+                or (step.get("data_type") or "").lower() == "current_url"
+            ):
+                return None
+            column, css = step.get("as_column"), step.get("xpath")
+            if column and css:
+                spec.append([column, css, step.get("attr_target") or None])
+        return spec or None
+
+    def _bulk_extract(
+        self,
+        driver: webdriver.Chrome,
+        focus_scope: str,
+        extract_steps: List[StepPlan],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract every focus_scope item in one execute_script call, so list
+        pages are parsed by Chrome instead of BeautifulSoup. None means the
+        caller takes the per-item path.
+        """
+        spec = self._bulk_extract_spec(extract_steps)
+        if spec is None:
+            return None
+        probe = self.profiler.start()
+        try:
+            rows = driver.execute_script(_BULK_EXTRACT_JS, focus_scope, spec)
+        except WebDriverException as e:
+            _dbg(f"Bulk JS extract failed, reading items one by one: {e}")
+            return None
+        if not isinstance(rows, list):
+            _dbg("Bulk JS extract rejected a selector, reading items one by one")
+            return None
+        jobs: List[Dict[str, Any]] = []
+        for values in rows:
+            job = {column: value for (column, _, _), value in zip(spec, values)}
+            for step in extract_steps:
+                if step.get("action") == "replace_text":
+                    self._apply_replace_text(job, step)
+                elif step.get("action") == "regex_extract":
+                    self._apply_regex_extract(job, step)
+            jobs.append(job)
+        self.profiler.stop(
+            probe,
+            site=getattr(self._local, "site", None) or "",
+            path=extract_steps[0].path.rsplit(".extract_steps", 1)[0],
+            action="extract_js",
+            kind="inner",
+            items=len(jobs),
+        )
+        return jobs
+
+    @staticmethod
+    def _live_item_element(driver: webdriver.Chrome, css: str, idx: int) -> Any:
+        elements = driver.find_elements(By.CSS_SELECTOR, css)
+        if idx >= len(elements):
+            raise NoSuchElementException(f"list item {idx} not found for {css}")
+        return elements[idx]
+
     @staticmethod
     def _parse_page_num(text: Optional[str]) -> Optional[int]:
         if not text:
@@ -346,7 +885,9 @@ class StepScraper:
 
         # attribute-based detection
         try:
-            btn = driver.find_element(By.CSS_SELECTOR, next_css)
+            btn = self._find_optional(driver, next_css)
+            if btn is None:
+                return True
             if btn.get_attribute("disabled") is not None:
                 return True
             aria_disabled = (btn.get_attribute("aria-disabled") or "").strip().lower()
@@ -360,17 +901,17 @@ class StepScraper:
 
     @staticmethod
     def _split_extract_steps_for_pagination(
-        extract_steps: List[Dict[str, Any]],
-    ) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        extract_steps: List[StepPlan],
+    ) -> tuple[List[StepPlan], List[StepPlan], Optional[StepPlan]]:
         # Paginated scraping is intentionally two-pass:
         # 1. Run the list-page steps on every results page.
         # 2. Run the detail-page steps after all pages have been collected.
         #
         # The redirect step is the boundary between those two phases. This keeps
         # detail-page visits from resetting or confusing the current list page.
-        list_steps: List[Dict[str, Any]] = []
-        detail_steps: List[Dict[str, Any]] = []
-        redirect_step: Optional[Dict[str, Any]] = None
+        list_steps: List[StepPlan] = []
+        detail_steps: List[StepPlan] = []
+        redirect_step: Optional[StepPlan] = None
         in_detail = False
 
         for step in extract_steps:
@@ -397,46 +938,47 @@ class StepScraper:
         driver: webdriver.Chrome,
         soup: BeautifulSoup,
         job: Dict[str, Any],
-        step: Dict[str, Any],
+        step: StepPlan,
         redirected: bool,
     ) -> None:
-        # This helper is shared by normal and paginated extraction so selector
-        # behavior stays consistent between both paths.
-        column = step.get("as_column")
-        css = step.get("xpath")  # (your schema calls it xpath, but it's CSS)
-        attr = step.get("attr_target")
-        data_type = (step.get("data_type") or "").lower()
-
-        # Allow "current_url" without a selector
-        if not column or (not css and data_type != "current_url"):
-            return
-
-        if data_type == "current_url":
-            job[column] = driver.current_url
-            return
+        with self._profile(step.path, "extract"):
+            # This helper is shared by normal and paginated extraction so selector
+            # behavior stays consistent between both paths.
+            column = step.get("as_column")
+            css = step.get("xpath")  # (your schema calls it xpath, but it's CSS)
+            attr = step.get("attr_target")
+            data_type = (step.get("data_type") or "").lower()
+
+            # Allow "current_url" without a selector
+            if not column or (not css and data_type != "current_url"):
+                return
+
+            if data_type == "current_url":
+                job[column] = self._page_url(driver)
+                return
+
+            ctx = (step.get("context") or "list").lower()
+            if ctx == "list" and not redirected:
+                # List-page values come from the captured item HTML. That avoids
+                # querying the live browser DOM after the page has moved elsewhere.
+                tag = step.selector.select_one(soup)
+                value = (
+                    tag.get(attr)
+                    if (attr and tag and tag.has_attr(attr))
+                    else (tag.get_text(strip=True) if tag else "")
+                )
+                job[column] = value
+                return
 
-        ctx = (step.get("context") or "list").lower()
-        if ctx == "list" and not redirected:
-            # List-page values come from the captured item HTML. That avoids
-            # querying the live browser DOM after the page has moved elsewhere.
-            tag = soup.select_one(css)
-            value = (
-                tag.get(attr)
-                if (attr and tag and tag.has_attr(attr))
-                else (tag.get_text(strip=True) if tag else "")
-            )
+            tag = self._find_optional(driver, css)
+            if tag is None:
+                value = ""
+            else:
+                value = tag.get_attribute(attr) if attr else tag.text
             job[column] = value
-            return
-
-        try:
-            tag = driver.find_element(By.CSS_SELECTOR, css)
-            value = tag.get_attribute(attr) if attr else tag.text
-        except NoSuchElementException:
-            value = ""
-        job[column] = value
 
     @staticmethod
-    def _apply_replace_text(job: Dict[str, Any], step: Dict[str, Any]) -> None:
+    def _apply_replace_text(job: Dict[str, Any], step: StepPlan) -> None:
         col = step.get("using_column")
         tf = step.get("text_find", "")
         tr = step.get("text_replace", "")
@@ -444,20 +986,103 @@ class StepScraper:
             job[col] = job[col].replace(tf, tr)
 
     @staticmethod
-    def _apply_regex_extract(job: Dict[str, Any], step: Dict[str, Any]) -> None:
+    def _apply_regex_extract(job: Dict[str, Any], step: StepPlan) -> None:
         src_col = step.get("using_column")
         as_col = step.get("as_column")
-        pattern = step.get("regex_pattern")
-        if src_col in job and pattern and as_col:
-            m = re.search(pattern, str(job[src_col]))
+        if src_col in job and step.regex is not None and as_col:
+            m = step.regex.search(str(job[src_col]))
             if m:
                 job[as_col] = m.group(1)
 
-    def _run_sleep_step(self, step: Dict[str, Any], *, prefix: str) -> None:
+    def _current_site_config(self) -> Dict[str, Any]:
+        return getattr(self._local, "site_config", None) or {}
+
+    def _site_block_patterns(self) -> List[str]:
+        site_config = self._current_site_config()
+        if "block_resources" in site_config:
+            categories = parse_block_categories(site_config.get("block_resources"))
+        else:
+            categories = env_block_categories()
+        return block_patterns(categories)
+
+    def _start_resource_blocking(self, driver: webdriver.Chrome) -> List[str]:
+        if not self._blocking_configured:
+            return []
+        # Always send the site's list (possibly empty) because a pooled driver
+        # may still carry the previous site's patterns.
+        patterns = self._site_block_patterns()
+        try:
+            apply_resource_blocking(driver, patterns)
+        except WebDriverException as e:
+            print(f"[warn] resource blocking unavailable: {e}")
+            return []
+        log = network_log(driver)
+        log.drain(driver)
+        log.reset_stats()
+        return patterns
+
+    @staticmethod
+    def _report_resource_blocking(driver: webdriver.Chrome, site: str) -> None:
+        log = network_log(driver)
+        if not log.drain(driver):
+            _dbg(f"{site}: resource blocking on, performance log unavailable")
+            return
+        print(
+            f"[blocked] {site}: requests={log.blocked_count()} "
+            f"by_type={dict(sorted(log.blocked.items()))} "
+            f"est_saved_kb={log.estimated_bytes_saved() // 1024} "
+            f"loaded_kb={log.bytes_loaded // 1024}"
+        )
+
+    def _politeness_floor(self, *, reason: str) -> None:
+        # Opt-in per site: keep at least politeness_ms between item actions,
+        # counting time already spent waiting for the page.
+        try:
+            floor_ms = float(self._current_site_config().get("politeness_ms") or 0)
+        except (TypeError, ValueError):
+            floor_ms = 0.0
+        last = getattr(self._local, "last_action_at", None)
+        if floor_ms > 0 and last is not None:
+            remaining_ms = floor_ms - (time.monotonic() - last) * 1000.0
+            if remaining_ms > 0:
+                _sleep_ms(int(remaining_ms), reason=reason)
+        self._local.last_action_at = time.monotonic()
+
+    def _settle(
+        self,
+        driver: webdriver.Chrome,
+        *,
+        reason: str,
+        wait_css: Optional[str] = None,
+    ) -> None:
+        """Default wait after navigation: page readiness, then the site floor."""
+        if not self.adaptive_waits:
+            _sleep_default(reason=reason)
+            return
+        waited = self.waiter.wait_ready(driver, wait_css=wait_css)
+        _dbg(f"{reason} ready after {waited * 1000:.0f}ms")
+        self._politeness_floor(reason=f"{reason} politeness floor")
+
+    def _item_delay(self) -> None:
+        if not self.adaptive_waits:
+            if ITEM_DELAY_MS > 0:
+                _sleep_ms(ITEM_DELAY_MS, reason="item delay")
+            return
+        self._politeness_floor(reason="item delay")
+
+    def _run_sleep_step(
+        self,
+        step: StepPlan,
+        *,
+        prefix: str,
+        driver: Optional[webdriver.Chrome] = None,
+    ) -> None:
         if "seconds" in step:
             secs = float(step.get("seconds") or 0)
             _dbg(f"{prefix} explicit sleep {secs:.3f}s")
             time.sleep(max(0.0, secs))
+        elif driver is not None:
+            self._settle(driver, reason=f"{prefix} sleep (default)")
         else:
             _sleep_default(reason=f"{prefix} sleep (default)")
 
@@ -465,8 +1090,8 @@ class StepScraper:
         self,
         driver: webdriver.Chrome,
         job: Dict[str, Any],
-        detail_steps: List[Dict[str, Any]],
-        redirect_step: Optional[Dict[str, Any]],
+        detail_steps: List[StepPlan],
+        redirect_step: Optional[StepPlan],
         base_url: Optional[str] = None,
     ) -> Dict[str, Any]:
         if not redirect_step or not detail_steps:
@@ -477,7 +1102,7 @@ class StepScraper:
         # previous job's detail page, so driver.current_url is not reliable.
         using_col = redirect_step.get("using_column")
         wait_css = redirect_step.get("wait_css")
-        source_url = base_url or driver.current_url
+        source_url = base_url or self._page_url(driver)
         detail_url = (
             self._normalize_url(source_url, job.get(using_col))
             if using_col
@@ -489,24 +1114,35 @@ class StepScraper:
         try:
             # Hydration starts from the URL collected during the list pass.
             _dbg(f"GET detail: {detail_url}")
-            driver.get(detail_url)
-            redirected = True
-            if wait_css:
-                WebDriverWait(driver, self.default_wait).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, wait_css))
-                )
-            _sleep_default(reason="post-redirect sleep (default)")
+            with self._profile(redirect_step.path, "redirect"):
+                self._goto(driver, detail_url)
+                if wait_css:
+                    WebDriverWait(driver, self.default_wait).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, wait_css))
+                    )
+                self._settle(driver, reason="post-redirect wait")
+                self._record_page(driver, detail_url)
         except WebDriverException as we:
             print(f"[warn] redirect get() failed: {we}")
             return job
 
+        self._apply_detail_steps_live(driver, job, detail_steps)
+        return job
+
+    def _apply_detail_steps_live(
+        self,
+        driver: webdriver.Chrome,
+        job: Dict[str, Any],
+        detail_steps: List[StepPlan],
+    ) -> None:
         empty_soup = BeautifulSoup("", "html.parser")
         # Detail steps operate against the live detail page. replace_text and
         # regex_extract can then clean or derive values from fields just read.
         for step in detail_steps:
             action = step.get("action")
             if action == "sleep":
-                self._run_sleep_step(step, prefix="Inner")
+                with self._profile(step.path, "sleep"):
+                    self._run_sleep_step(step, prefix="Inner", driver=driver)
                 continue
             if action == "extract":
                 self._apply_extract_step(
@@ -514,7 +1150,7 @@ class StepScraper:
                     soup=empty_soup,
                     job=job,
                     step=step,
-                    redirected=redirected,
+                    redirected=True,
                 )
                 continue
             if action == "replace_text":
@@ -524,56 +1160,618 @@ class StepScraper:
                 self._apply_regex_extract(job, step)
                 continue
 
-        return job
+    def _hydrate_paginated_jobs(
+        self,
+        driver: webdriver.Chrome,
+        jobs: List[Dict[str, Any]],
+        detail_steps: List[StepPlan],
+        redirect_step: StepPlan,
+        detail_base_url: str,
+        *,
+        defer_browser: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Hydrate collected list jobs with the redirect's fetch mode. With
+        defer_browser, jobs that still need a browser visit are returned
+        instead of navigating away from the list page.
+        """
+        hydrate_jobs = [job for job in jobs if not self._skip_known_detail(job)]
+        _dbg(
+            f"Hydrating details for {len(hydrate_jobs)} of {len(jobs)} "
+            "paginated jobs."
+        )
+        browser_jobs = hydrate_jobs
+        fetch_mode = self._redirect_fetch_mode(redirect_step)
+        if fetch_mode in ("http", "tabs"):
+            detail_urls = [
+                self._resolve_detail_url(detail_base_url, job, redirect_step)
+                for job in hydrate_jobs
+            ]
+            if fetch_mode == "http":
+                fallback = self._hydrate_jobs_over_http(
+                    driver, hydrate_jobs, detail_urls, detail_steps, redirect_step
+                )
+                browser_jobs = [hydrate_jobs[idx] for idx in fallback]
+            else:
+                self._hydrate_jobs_in_tabs(
+                    driver, hydrate_jobs, detail_urls, detail_steps, redirect_step
+                )
+                browser_jobs = []
+        if defer_browser:
+            return browser_jobs
+        self._hydrate_paginated_in_browser(
+            browser_jobs, detail_steps, redirect_step, detail_base_url
+        )
+        return []
 
-    # ---------- Public (bulk) ----------
-    def run(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Legacy bulk mode: returns all sites after scraping completes."""
-        with open(self.steps_path, "r", encoding="utf-8") as f:
-            steps_data = json.load(f)
+    def _hydrate_paginated_in_browser(
+        self,
+        jobs: List[Dict[str, Any]],
+        detail_steps: List[StepPlan],
+        redirect_step: StepPlan,
+        detail_base_url: str,
+    ) -> None:
+        for job in jobs:
+            if self._out_of_time():
+                break
+            # Every hydration starts with a fresh navigation, so this is
+            # a safe point to swap out a bloated driver.
+            driver = self._maybe_recycle_driver(self._local.driver, mid_site=True)
+            self._hydrate_paginated_job_detail(
+                driver, job, detail_steps, redirect_step, detail_base_url
+            )
+            self._item_delay()
 
-        driver = self._make_driver()
-        site_to_jobs: Dict[str, List[Dict[str, Any]]] = {}
+    def _detail_tab_count(self, redirect_step: StepPlan) -> int:
+        tabs = redirect_step.get("tabs")
+        if tabs is None:
+            tabs = _to_int_env("DETAIL_TABS", 4)
+        return max(1, int(tabs))
+
+    def _hydrate_jobs_in_tabs(
+        self,
+        driver: webdriver.Chrome,
+        jobs: List[Dict[str, Any]],
+        detail_urls: List[Optional[str]],
+        detail_steps: List[StepPlan],
+        redirect_step: StepPlan,
+    ) -> None:
+        """
+        Hydrate detail fields in batches of browser tabs. Every navigation in a
+        batch starts before any is waited on, so page loads overlap, and the
+        list page stays untouched in its own tab.
+        """
+        pending = [(idx, url) for idx, url in enumerate(detail_urls) if url]
+        if not pending:
+            return
+        wait_css = redirect_step.get("wait_css")
+        batch_size = self._detail_tab_count(redirect_step)
+        list_handle = driver.current_window_handle
+        _dbg(f"Tab hydrating {len(pending)} detail pages, {batch_size} at a time")
 
         try:
-            for site, steps in steps_data.items():
-                jobs, _ = self._run_site(driver, site, steps)
-                site_to_jobs[site] = jobs
+            for start in range(0, len(pending), batch_size):
+                if self._out_of_time():
+                    break
+                batch = pending[start : start + batch_size]
+                with self._profile(
+                    redirect_step.path, "redirect_tabs", items=len(batch)
+                ):
+                    tabs: List[Tuple[int, str, str]] = []
+                    # Handles not yet closed; whatever is left here when the
+                    # batch raises is closed before the error moves on.
+                    open_handles: List[str] = []
+                    try:
+                        for idx, url in batch:
+                            self._item_delay()
+                            self.rate_limiter.acquire(url)
+                            self._count_page(driver)
+                            try:
+                                driver.switch_to.new_window("tab")
+                                handle = driver.current_window_handle
+                                open_handles.append(handle)
+                                tabs.append((idx, url, handle))
+                                # Assigning location returns at once, unlike driver.get().
+                                driver.execute_script(
+                                    "window.location.href = arguments[0];",
+                                    self.fixtures.nav_url(url),
+                                )
+                            except WebDriverException as we:
+                                print(f"[warn] detail tab open failed: {url} {we}")
+
+                        for idx, url, handle in tabs:
+                            try:
+                                driver.switch_to.window(handle)
+                                if wait_css:
+                                    WebDriverWait(driver, self.default_wait).until(
+                                        EC.presence_of_element_located(
+                                            (By.CSS_SELECTOR, wait_css)
+                                        )
+                                    )
+                                self._settle(driver, reason="detail tab wait")
+                                # A throttled tab still runs its steps; the
+                                # backoff holds back the next batch.
+                                self.rate_limiter.observe(
+                                    url, self._navigation_status(driver)
+                                )
+                                self._record_page(driver, url)
+                                self._apply_detail_steps_live(
+                                    driver, jobs[idx], detail_steps
+                                )
+                            except WebDriverException as we:
+                                print(f"[warn] detail tab failed: {url} {we}")
+                            finally:
+                                open_handles.remove(handle)
+                                self._close_tab(driver, handle, list_handle)
+                    finally:
+                        for handle in open_handles:
+                            self._close_tab(driver, handle, list_handle)
         finally:
-            self._quit_driver(driver)
+            driver.switch_to.window(list_handle)
+
+    @staticmethod
+    def _close_tab(driver: webdriver.Chrome, handle: str, list_handle: str) -> None:
+        # A later switch_to.window must never land on a stale detail tab, so
+        # every tab is closed by handle and the list tab is focused again.
+        try:
+            driver.switch_to.window(handle)
+            driver.close()
+        except WebDriverException:
+            pass  # the tab is already gone
+        driver.switch_to.window(list_handle)
+
+    @staticmethod
+    def _list_fingerprint(job: Dict[str, Any]) -> str:
+        fields = {
+            str(k): str(v)
+            for k, v in job.items()
+            if v is not None and not str(k).startswith("__")
+        }
+        canon = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canon.encode("utf-8", "ignore")).hexdigest()
+
+    def _skip_known_detail(self, job: Dict[str, Any]) -> bool:
+        """
+        Stamp the job's list fingerprint and report whether its detail page can
+        be skipped because the same JobID was seen with identical list fields.
+        """
+        if self.known_jobs is None:
+            return False
+        fingerprint = self._list_fingerprint(job)
+        job["__list_fingerprint"] = fingerprint
+        known = self.known_jobs.get(getattr(self._local, "site", None) or "")
+        cid = canonical_job_id(job.get("JobID"))
+        if known and cid and known.get(cid) == fingerprint:
+            # run.py treats these rows as seen-and-unchanged without
+            # normalizing, so the missing JobDesc never reaches the hash.
+            job["__detail_skipped"] = True
+            return True
+        return False
+
+    @staticmethod
+    def _redirect_fetch_mode(redirect_step: Optional[StepPlan]) -> str:
+        return str((redirect_step or {}).get("fetch") or "browser").lower().strip()
+
+    def _apply_detail_steps_to_soup(
+        self,
+        soup: BeautifulSoup,
+        job: Dict[str, Any],
+        detail_steps: List[StepPlan],
+        page_url: str,
+    ) -> None:
+        # Mirrors the live-page branch of _apply_extract_step for fetched HTML.
+        # Sleep steps only exist to let a browser render, so they are skipped.
+        for step in detail_steps:
+            action = step.get("action")
+            if action == "extract":
+                with self._profile(step.path, "extract"):
+                    column = step.get("as_column")
+                    css = step.get("xpath")
+                    attr = step.get("attr_target")
+                    data_type = (step.get("data_type") or "").lower()
+                    if not column:
+                        continue
+                    if data_type == "current_url":
+                        job[column] = page_url
+                        continue
+                    if not css:
+                        continue
+                    tag = step.selector.select_one(soup)
+                    if tag is None:
+                        value = ""
+                    elif attr:
+                        raw = tag.get(attr)
+                        value = " ".join(raw) if isinstance(raw, list) else (raw or "")
+                    else:
+                        value = tag.get_text("\n", strip=True)
+                    # Selenium resolves href/src properties to absolute URLs.
+                    if value and (data_type == "url" or attr in ("href", "src")):
+                        value = self._normalize_url(page_url, value) or value
+                    job[column] = value
+                continue
+            if action == "replace_text":
+                self._apply_replace_text(job, step)
+                continue
+            if action == "regex_extract":
+                self._apply_regex_extract(job, step)
+                continue
+
+    def _hydrate_jobs_over_http(
+        self,
+        driver: webdriver.Chrome,
+        jobs: List[Dict[str, Any]],
+        detail_urls: List[Optional[str]],
+        detail_steps: List[StepPlan],
+        redirect_step: StepPlan,
+    ) -> List[int]:
+        """
+        Hydrate detail-only fields from server-rendered pages without leaving
+        the list page. Returns indexes of jobs the caller should hydrate in the
+        browser instead (fetch failed, or the page needs JavaScript).
+        """
+        pending = [(idx, url) for idx, url in enumerate(detail_urls) if url]
+        if not pending:
+            return []
 
-        return site_to_jobs
+        # Reuse the browser session so cookie-gated boards serve the same HTML.
+        try:
+            cookies = driver.get_cookies()
+            user_agent = driver.execute_script("return navigator.userAgent;")
+        except WebDriverException:
+            cookies, user_agent = [], None
+        headers = {"User-Agent": user_agent} if user_agent else {}
+
+        _dbg(f"HTTP hydrating {len(pending)} detail pages")
+        with self._profile(redirect_step.path, "redirect_http", items=len(pending)):
+            pages = self._http_get_many(
+                [url for _, url in pending], cookies=cookies, headers=headers
+            )
+
+        wait = redirect_step.wait
+        fallback: List[int] = []
+        for (idx, url), page in zip(pending, pages):
+            if not page.ok:
+                print(
+                    f"[warn] http detail fetch failed ({page.status}): {url} "
+                    f"{page.error or ''}".rstrip()
+                )
+                fallback.append(idx)
+                continue
+            soup = BeautifulSoup(page.text, "html.parser")
+            if wait is not None and wait.select_one(soup) is None:
+                # The same wait_css the browser path waits for doubles as the
+                # signal that the detail page is not server-rendered.
+                _dbg(f"wait_css missing from fetched HTML, using browser: {url}")
+                fallback.append(idx)
+                continue
+            self._apply_detail_steps_to_soup(soup, jobs[idx], detail_steps, page.url)
+        return fallback
+
+    def _configure_rate_limits(self, plans: Iterable[SitePlan]) -> None:
+        # A site's rate_limit_rps applies to the domains its load_url steps
+        # open; detail pages on other domains keep RATE_LIMIT_RPS.
+        for plan in plans:
+            rps = plan.config.get("rate_limit_rps")
+            if rps is None:
+                continue
+            for step in plan.steps:
+                if step.action == "load_url":
+                    self.rate_limiter.configure(
+                        step.get("url"),
+                        rps=rps,
+                        burst=plan.config.get("rate_limit_burst"),
+                    )
+
+    # ---------- Public (bulk) ----------
+    def run(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Legacy bulk mode: returns all sites after scraping completes."""
+        return dict(self.run_iter())
 
     # ---------- Public (streaming) ----------
     def run_iter(self) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
         """Streaming mode: yields (site, jobs) as each site completes scraping."""
-        with open(self.steps_path, "r", encoding="utf-8") as f:
-            steps_data = json.load(f)
+        for site, jobs, _ in self._iter_chunks(stream=False):
+            yield site, jobs
+
+    def run_iter_chunks(
+        self, claim: Optional[Callable[[], Optional[str]]] = None
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]], bool]]:
+        """
+        Chunked streaming: yields (site, jobs, done). Paginated sites arrive a
+        page or STREAM_CHUNK_SIZE jobs at a time, so the caller can persist
+        and drop them; done is True on each site's last chunk (which may be
+        empty). Chunks of different sites may interleave.
+
+        With ``claim``, each pool driver asks claim() for its next site name
+        instead of walking steps.json, until it returns None (app.site_queue).
+        Drivers then start only once a browser site is claimed.
+        """
+        yield from self._iter_chunks(
+            stream=self.stream_chunk_size > 0, claim=claim
+        )
+
+    def _iter_chunks(
+        self,
+        *,
+        stream: bool,
+        claim: Optional[Callable[[], Optional[str]]] = None,
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]], bool]]:
+        # Compiling first validates steps.json and fails fast on schema
+        # errors, before any browser is started.
+        plans = load_step_plans(self.steps_path)
+        if self.sites is not None:
+            plans = {site: plan for site, plan in plans.items() if site in self.sites}
+
+        browser_sites: Dict[str, SitePlan] = {}
+        http_sites: Dict[str, SitePlan] = {}
+        for site, plan in plans.items():
+            if plan.engine == "http":
+                http_sites[site] = plan
+            else:
+                browser_sites[site] = plan
+
+        self._blocking_configured = bool(env_block_categories()) or any(
+            "block_resources" in plan.config for plan in browser_sites.values()
+        )
+        self._perf_logging = network_idle_enabled() or self._blocking_configured
+        self._configure_rate_limits(plans.values())
+        with self._miss_lock:
+            self.miss_count = 0
+            self.miss_wait_secs = 0.0
+        self.profiler.reset()
+        self.driver_recycles = 0
+        self.site_errors = {}
+        self._run_deadline = (
+            time.monotonic() + self.run_budget_sec if self.run_budget_sec else None
+        )
+
+        try:
+            if claim is not None:
+                yield from self._run_iter_pool(
+                    {}, {}, stream=stream, claim=self._plan_claimer(plans, claim)
+                )
+                return
+            # Chunks are handed over from worker threads, so streaming always
+            # uses the pool, even with a single driver.
+            if (
+                stream
+                or http_sites
+                or (self.pool_size > 1 and len(browser_sites) > 1)
+            ):
+                yield from self._run_iter_pool(
+                    browser_sites, http_sites, stream=stream
+                )
+                return
+
+            if not browser_sites:
+                return  # every site was filtered out; no browser needed
+            self._local.slot = 0
+            driver = self._make_driver()
+            self._local.driver = driver
+            try:
+                for site, plan in browser_sites.items():
+                    if self._skip_site_out_of_time(site):
+                        yield site, [], True
+                        continue
+                    driver = self._maybe_recycle_driver(driver)
+                    jobs, err = self._run_site(driver, site, plan)
+                    driver = self._local.driver
+                    yield site, jobs, True  # allow caller to persist immediately
+            finally:
+                self._quit_driver(self._local.driver)
+        finally:
+            self.watchdog.stop()
+            self._close_http()
+            if browser_sites or claim is not None:
+                self._report_miss_waits()
+                if self.driver_recycles:
+                    print(f"[driver] recycled {self.driver_recycles} time(s)")
+
+    def _plan_claimer(
+        self,
+        plans: Dict[str, SitePlan],
+        claim: Callable[[], Optional[str]],
+    ) -> Callable[[], Optional[Tuple[str, Optional[SitePlan]]]]:
+        def _claim() -> Optional[Tuple[str, Optional[SitePlan]]]:
+            site = claim()
+            if site is None:
+                return None
+            plan = plans.get(site)
+            if plan is None:
+                self.site_errors[site] = "site is not in this node's steps.json"
+                print(f"[warn] {site}: {self.site_errors[site]}")
+            return site, plan
+
+        return _claim
+
+    def _run_iter_pool(
+        self,
+        browser_sites: Dict[str, SitePlan],
+        http_sites: Optional[Dict[str, SitePlan]] = None,
+        *,
+        stream: bool = False,
+        claim: Optional[Callable[[], Optional[Tuple[str, Optional[SitePlan]]]]] = None,
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]], bool]]:
+        # Each browser worker owns one driver and pulls whole sites from a
+        # shared queue, so a slow site only holds up its own browser. engine
+        # "http" sites run on their own lighter workers alongside. Results are
+        # handed back to the caller's thread, which keeps DB persistence
+        # single-threaded; when streaming, that includes mid-site chunks.
+        http_sites = http_sites or {}
+        work: "queue.Queue[Tuple[str, SitePlan]]" = queue.Queue()
+        for item in browser_sites.items():
+            work.put(item)
+        http_work: "queue.Queue[Tuple[str, SitePlan]]" = queue.Queue()
+        for item in http_sites.items():
+            http_work.put(item)
+        results: "queue.Queue[Tuple[str, Any, Any]]" = queue.Queue()
+        stop = threading.Event()
+        worker_count = (
+            self.pool_size if claim else min(self.pool_size, len(browser_sites))
+        )
+        http_worker_count = min(
+            max(1, _to_int_env("HTTP_SITE_CONCURRENCY", 4)), len(http_sites)
+        )
 
-        driver = self._make_driver()
+        def _next_site() -> Optional[Tuple[str, Optional[SitePlan]]]:
+            if claim is not None:
+                return claim()
+            try:
+                return work.get_nowait()
+            except queue.Empty:
+                return None
+
+        def _worker(slot: int) -> None:
+            self._local.slot = slot
+            self._local.driver = None
+            driver = None
+            if claim is None:
+                try:
+                    driver = self._make_driver(slot=slot)
+                except Exception as e:
+                    results.put(("__driver_failed__", slot, e))
+                    return
+                self._local.driver = driver
+            try:
+                while not stop.is_set():
+                    item = _next_site()
+                    if item is None:
+                        break
+                    site, plan = item
+                    if plan is None or self._skip_site_out_of_time(site):
+                        results.put(("site", site, []))
+                        continue
+                    if claim is not None and plan.engine == "http":
+                        # Claimed sites come in any order, so a browser
+                        # worker also runs the static ones.
+                        jobs, err = self._run_site_http(site, plan)
+                        results.put(("site", site, jobs))
+                        continue
+                    try:
+                        if driver is None:
+                            driver = self._make_driver(slot=slot)
+                            self._local.driver = driver
+                        driver = self._maybe_recycle_driver(driver)
+                    except Exception as e:
+                        print(f"[warn] driver slot {slot} restart failed: {e}")
+                        if claim is not None:
+                            # The claim cannot be handed back; report the site.
+                            self.site_errors[site] = f"driver start failed: {e}"
+                            results.put(("site", site, []))
+                        else:
+                            # Leave the site to the surviving drivers.
+                            work.put((site, plan))
+                        break
+                    if stream:
+                        self._local.emit = lambda chunk, site=site: results.put(
+                            ("chunk", site, chunk)
+                        )
+                    try:
+                        jobs, err = self._run_site(driver, site, plan)
+                    finally:
+                        self._local.emit = None
+                    driver = self._local.driver
+                    results.put(("site", site, jobs))
+            finally:
+                self._quit_driver(self._local.driver)
+                results.put(("__worker_done__", slot, None))
+
+        def _http_worker(slot: int) -> None:
+            try:
+                while not stop.is_set():
+                    try:
+                        site, plan = http_work.get_nowait()
+                    except queue.Empty:
+                        break
+                    if self._skip_site_out_of_time(site):
+                        results.put(("site", site, []))
+                        continue
+                    jobs, err = self._run_site_http(site, plan)
+                    results.put(("site", site, jobs))
+            finally:
+                results.put(("__http_worker_done__", slot, None))
+
+        _dbg(
+            f"Starting driver pool size={worker_count} "
+            f"http workers={http_worker_count}"
+        )
+        threads = [
+            threading.Thread(
+                target=_worker, args=(slot,), name=f"scraper-{slot}", daemon=True
+            )
+            for slot in range(worker_count)
+        ] + [
+            threading.Thread(
+                target=_http_worker,
+                args=(slot,),
+                name=f"scraper-http-{slot}",
+                daemon=True,
+            )
+            for slot in range(http_worker_count)
+        ]
+        for t in threads:
+            t.start()
+
+        started = 0
+        finished = 0
+        start_error: Optional[Exception] = None
         try:
-            for site, steps in steps_data.items():
-                jobs, err = self._run_site(driver, site, steps)
-                yield site, jobs  # allow caller to persist immediately
+            while finished < len(threads):
+                kind, key, value = results.get()
+                if kind == "site":
+                    yield key, value, True  # allow caller to persist immediately
+                elif kind == "chunk":
+                    yield key, value, False
+                elif kind == "__driver_failed__":
+                    finished += 1
+                    start_error = start_error or value
+                    _dbg(f"Driver pool slot {key} failed to start: {value}")
+                elif kind == "__worker_done__":
+                    started += 1
+                    finished += 1
+                else:
+                    finished += 1
+            # Surviving drivers drain the queue; only a fully failed pool
+            # leaves sites behind, which matches the single-driver failure.
+            if worker_count and started == 0 and start_error is not None:
+                raise start_error
         finally:
-            self._quit_driver(driver)
+            stop.set()
+            for t in threads:
+                t.join()
 
     # ---------- Site runner ----------
     def _run_site(
-        self, driver: webdriver.Chrome, site: str, steps: List[Dict[str, Any]]
+        self, driver: webdriver.Chrome, site: str, plan: SitePlan
     ) -> tuple[List[Dict[str, Any]], Optional[str]]:
         _dbg(f"=== Site: {site} ===")
+        self._local.driver = driver
+        self._local.site = site
+        self._local.site_config = plan.config
+        self._local.last_action_at = None
+        self._local.emitted = 0
         jobs: List[Dict[str, Any]] = []
         json_payload: Optional[str] = None
         err: Optional[str] = None
+        started = time.monotonic()
+        self._begin_site_budget(plan)
+        self._watch_site(driver)
+        blocked_patterns = self._start_resource_blocking(driver)
+        probe: Optional[Tuple[float, float]] = None
 
         try:
-            for step in steps:
+            for step in plan.steps:
+                if self._out_of_time():
+                    break
+                # A paginated data_extract may have recycled the driver.
+                driver = self._local.driver
                 action = step.get("action")
                 _dbg(f"Step: {action} :: {step}")
+                probe, jobs_before = self.profiler.start(), self._jobs_so_far(jobs)
 
                 if action == "load_url":
-                    driver.get(step["url"])
+                    self._goto(driver, step.get("url"))
+                    self._record_page(driver, step.get("url"))
 
                 if action == "debug_print_dom_by_css":
                     find_css = step.get("find_css")
@@ -582,12 +1780,7 @@ class StepScraper:
                         _dbg(f"Debug HTML for selector '{find_css}' = {dbg_html}")
 
                 elif action == "sleep":
-                    if "seconds" in step:
-                        secs = float(step.get("seconds") or 0)
-                        _dbg(f"Top-level explicit sleep {secs:.3f}s")
-                        time.sleep(max(0.0, secs))
-                    else:
-                        _sleep_default(reason="Top-level sleep (default)")
+                    self._run_sleep_step(step, prefix="Top-level", driver=driver)
 
                 elif action == "scroll_to":
                     css = step.get("xpath") or step.get("selector")
@@ -635,14 +1828,15 @@ class StepScraper:
                     pagination = step.get("pagination")
                     if isinstance(pagination, dict) and pagination.get("mode"):
                         # Paginated extraction collects every result page before
-                        # visiting detail pages, then returns one complete list
-                        # for the site's normal persistence/delta logic.
+                        # visiting detail pages. When streaming, finished jobs
+                        # go straight to the caller and only the rest return.
                         jobs.extend(
                             self._extract_from_list_paginated(
                                 driver=driver,
                                 focus_scope=step.get("focus_scope"),
-                                extract_steps=step.get("extract_steps") or [],
+                                extract_steps=list(step.extract_steps),
                                 pagination=pagination,
+                                step_path=step.path,
                             )
                         )
                     else:
@@ -650,25 +1844,21 @@ class StepScraper:
                             self._extract_from_list(
                                 driver=driver,
                                 focus_scope=step.get("focus_scope"),
-                                extract_steps=step.get("extract_steps") or [],
+                                extract_steps=list(step.extract_steps),
                             )
                         )
 
                 elif action == "json_set_payload":
+                    self._record_page(driver)
                     json_payload = driver.execute_script(
                         "return document.body.innerText;"
                     )
 
                 elif action == "json_replace_text":
                     if json_payload is not None:
-                        tf = step.get("text_find")
-                        tr = step.get("text_replace")
-                        if tf == "__strip_js_wrapper__":
-                            m = re.search(r"({.*})", json_payload, re.DOTALL)
-                            if m:
-                                json_payload = m.group(1)
-                        else:
-                            json_payload = json_payload.replace(tf, tr)
+                        json_payload = self._apply_json_replace_text(
+                            json_payload, step
+                        )
 
                 elif action == "json_data_extract":
                     if json_payload is not None:
@@ -684,18 +1874,216 @@ class StepScraper:
                             )
                         )
 
+                self._stop_step(probe, step, self._jobs_so_far(jobs) - jobs_before)
+                probe = None
+
         except Exception as e:
             err = str(e)
+            if probe is not None:
+                self._stop_step(probe, step, 0)
 
+        err = self._end_site_budget(site, started, jobs, err)
+        driver = self._local.driver
+        if blocked_patterns and not getattr(driver, "_jobscrape_killed", False):
+            self._report_resource_blocking(driver, site)
         return jobs, err
 
+    @staticmethod
+    def _apply_json_replace_text(json_payload: str, step: StepPlan) -> str:
+        tf = step.get("text_find")
+        tr = step.get("text_replace")
+        if tf == "__strip_js_wrapper__":
+            m = re.search(r"({.*})", json_payload, re.DOTALL)
+            return m.group(1) if m else json_payload
+        return json_payload.replace(tf, tr)
+
+    # ---------- Static (engine "http") site runner ----------
+    def _fetch_site_page(self, url: str) -> HttpPage:
+        page = self._http_get(url)
+        if not page.ok:
+            raise RuntimeError(
+                f"http fetch failed ({page.status}): {url} {page.error or ''}".rstrip()
+            )
+        return page
+
+    def _run_site_http(
+        self, site: str, plan: SitePlan
+    ) -> tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Run a site's steps against server-rendered HTML fetched with the pooled
+        HTTP client. Steps that need a live page (clicks, typing, scrolling)
+        fail the site with an error instead of silently returning nothing.
+        """
+        _dbg(f"=== Site (http): {site} ===")
+        self._local.site = site
+        self._local.site_config = plan.config
+        self._local.last_action_at = None
+        self._local.emitted = 0
+        jobs: List[Dict[str, Any]] = []
+        json_payload: Optional[str] = None
+        page: Optional[HttpPage] = None
+        err: Optional[str] = None
+        started = time.monotonic()
+        self._begin_site_budget(plan)
+        probe: Optional[Tuple[float, float]] = None
+
+        try:
+            for step in plan.steps:
+                if self._out_of_time():
+                    break
+                action = step.action
+                _dbg(f"Step: {action} :: {step}")
+
+                if action == "site_config":
+                    continue
+                probe, jobs_before = self.profiler.start(), len(jobs)
+
+                if action == "load_url":
+                    page = self._fetch_site_page(step.get("url"))
+
+                elif action == "sleep":
+                    if "seconds" in step:
+                        self._run_sleep_step(step, prefix="Top-level")
+                    else:
+                        # Fetched HTML is complete on arrival; only the site's
+                        # politeness floor applies.
+                        self._politeness_floor(reason="Top-level sleep (default)")
+
+                elif action == "data_extract":
+                    if page is None:
+                        raise RuntimeError("data_extract before load_url")
+                    if step.get("pagination"):
+                        print(
+                            f"[warn] {site}: pagination is not supported with "
+                            "engine 'http'; reading the first page only"
+                        )
+                    jobs.extend(self._extract_from_html_list(page=page, step=step))
+
+                elif action == "json_set_payload":
+                    if page is None:
+                        raise RuntimeError("json_set_payload before load_url")
+                    # Browsers show JSON bodies as text; HTML bodies are
+                    # reduced to their visible text like innerText.
+                    body = page.text.strip()
+                    if body[:1] in ("{", "[") or "<html" not in body[:512].lower():
+                        json_payload = page.text
+                    else:
+                        json_payload = BeautifulSoup(
+                            page.text, "html.parser"
+                        ).get_text("\n")
+
+                elif action == "json_replace_text":
+                    if json_payload is not None:
+                        json_payload = self._apply_json_replace_text(
+                            json_payload, step
+                        )
+
+                elif action == "json_data_extract":
+                    if json_payload is not None:
+                        jobs.extend(self._extract_from_json(json_payload, step))
+
+                elif action:
+                    raise RuntimeError(
+                        f"action '{action}' needs a browser; "
+                        "remove engine 'http' from site_config"
+                    )
+
+                self._stop_step(probe, step, len(jobs) - jobs_before)
+                probe = None
+
+        except Exception as e:
+            err = str(e)
+            print(f"[warn] {site}: {err}")
+            if probe is not None:
+                self._stop_step(probe, step, 0)
+
+        return jobs, self._end_site_budget(site, started, jobs, err)
+
+    def _extract_from_html_list(
+        self,
+        *,
+        page: HttpPage,
+        step: StepPlan,
+    ) -> List[Dict[str, Any]]:
+        if step.focus is None:
+            return []
+        items = step.focus.select(BeautifulSoup(page.text, "html.parser"))
+        if not items:
+            print(f"[warn] focus_scope not found: {step.get('focus_scope')}")
+            return []
+        # Detached, wrapped copies like the browser's snapshot, so selectors
+        # (and link_css) that name the item itself match here too.
+        items = _wrap_item_soups([str(item) for item in items])
+
+        list_steps, detail_steps, redirect_step = (
+            self._split_extract_steps_for_pagination(list(step.extract_steps))
+        )
+        jobs: List[Dict[str, Any]] = []
+        detail_urls: List[Optional[str]] = []
+
+        for item in items:
+            job: Dict[str, Any] = {}
+            for es in list_steps:
+                es_action = es.action
+                if es_action == "extract":
+                    column = es.get("as_column")
+                    css = es.get("xpath")
+                    attr = es.get("attr_target")
+                    if not column:
+                        continue
+                    if (es.get("data_type") or "").lower() == "current_url":
+                        job[column] = page.url
+                        continue
+                    if not css:
+                        continue
+                    with self._profile(es.path, "extract"):
+                        tag = es.selector.select_one(item)
+                        job[column] = (
+                            tag.get(attr)
+                            if (attr and tag and tag.has_attr(attr))
+                            else (tag.get_text(strip=True) if tag else "")
+                        )
+                elif es_action == "replace_text":
+                    self._apply_replace_text(job, es)
+                elif es_action == "regex_extract":
+                    self._apply_regex_extract(job, es)
+            jobs.append(job)
+            if redirect_step and detail_steps:
+                detail_urls.append(
+                    None
+                    if self._skip_known_detail(job)
+                    else self._resolve_detail_url(page.url, job, redirect_step, item)
+                )
+
+        pending = [(idx, url) for idx, url in enumerate(detail_urls) if url]
+        if pending:
+            _dbg(f"HTTP fetching {len(pending)} detail pages")
+            with self._profile(redirect_step.path, "redirect_http", items=len(pending)):
+                pages = self._http_get_many([url for _, url in pending])
+            for (idx, url), detail in zip(pending, pages):
+                if not detail.ok:
+                    # No browser to fall back to; keep the list fields.
+                    print(
+                        f"[warn] http detail fetch failed ({detail.status}): "
+                        f"{url} {detail.error or ''}".rstrip()
+                    )
+                    continue
+                self._apply_detail_steps_to_soup(
+                    BeautifulSoup(detail.text, "html.parser"),
+                    jobs[idx],
+                    detail_steps,
+                    detail.url,
+                )
+        return jobs
+
     # ---------- Pagination wrapper ----------
     def _extract_from_list_paginated(
         self,
         driver: webdriver.Chrome,
         focus_scope: Optional[str],
-        extract_steps: List[Dict[str, Any]],
+        extract_steps: List[StepPlan],
         pagination: Dict[str, Any],
+        step_path: str = "",
     ) -> List[Dict[str, Any]]:
         """
         Pagination config (inside data_extract step):
@@ -737,9 +2125,24 @@ class StepScraper:
             self._split_extract_steps_for_pagination(extract_steps)
         )
 
+        hydrate_details = bool(redirect_step and detail_steps)
+        # When streaming, pages are handed to the caller as they finish. HTTP
+        # and tab hydration never leave the list tab, so those pages can be
+        # hydrated before clicking next; browser redirects still wait for the
+        # end of pagination and go out in STREAM_CHUNK_SIZE chunks.
+        streaming = self._streaming()
+        per_page = streaming and (
+            not hydrate_details
+            or self._redirect_fetch_mode(redirect_step) in ("http", "tabs")
+        )
+        # HTTP hydrations that need the browser wait until paging is done.
+        held: List[Dict[str, Any]] = []
+        committed = self.resume_jobs.get(getattr(self._local, "site", None) or "")
+
         all_jobs: List[Dict[str, Any]] = []
+        total = 0
         seen_page_sigs: set[str] = set()
-        detail_base_url = driver.current_url
+        detail_base_url = self._page_url(driver)
 
         # determine initial page number if possible
         page_num = (
@@ -748,6 +2151,8 @@ class StepScraper:
         _dbg(f"Initial page number: {page_num}")
 
         for page_idx in range(max_pages):
+            if self._out_of_time():
+                break
             _dbg(f"Extracting page {page_num} (iteration {page_idx+1}/{max_pages})")
             # Step 1: read only the current page's list cards/rows.
             page_jobs = self._extract_from_list(
@@ -763,7 +2168,7 @@ class StepScraper:
                     # intentionally not part of Job hashing or the DB schema.
                     j[page_as_column] = page_num
 
-            all_jobs.extend(page_jobs)
+            total += len(page_jobs)
             _dbg(f"Extracted {len(page_jobs)} jobs from page {page_num}")
 
             # Stop immediately on an empty page; there is nothing useful to
@@ -772,6 +2177,38 @@ class StepScraper:
                 _dbg("No jobs found on this page, stopping pagination.")
                 break
 
+            # A resumed run only clicks through pages it already committed.
+            todo = page_jobs
+            if committed:
+                todo = [
+                    job
+                    for job in page_jobs
+                    if canonical_job_id(job.get("JobID")) not in committed
+                ]
+                if len(todo) < len(page_jobs):
+                    _dbg(
+                        f"Skipping {len(page_jobs) - len(todo)} jobs committed "
+                        "before the resume"
+                    )
+
+            if per_page:
+                ready = todo
+                if hydrate_details:
+                    deferred = self._hydrate_paginated_jobs(
+                        driver,
+                        todo,
+                        detail_steps,
+                        redirect_step,
+                        detail_base_url,
+                        defer_browser=True,
+                    )
+                    held.extend(deferred)
+                    deferred_ids = {id(job) for job in deferred}
+                    ready = [job for job in todo if id(job) not in deferred_ids]
+                self._emit_chunk(ready)
+            else:
+                all_jobs.extend(todo)
+
             # Step 2: record a compact page signature before clicking next. If a
             # site loops back to the same page, this prevents infinite scraping.
             first_id = str(page_jobs[0].get("JobID") or "").strip()
@@ -788,46 +2225,50 @@ class StepScraper:
                 _dbg("Next button is disabled or not found, stopping pagination.")
                 break
 
-            # Step 3: capture markers that should change after clicking next.
-            # Workday may keep the same URL, so we also watch the active page
-            # label and first result row.
-            before_url = driver.current_url
-            before_page = (self._safe_find_text(driver, current_page_css) or "").strip()
-            before_first = self._safe_find_first_outer_html(driver, focus_scope) or ""
-            _dbg(f"Clicking next: before_url={before_url}, before_page={before_page}")
-
-            if not self._click_css(driver, next_page_css):
-                _dbg("Failed to click next button, stopping pagination.")
-                break
+            with self._profile(step_path, "next_page"):
+                # Step 3: capture markers that should change after clicking next.
+                # Workday may keep the same URL, so we also watch the active page
+                # label and first result row.
+                before_url = driver.current_url
+                before_page = (self._safe_find_text(driver, current_page_css) or "").strip()
+                before_first = self._safe_find_first_outer_html(driver, focus_scope) or ""
+                _dbg(f"Clicking next: before_url={before_url}, before_page={before_page}")
+
+                self.rate_limiter.acquire(before_url)
+                self._count_page(driver)
+                if not self._click_css(driver, next_page_css):
+                    _dbg("Failed to click next button, stopping pagination.")
+                    break
 
-            # Step 4: wait for evidence that the browser is showing the next
-            # result page before extracting again.
-            try:
-                WebDriverWait(driver, self.default_wait).until(
-                    lambda d: (
-                        d.current_url != before_url
-                        or (
-                            (self._safe_find_text(d, current_page_css) or "").strip()
-                            != before_page
-                            and bool(current_page_css)
-                        )
-                        or (
-                            (self._safe_find_first_outer_html(d, focus_scope) or "")
-                            != before_first
-                            and bool(before_first)
+                # Step 4: wait for evidence that the browser is showing the next
+                # result page before extracting again.
+                try:
+                    WebDriverWait(driver, self.default_wait).until(
+                        lambda d: (
+                            d.current_url != before_url
+                            or (
+                                (self._safe_find_text(d, current_page_css) or "").strip()
+                                != before_page
+                                and bool(current_page_css)
+                            )
+                            or (
+                                (self._safe_find_first_outer_html(d, focus_scope) or "")
+                                != before_first
+                                and bool(before_first)
+                            )
                         )
                     )
-                )
-                _dbg("Page advanced after clicking next.")
-            except TimeoutException:
-                _dbg(
-                    "Timeout waiting for page to advance after clicking next. Stopping pagination."
-                )
-                break
+                    _dbg("Page advanced after clicking next.")
+                except TimeoutException:
+                    _dbg(
+                        "Timeout waiting for page to advance after clicking next. Stopping pagination."
+                    )
+                    break
 
             if page_wait_ms > 0:
                 _dbg(f"Sleeping for {page_wait_ms}ms after page advance.")
-                _sleep_ms(page_wait_ms, reason="pagination post-click wait")
+                with self._profile(step_path, "page_wait"):
+                    _sleep_ms(page_wait_ms, reason="pagination post-click wait")
 
             # Step 5: prefer the site's visible page label; otherwise keep a
             # local counter so __page remains useful when selectors are missing.
@@ -837,19 +2278,35 @@ class StepScraper:
             ) or (page_num + 1)
             _dbg(f"Updated page number: {prev_page_num} -> {page_num}")
 
-        if redirect_step and detail_steps and all_jobs:
+        if held:
+            # HTTP fetches that fell back to the browser had to wait until the
+            # list cursor was no longer needed.
+            self._hydrate_paginated_in_browser(
+                held, detail_steps, redirect_step, detail_base_url
+            )
+            self._emit_chunk(held)
+
+        if hydrate_details and all_jobs and not per_page:
             # Step 6: now that pagination is complete, hydrate detail-only fields
             # from each collected JobUrl. This is what prevents detail redirects
-            # from corrupting the list-page cursor.
-            _dbg(f"Hydrating details for {len(all_jobs)} paginated jobs.")
-            for job in all_jobs:
-                self._hydrate_paginated_job_detail(
-                    driver, job, detail_steps, redirect_step, detail_base_url
+            # from corrupting the list-page cursor. When streaming, each
+            # hydrated chunk is handed off and dropped.
+            chunk_size = self.stream_chunk_size if streaming else len(all_jobs)
+            pending, all_jobs = all_jobs, []
+            while pending:
+                chunk = pending[:chunk_size]
+                del pending[:chunk_size]
+                self._hydrate_paginated_jobs(
+                    self._local.driver,
+                    chunk,
+                    detail_steps,
+                    redirect_step,
+                    detail_base_url,
                 )
-                if ITEM_DELAY_MS > 0:
-                    _sleep_ms(ITEM_DELAY_MS, reason="item delay")
+                if not self._emit_chunk(chunk):
+                    all_jobs.extend(chunk)
 
-        _dbg(f"Pagination complete. Total jobs extracted: {len(all_jobs)}")
+        _dbg(f"Pagination complete. Total jobs extracted: {total}")
         return all_jobs
 
     # ---------- List → optional detail ----------
@@ -857,7 +2314,7 @@ class StepScraper:
         self,
         driver: webdriver.Chrome,
         focus_scope: Optional[str],
-        extract_steps: List[Dict[str, Any]],
+        extract_steps: List[StepPlan],
         *,
         include_item_delay: bool = True,
     ) -> List[Dict[str, Any]]:
@@ -873,21 +2330,50 @@ class StepScraper:
             print(f"[warn] focus_scope not found: {focus_scope}")
             return []
 
-        list_url = driver.current_url
-        elements = driver.find_elements(By.CSS_SELECTOR, focus_scope)
+        list_url = self._page_url(driver)
+        self._record_page(driver)
+        rows = self._bulk_extract(driver, focus_scope, extract_steps)
+        if rows is not None:
+            return rows
+        # Snapshot every item's markup in one round trip. Live elements are
+        # only needed (and re-queried) when an item has to be clicked.
+        item_soups = self._snapshot_item_soups(driver, focus_scope)
+        elements: List[Any] = []
+        if item_soups is None:
+            elements = driver.find_elements(By.CSS_SELECTOR, focus_scope)
+        item_count = len(item_soups) if item_soups is not None else len(elements)
         jobs: List[Dict[str, Any]] = []
 
-        for idx, el in enumerate(elements):
-            try:
-                item_html = el.get_attribute("outerHTML")
-            except WebDriverException:
-                elements = driver.find_elements(By.CSS_SELECTOR, focus_scope)
-                if idx >= len(elements):
-                    break
+        # fetch="http" and fetch="tabs" redirects defer detail work until every
+        # list item is read, then hydrate all of them concurrently without
+        # navigating the list page away.
+        _, detail_steps, redirect_step = self._split_extract_steps_for_pagination(
+            extract_steps
+        )
+        fetch_mode = self._redirect_fetch_mode(redirect_step)
+        deferred_detail = bool(
+            redirect_step and detail_steps and fetch_mode in ("http", "tabs")
+        )
+        detail_urls: List[Optional[str]] = []
+
+        for idx in range(item_count):
+            if self._out_of_time():
+                break
+            el = None
+            if item_soups is not None:
+                soup = item_soups[idx]
+            else:
                 el = elements[idx]
-                item_html = el.get_attribute("outerHTML")
+                try:
+                    item_html = el.get_attribute("outerHTML")
+                except WebDriverException:
+                    elements = driver.find_elements(By.CSS_SELECTOR, focus_scope)
+                    if idx >= len(elements):
+                        break
+                    el = elements[idx]
+                    item_html = el.get_attribute("outerHTML")
+                soup = BeautifulSoup(item_html, "html.parser")
 
-            soup = BeautifulSoup(item_html, "html.parser")
             job: Dict[str, Any] = {}
             redirected = False
 
@@ -895,7 +2381,8 @@ class StepScraper:
                 es_action = es.get("action")
 
                 if es_action == "sleep":
-                    self._run_sleep_step(es, prefix="Inner")
+                    with self._profile(es.path, "sleep"):
+                        self._run_sleep_step(es, prefix="Inner", driver=driver)
                     continue
 
                 if es_action == "extract":
@@ -908,68 +2395,74 @@ class StepScraper:
                     )
                     continue
 
+                if es_action == "redirect" and deferred_detail:
+                    detail_urls.append(
+                        None
+                        if self._skip_known_detail(job)
+                        else self._resolve_detail_url(list_url, job, es, soup)
+                    )
+                    break
+
                 if es_action == "redirect" and not redirected:
-                    using_col = es.get("using_column")
-                    link_css = es.get("link_css")
-                    wait_css = es.get("wait_css")
+                    if self._skip_known_detail(job):
+                        break
+                    with self._profile(es.path, "redirect"):
+                        link_css = es.get("link_css")
+                        wait_css = es.get("wait_css")
 
-                    detail_url = (
-                        self._normalize_url(driver.current_url, job.get(using_col))
-                        if using_col
-                        else None
-                    )
-                    if not detail_url and link_css:
-                        link_tag = soup.select_one(link_css)
-                        if link_tag and link_tag.has_attr("href"):
-                            detail_url = self._normalize_url(
-                                driver.current_url, link_tag["href"]
-                            )
+                        detail_url = self._resolve_detail_url(
+                            self._page_url(driver), job, es, soup
+                        )
 
-                    if detail_url:
-                        try:
-                            _dbg(f"GET detail: {detail_url}")
-                            driver.get(detail_url)
-                            redirected = True
-                            if wait_css:
-                                WebDriverWait(driver, self.default_wait).until(
-                                    EC.presence_of_element_located(
-                                        (By.CSS_SELECTOR, wait_css)
+                        if detail_url:
+                            try:
+                                _dbg(f"GET detail: {detail_url}")
+                                self._goto(driver, detail_url)
+                                redirected = True
+                                if wait_css:
+                                    WebDriverWait(driver, self.default_wait).until(
+                                        EC.presence_of_element_located(
+                                            (By.CSS_SELECTOR, wait_css)
+                                        )
                                     )
-                                )
-                        except WebDriverException as we:
-                            print(f"[warn] redirect get() failed: {we}")
-                            redirected = False
+                            except WebDriverException as we:
+                                print(f"[warn] redirect get() failed: {we}")
+                                redirected = False
 
-                    if not redirected:
-                        try:
-                            clickable = (
-                                el.find_element(By.CSS_SELECTOR, link_css)
-                                if link_css
-                                else el.find_element(By.CSS_SELECTOR, "a")
-                            )
-                            driver.execute_script(
-                                "arguments[0].scrollIntoView({block:'center'});",
-                                clickable,
-                            )
+                        if not redirected:
                             try:
-                                clickable.click()
-                            except ElementClickInterceptedException:
+                                if el is None:
+                                    el = self._live_item_element(driver, focus_scope, idx)
+                                clickable = self._find_optional(el, link_css or "a")
+                                if clickable is None:
+                                    raise NoSuchElementException(
+                                        f"no link {link_css or 'a'} in list item"
+                                    )
                                 driver.execute_script(
-                                    "arguments[0].click();", clickable
+                                    "arguments[0].scrollIntoView({block:'center'});",
+                                    clickable,
                                 )
-                            redirected = True
-                            if wait_css:
-                                WebDriverWait(driver, self.default_wait).until(
-                                    EC.presence_of_element_located(
-                                        (By.CSS_SELECTOR, wait_css)
+                                self._count_page(driver)
+                                try:
+                                    clickable.click()
+                                except ElementClickInterceptedException:
+                                    driver.execute_script(
+                                        "arguments[0].click();", clickable
                                     )
-                                )
-                        except Exception as ce:
-                            print(f"[warn] redirect click failed: {ce}")
-                            redirected = False
+                                redirected = True
+                                if wait_css:
+                                    WebDriverWait(driver, self.default_wait).until(
+                                        EC.presence_of_element_located(
+                                            (By.CSS_SELECTOR, wait_css)
+                                        )
+                                    )
+                            except Exception as ce:
+                                print(f"[warn] redirect click failed: {ce}")
+                                redirected = False
 
-                    if redirected:
-                        _sleep_default(reason="post-redirect sleep (default)")
+                        if redirected:
+                            self._settle(driver, reason="post-redirect wait")
+                            self._record_page(driver, detail_url)
                     continue
 
                 if es_action == "replace_text":
@@ -985,55 +2478,83 @@ class StepScraper:
 
             if redirected:
                 # IMPORTANT: prefer back() to preserve pagination/session state
-                try:
-                    driver.back()
-                    WebDriverWait(driver, self.default_wait).until(
-                        EC.presence_of_all_elements_located(
-                            (By.CSS_SELECTOR, focus_scope)
-                        )
-                    )
-                except Exception:
+                with self._profile(redirect_step.path if redirect_step else "", "back"):
                     try:
-                        driver.get(list_url)
+                        driver.back()
                         WebDriverWait(driver, self.default_wait).until(
                             EC.presence_of_all_elements_located(
                                 (By.CSS_SELECTOR, focus_scope)
                             )
                         )
                     except Exception:
-                        pass
+                        try:
+                            self._goto(driver, list_url)
+                            WebDriverWait(driver, self.default_wait).until(
+                                EC.presence_of_all_elements_located(
+                                    (By.CSS_SELECTOR, focus_scope)
+                                )
+                            )
+                        except Exception:
+                            pass
 
             jobs.append(job)
+            if deferred_detail and len(detail_urls) < len(jobs):
+                detail_urls.append(None)
+
+            if (
+                include_item_delay
+                and not deferred_detail
+                and not job.get("__detail_skipped")
+            ):
+                self._item_delay()
+
+        if deferred_detail and fetch_mode == "tabs" and jobs:
+            self._hydrate_jobs_in_tabs(
+                driver, jobs, detail_urls, detail_steps, redirect_step
+            )
 
-            if include_item_delay and ITEM_DELAY_MS > 0:
-                _sleep_ms(ITEM_DELAY_MS, reason="item delay")
+        if deferred_detail and fetch_mode == "http" and jobs:
+            fallback = self._hydrate_jobs_over_http(
+                driver, jobs, detail_urls, detail_steps, redirect_step
+            )
+            for idx in fallback:
+                if self._out_of_time():
+                    break
+                self._hydrate_paginated_job_detail(
+                    driver, jobs[idx], detail_steps, redirect_step, list_url
+                )
+                self._item_delay()
+            if fallback:
+                # Browser fallbacks leave the driver on a detail page; later
+                # top-level steps expect the list page.
+                try:
+                    self._goto(driver, list_url)
+                except WebDriverException:
+                    pass
 
         return jobs
 
     # ---------- JSON ----------
     def _extract_from_json(
-        self, json_payload: str, step: Dict[str, Any]
+        self, json_payload: str, step: StepPlan
     ) -> List[Dict[str, Any]]:
-        extract_steps = step.get("extract_steps") or []
         focus_scope = step.get("focus_scope")
         data = json.loads(json_payload)
         items = data.get(focus_scope, [])
         out: List[Dict[str, Any]] = []
         for it in items:
             job: Dict[str, Any] = {}
-            for es in extract_steps:
-                if es.get("action") != "extract":
+            for es in step.extract_steps:
+                if es.action != "extract":
                     continue
                 column = es.get("as_column")
-                key = es.get("key")
                 if not column:
                     continue
                 cur: Any = it
-                if key:
-                    for part in re.split(r"[>.]", key):
-                        cur = cur.get(part) if isinstance(cur, dict) else None
-                        if cur is None:
-                            break
+                for part in es.key_path:
+                    cur = cur.get(part) if isinstance(cur, dict) else None
+                    if cur is None:
+                        break
                 # Some JSON APIs expose full descriptions as HTML; steps opt in per field.
                 if es.get("html_to_text") and isinstance(cur, str):
                     cur = html_to_text(cur)
@@ -1042,11 +2563,9 @@ class StepScraper:
         return out
 
     @staticmethod
-    def _json_path_get(data: Any, path: Optional[str]) -> Any:
-        if not path:
-            return data
+    def _json_path_get(data: Any, path: Tuple[str, ...]) -> Any:
         cur = data
-        for part in re.split(r"[>.]", path):
+        for part in path:
             if isinstance(cur, dict):
                 cur = cur.get(part)
             elif isinstance(cur, list) and part.isdigit():
@@ -1058,14 +2577,11 @@ class StepScraper:
         return cur
 
     @staticmethod
-    def _element_value(
-        element: BeautifulSoup,
-        css: Optional[str],
-        attr: Optional[str],
-    ) -> str:
-        tag = element.select_one(css) if css else element
+    def _element_value(element: BeautifulSoup, step: StepPlan) -> str:
+        tag = step.selector.select_one(element) if step.selector else element
         if not tag:
             return ""
+        attr = step.get("attr_target")
         if attr:
             return str(tag.get(attr, "") or "").strip()
         return tag.get_text(" ", strip=True)
@@ -1075,46 +2591,45 @@ class StepScraper:
         *,
         driver: webdriver.Chrome,
         json_payload: str,
-        step: Dict[str, Any],
+        step: StepPlan,
     ) -> List[Dict[str, Any]]:
         data = json.loads(json_payload)
-        html = self._json_path_get(data, step.get("html_key"))
-        if html is None:
-            html = self._json_path_get(data, step.get("focus_html_key"))
+        html = None
+        for path in step.html_paths:
+            html = self._json_path_get(data, path)
+            if html is not None:
+                break
         if not isinstance(html, str) or not html.strip():
             return []
 
-        focus_scope = step.get("focus_scope")
-        if not focus_scope:
+        if step.focus is None:
             return []
 
-        base_url = step.get("base_url") or driver.current_url
-        extract_steps = step.get("extract_steps") or []
-        soup = BeautifulSoup(html, "html.parser")
-        elements = soup.select(focus_scope)
+        base_url = step.get("base_url") or self._page_url(driver)
+        elements = step.focus.select(BeautifulSoup(html, "html.parser"))
         jobs: List[Dict[str, Any]] = []
 
         for element in elements:
+            if self._out_of_time():
+                break
             job: Dict[str, Any] = {}
             redirected = False
 
-            for es in extract_steps:
-                action = es.get("action")
+            for es in step.extract_steps:
+                action = es.action
                 if action == "extract":
                     column = es.get("as_column")
                     if not column:
                         continue
-                    value = self._element_value(
-                        element,
-                        es.get("xpath") or es.get("selector"),
-                        es.get("attr_target"),
-                    )
+                    value = self._element_value(element, es)
                     if (es.get("data_type") or "").lower() == "url":
                         value = self._normalize_url(base_url, value) or value
                     job[column] = value
                     continue
 
                 if action == "redirect" and not redirected:
+                    if self._skip_known_detail(job):
+                        break
                     using_col = es.get("using_column")
                     detail_url = (
                         self._normalize_url(base_url, job.get(using_col))
@@ -1125,14 +2640,18 @@ class StepScraper:
                         continue
                     try:
                         _dbg(f"GET detail: {detail_url}")
-                        driver.get(detail_url)
-                        redirected = True
-                        wait_css = es.get("wait_css")
-                        if wait_css:
-                            WebDriverWait(driver, self.default_wait).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, wait_css))
-                            )
-                        _sleep_default(reason="post-redirect sleep (default)")
+                        with self._profile(es.path, "redirect"):
+                            self._goto(driver, detail_url)
+                            redirected = True
+                            wait_css = es.get("wait_css")
+                            if wait_css:
+                                WebDriverWait(driver, self.default_wait).until(
+                                    EC.presence_of_element_located(
+                                        (By.CSS_SELECTOR, wait_css)
+                                    )
+                                )
+                            self._settle(driver, reason="post-redirect wait")
+                            self._record_page(driver, detail_url)
                     except WebDriverException as we:
                         print(f"[warn] redirect get() failed: {we}")
                         redirected = False
@@ -1143,12 +2662,13 @@ class StepScraper:
                     css = es.get("xpath") or es.get("selector")
                     if not column or not css:
                         continue
-                    try:
-                        tag = driver.find_element(By.CSS_SELECTOR, css)
+                    with self._profile(es.path, "extract_detail"):
+                        tag = self._find_optional(driver, css)
                         attr = es.get("attr_target")
-                        job[column] = tag.get_attribute(attr) if attr else tag.text
-                    except NoSuchElementException:
-                        job[column] = ""
+                        if tag is None:
+                            job[column] = ""
+                        else:
+                            job[column] = tag.get_attribute(attr) if attr else tag.text
                     continue
 
                 if action == "replace_text":
@@ -1164,7 +2684,7 @@ class StepScraper:
 
             jobs.append(job)
 
-            if ITEM_DELAY_MS > 0:
-                _sleep_ms(ITEM_DELAY_MS, reason="item delay")
+            if not job.get("__detail_skipped"):
+                self._item_delay()
 
         return jobs
@@ -0,0 +1,278 @@
+# /app/site_queue.py
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import and_, func, or_, select, update
+
+from .db import utc_now_naive
+from .models import SiteQueueItem
+
+
+def enqueue_sites(s, run_id: int, sites: Iterable[str]) -> int:
+    """Queue each site once for the run; returns how many were added."""
+    queued = set(
+        s.execute(select(SiteQueueItem.site).where(SiteQueueItem.run_id == run_id))
+        .scalars()
+        .all()
+    )
+    added = 0
+    for site in sites:
+        if site in queued:
+            continue
+        s.add(SiteQueueItem(run_id=run_id, site=site, status="pending"))
+        queued.add(site)
+        added += 1
+    return added
+
+
+def _claimable(run_id: int, now):
+    # Pending sites, and claimed ones whose worker stopped renewing the lease.
+    return and_(
+        SiteQueueItem.run_id == run_id,
+        or_(
+            SiteQueueItem.status == "pending",
+            and_(
+                SiteQueueItem.status == "claimed",
+                SiteQueueItem.lease_expires_at < now,
+            ),
+        ),
+    )
+
+
+def claim_site(
+    session_factory,
+    run_id: int,
+    worker: str,
+    *,
+    lease_sec: float,
+    max_attempts: int,
+) -> Optional[str]:
+    """
+    Claim the run's next free site for ``worker``, or return None if there is
+    none right now. A site already claimed ``max_attempts`` times is marked
+    failed instead of being handed out again.
+    """
+    while True:
+        with session_factory.begin() as s:
+            now = utc_now_naive()
+            # SKIP LOCKED lets MySQL workers pass over rows another worker is
+            # claiming; SQLite ignores it and relies on the guarded UPDATE.
+            item = (
+                s.execute(
+                    select(SiteQueueItem)
+                    .where(_claimable(run_id, now))
+                    .order_by(SiteQueueItem.id)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+                .scalars()
+                .first()
+            )
+            if item is None:
+                return None
+            guard = and_(
+                SiteQueueItem.id == item.id,
+                SiteQueueItem.status == item.status,
+                SiteQueueItem.attempts == item.attempts,
+            )
+            if item.attempts >= max_attempts:
+                s.execute(
+                    update(SiteQueueItem)
+                    .where(guard)
+                    .values(
+                        status="failed",
+                        worker=None,
+                        lease_expires_at=None,
+                        last_error=item.last_error
+                        or f"lease expired {item.attempts} time(s)",
+                    )
+                )
+                continue
+            claimed = s.execute(
+                update(SiteQueueItem)
+                .where(guard)
+                .values(
+                    status="claimed",
+                    worker=worker,
+                    lease_expires_at=now + timedelta(seconds=lease_sec),
+                    attempts=item.attempts + 1,
+                )
+            )
+            if claimed.rowcount == 1:
+                return item.site
+        # Another worker won the row between our read and update; try the next.
+
+
+def claimed_elsewhere(s, run_id: int, worker: str) -> int:
+    return int(
+        s.scalar(
+            select(func.count(SiteQueueItem.id)).where(
+                SiteQueueItem.run_id == run_id,
+                SiteQueueItem.status == "claimed",
+                SiteQueueItem.worker != worker,
+            )
+        )
+        or 0
+    )
+
+
+def unfinished_count(s, run_id: int) -> int:
+    return int(
+        s.scalar(
+            select(func.count(SiteQueueItem.id)).where(
+                SiteQueueItem.run_id == run_id,
+                SiteQueueItem.status.in_(("pending", "claimed")),
+            )
+        )
+        or 0
+    )
+
+
+def next_site(
+    session_factory,
+    run_id: int,
+    worker: str,
+    *,
+    lease_sec: float,
+    max_attempts: int,
+    poll_sec: float,
+) -> Optional[str]:
+    """
+    claim_site, waiting while other workers still hold sites: if one of them
+    dies, its lease expires and the site becomes claimable here. Returns None
+    once nothing is pending or held elsewhere.
+    """
+    while True:
+        site = claim_site(
+            session_factory,
+            run_id,
+            worker,
+            lease_sec=lease_sec,
+            max_attempts=max_attempts,
+        )
+        if site is not None:
+            return site
+        with session_factory() as s:
+            if not claimed_elsewhere(s, run_id, worker):
+                return None
+        time.sleep(poll_sec)
+
+
+def finish_site(
+    s, run_id: int, site: str, worker: str, *, error: Optional[str] = None
+) -> bool:
+    """
+    Mark a claimed site done, in the transaction that saved its last jobs.
+    False means the lease was lost and another worker may redo the site.
+    """
+    done = s.execute(
+        update(SiteQueueItem)
+        .where(
+            SiteQueueItem.run_id == run_id,
+            SiteQueueItem.site == site,
+            SiteQueueItem.worker == worker,
+            SiteQueueItem.status == "claimed",
+        )
+        .values(status="done", lease_expires_at=None, last_error=error)
+    )
+    return done.rowcount == 1
+
+
+def release_site(
+    session_factory,
+    run_id: int,
+    site: str,
+    worker: str,
+    error: str,
+    *,
+    max_attempts: int,
+) -> None:
+    """Give a site back after a failed attempt, or fail it for good."""
+    with session_factory.begin() as s:
+        item = (
+            s.execute(
+                select(SiteQueueItem).where(
+                    SiteQueueItem.run_id == run_id,
+                    SiteQueueItem.site == site,
+                    SiteQueueItem.worker == worker,
+                    SiteQueueItem.status == "claimed",
+                )
+            )
+            .scalars()
+            .first()
+        )
+        if item is None:
+            return
+        item.status = "failed" if item.attempts >= max_attempts else "pending"
+        item.worker = None
+        item.lease_expires_at = None
+        item.last_error = error
+
+
+class LeaseKeeper:
+    """
+    Background thread that renews the leases of every site this worker holds
+    every third of the lease, so only a dead worker's sites expire.
+    """
+
+    def __init__(self, session_factory, run_id: int, worker: str, lease_sec: float):
+        self.session_factory = session_factory
+        self.run_id = run_id
+        self.worker = worker
+        self.lease_sec = lease_sec
+        self._lock = threading.Lock()
+        self._held: Set[str] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def hold(self, site: str) -> None:
+        with self._lock:
+            self._held.add(site)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="site-lease", daemon=True
+                )
+                self._thread.start()
+
+    def drop(self, site: str) -> None:
+        with self._lock:
+            self._held.discard(site)
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._thread = None
+        self._stop.clear()
+
+    def renew(self) -> None:
+        with self._lock:
+            held: List[str] = sorted(self._held)
+        if not held:
+            return
+        with self.session_factory.begin() as s:
+            s.execute(
+                update(SiteQueueItem)
+                .where(
+                    SiteQueueItem.run_id == self.run_id,
+                    SiteQueueItem.site.in_(held),
+                    SiteQueueItem.worker == self.worker,
+                    SiteQueueItem.status == "claimed",
+                )
+                .values(
+                    lease_expires_at=utc_now_naive()
+                    + timedelta(seconds=self.lease_sec)
+                )
+            )
+
+    def _loop(self) -> None:
+        while not self._stop.wait(max(1.0, self.lease_sec / 3)):
+            try:
+                self.renew()
+            except Exception as e:
+                print(f"[queue] lease renewal failed: {e}")
@@ -0,0 +1,119 @@
+# /app/site_schedule.py
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select
+
+from .db import utc_now_naive
+from .models import IntegrationRun, JobChange, SiteCheckpoint
+
+# (share of scrapes that found inserts or updates, hours between scrapes).
+# Sites below the last tier wait SITE_SCHEDULE_MAX_INTERVAL_HOURS.
+_CADENCE_TIERS = ((0.5, 0.0), (0.25, 24.0), (0.1, 72.0))
+
+# Too little history to slow a site down yet.
+_MIN_SCRAPES = 3
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+@dataclass
+class SiteCadence:
+    site: str
+    scrapes: int
+    changed: int
+    interval_hours: float
+    last_scraped_at: Optional[datetime]
+    due: bool
+
+    @property
+    def rate(self) -> float:
+        return self.changed / self.scrapes if self.scrapes else 1.0
+
+
+def cadence_hours(rate: float, scrapes: int, max_hours: float) -> float:
+    if scrapes < _MIN_SCRAPES:
+        return 0.0
+    for min_rate, hours in _CADENCE_TIERS:
+        if rate >= min_rate:
+            return min(hours, max_hours)
+    return max_hours
+
+
+def site_cadences(
+    s, sites: Iterable[str], *, now: Optional[datetime] = None
+) -> Dict[str, SiteCadence]:
+    """
+    Cadence of each site from its finished scrapes in the last
+    SITE_SCHEDULE_WINDOW_DAYS: the share of them whose run recorded an insert
+    or update in job_changes picks how long the site may go unscraped.
+    """
+    sites = list(sites)
+    now = now or utc_now_naive()
+    window_start = now - timedelta(days=_env_float("SITE_SCHEDULE_WINDOW_DAYS", 30))
+    max_hours = _env_float("SITE_SCHEDULE_MAX_INTERVAL_HOURS", 168)
+
+    scraped: Dict[str, Dict[int, datetime]] = {site: {} for site in sites}
+    if sites:
+        rows = s.execute(
+            select(
+                SiteCheckpoint.site,
+                SiteCheckpoint.run_id,
+                SiteCheckpoint.site_error,
+                IntegrationRun.started_at,
+            )
+            .join(IntegrationRun, IntegrationRun.id == SiteCheckpoint.run_id)
+            .where(
+                SiteCheckpoint.site.in_(sites),
+                SiteCheckpoint.status == "done",
+                IntegrationRun.started_at >= window_start,
+            )
+        )
+        for site, run_id, site_error, started_at in rows:
+            # A scrape that ended early may have missed changes; it neither
+            # resets the clock nor counts as a quiet run. Rows that failed
+            # to normalize do not make the scrape partial.
+            if not site_error:
+                scraped[site][run_id] = started_at
+
+    run_ids = {run_id for runs in scraped.values() for run_id in runs}
+    changed: Dict[str, set[int]] = {site: set() for site in sites}
+    if run_ids:
+        rows = s.execute(
+            select(JobChange.site, JobChange.run_id)
+            .where(
+                JobChange.site.in_(sites),
+                JobChange.run_id.in_(run_ids),
+                JobChange.change_source == "site",
+                JobChange.change_type.in_(("insert", "update")),
+            )
+            .distinct()
+        )
+        for site, run_id in rows:
+            changed[site].add(run_id)
+
+    cadences: Dict[str, SiteCadence] = {}
+    for site in sites:
+        runs = scraped[site]
+        hits = len(changed[site] & runs.keys())
+        last = max(runs.values()) if runs else None
+        hours = cadence_hours(hits / len(runs) if runs else 1.0, len(runs), max_hours)
+        cadences[site] = SiteCadence(
+            site=site,
+            scrapes=len(runs),
+            changed=hits,
+            interval_hours=hours,
+            last_scraped_at=last,
+            # The slack keeps a daily cron from missing a 24h site by seconds.
+            due=last is None or now - last >= timedelta(hours=hours * 0.9),
+        )
+    return cadences
@@ -0,0 +1,423 @@
+# /app/step_plan.py
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Tuple
+
+import soupsieve
+
+from .devtools import RESOURCE_BLOCK_PATTERNS
+
+TOP_LEVEL_STEP_ACTIONS = {
+    "load_url",
+    "debug_print_dom_by_css",
+    "sleep",
+    "scroll_to",
+    "click_button",
+    "select_checkbox",
+    "type_text",
+    "data_extract",
+    "json_set_payload",
+    "json_replace_text",
+    "json_data_extract",
+    "json_html_data_extract",
+    "site_config",
+}
+# Top-level actions a site_config engine "http" site can run without a browser.
+HTTP_ENGINE_STEP_ACTIONS = {
+    "load_url",
+    "sleep",
+    "data_extract",
+    "json_set_payload",
+    "json_replace_text",
+    "json_data_extract",
+    "site_config",
+}
+DOM_EXTRACT_ACTIONS = {"extract", "redirect", "sleep", "replace_text", "regex_extract", "next"}
+JSON_EXTRACT_ACTIONS = {"extract", "next"}
+JSON_HTML_EXTRACT_ACTIONS = {
+    "extract",
+    "redirect",
+    "extract_detail",
+    "replace_text",
+    "regex_extract",
+    "next",
+}
+
+_JSON_PATH_SPLIT = re.compile(r"[>.]")
+
+
+class StepPlanError(ValueError):
+    """steps.json failed validation; the message lists the first problems."""
+
+    def __init__(self, errors: List[str]):
+        self.errors = list(errors)
+        preview = "; ".join(self.errors[:8])
+        suffix = f"; and {len(self.errors) - 8} more" if len(self.errors) > 8 else ""
+        super().__init__(f"steps.json schema validation failed: {preview}{suffix}")
+
+
+@dataclass(frozen=True, eq=False, repr=False)
+class StepPlan(Mapping):
+    """
+    One compiled step. It still reads like the step dict it came from
+    (``plan.get("as_column")``), and adds the parts that are expensive to
+    redo per item: compiled CSS selectors, split JSON paths, and regexes.
+    ``path`` locates the step in steps.json for logs and profiles.
+    """
+
+    action: str
+    raw: Dict[str, Any]
+    path: str = ""  # "site[2].extract_steps[0]", as in validation errors
+    selector: Optional[soupsieve.SoupSieve] = None  # xpath, or selector
+    focus: Optional[soupsieve.SoupSieve] = None  # focus_scope
+    link: Optional[soupsieve.SoupSieve] = None  # link_css
+    wait: Optional[soupsieve.SoupSieve] = None  # wait_css
+    regex: Optional[Pattern[str]] = None  # regex_pattern
+    key_path: Tuple[str, ...] = ()  # json extract key
+    html_paths: Tuple[Tuple[str, ...], ...] = ()  # html_key, focus_html_key
+    extract_steps: Tuple["StepPlan", ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        return self.raw[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __repr__(self) -> str:
+        return repr(self.raw)
+
+
+@dataclass(frozen=True)
+class SitePlan:
+    name: str
+    steps: Tuple[StepPlan, ...]
+    config: Dict[str, Any]
+    engine: str = "browser"
+
+
+def split_json_path(path: Optional[str]) -> Tuple[str, ...]:
+    if not path:
+        return ()
+    return tuple(_JSON_PATH_SPLIT.split(path))
+
+
+def _is_nonempty_str(value: Any) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+
+def _has_selector(step: Dict[str, Any]) -> bool:
+    return _is_nonempty_str(step.get("xpath")) or _is_nonempty_str(step.get("selector"))
+
+
+def _require_nonempty_str(
+    errors: List[str], step: Dict[str, Any], path: str, field: str
+) -> None:
+    if not _is_nonempty_str(step.get(field)):
+        errors.append(f"{path}.{field} is required")
+
+
+def _require_str_field(
+    errors: List[str], step: Dict[str, Any], path: str, field: str
+) -> None:
+    if field not in step or not isinstance(step.get(field), str):
+        errors.append(f"{path}.{field} must be a string")
+
+
+def _compile_selector(
+    errors: List[str], step: Dict[str, Any], path: str, field: str
+) -> Optional[soupsieve.SoupSieve]:
+    css = step.get(field)
+    if not _is_nonempty_str(css):
+        return None
+    try:
+        return soupsieve.compile(css)
+    except soupsieve.SelectorSyntaxError as exc:
+        reason = str(exc).splitlines()[0]
+        errors.append(f"{path}.{field} is not a valid CSS selector: {reason}")
+        return None
+
+
+def _compile_regex(
+    errors: List[str], step: Dict[str, Any], path: str
+) -> Optional[Pattern[str]]:
+    pattern = step.get("regex_pattern")
+    if not _is_nonempty_str(pattern):
+        return None
+    try:
+        regex = re.compile(pattern)
+    except re.error as exc:
+        errors.append(f"{path}.regex_pattern is not a valid regular expression: {exc}")
+        return None
+    if regex.groups < 1:
+        errors.append(f"{path}.regex_pattern needs a capture group")
+        return None
+    return regex
+
+
+def _validate_pagination(errors: List[str], pagination: Any, path: str) -> None:
+    if not isinstance(pagination, dict):
+        errors.append(f"{path}.pagination must be an object")
+        return
+    mode = pagination.get("mode")
+    if mode != "click_next":
+        errors.append(f'{path}.pagination.mode must be "click_next"')
+    if "max_pages" in pagination and not isinstance(pagination.get("max_pages"), int):
+        errors.append(f"{path}.pagination.max_pages must be an integer")
+    if "page_wait_ms" in pagination and not isinstance(
+        pagination.get("page_wait_ms"), (int, float)
+    ):
+        errors.append(f"{path}.pagination.page_wait_ms must be a number")
+    for field in (
+        "current_page_css",
+        "next_page_css",
+        "next_disabled_css",
+        "page_as_column",
+    ):
+        if field in pagination and not isinstance(pagination.get(field), str):
+            errors.append(f"{path}.pagination.{field} must be a string")
+
+
+def _validate_site_config(errors: List[str], step: Dict[str, Any], path: str) -> None:
+    if "politeness_ms" in step and not isinstance(step.get("politeness_ms"), (int, float)):
+        errors.append(f"{path}.politeness_ms must be a number")
+    if "block_resources" in step:
+        blocked = step.get("block_resources")
+        if isinstance(blocked, list):
+            unknown = [c for c in blocked if c not in RESOURCE_BLOCK_PATTERNS]
+            if unknown:
+                errors.append(
+                    f"{path}.block_resources has unknown categories {unknown}; "
+                    f"use {sorted(RESOURCE_BLOCK_PATTERNS)}"
+                )
+        elif not isinstance(blocked, bool):
+            errors.append(f"{path}.block_resources must be true, false, or a list")
+    if "js_extract" in step and not isinstance(step.get("js_extract"), bool):
+        errors.append(f"{path}.js_extract must be true or false")
+    if "engine" in step and step.get("engine") not in {"browser", "http"}:
+        errors.append(f'{path}.engine must be "browser" or "http"')
+    rps = step.get("rate_limit_rps")
+    if "rate_limit_rps" in step and (
+        isinstance(rps, bool) or not isinstance(rps, (int, float)) or rps < 0
+    ):
+        errors.append(f"{path}.rate_limit_rps must be a non-negative number")
+    budget = step.get("time_budget_sec")
+    if "time_budget_sec" in step and (
+        isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget <= 0
+    ):
+        errors.append(f"{path}.time_budget_sec must be a positive number")
+    burst = step.get("rate_limit_burst")
+    if "rate_limit_burst" in step and (
+        isinstance(burst, bool) or not isinstance(burst, int) or burst < 1
+    ):
+        errors.append(f"{path}.rate_limit_burst must be a positive integer")
+
+
+def _compile_extract_step(
+    errors: List[str],
+    step: Any,
+    path: str,
+    *,
+    context: str,
+) -> Optional[StepPlan]:
+    if not isinstance(step, dict):
+        errors.append(f"{path} must be an object")
+        return None
+
+    action = step.get("action")
+    allowed = {
+        "dom": DOM_EXTRACT_ACTIONS,
+        "json": JSON_EXTRACT_ACTIONS,
+        "json_html": JSON_HTML_EXTRACT_ACTIONS,
+    }[context]
+    if not _is_nonempty_str(action):
+        errors.append(f"{path}.action is required")
+        return None
+    if action not in allowed:
+        errors.append(f'{path}.action "{action}" is not supported for {context} extraction')
+        return None
+
+    compiled: Dict[str, Any] = {}
+    if action == "extract":
+        _require_nonempty_str(errors, step, path, "as_column")
+        if context == "json":
+            _require_nonempty_str(errors, step, path, "key")
+            compiled["key_path"] = split_json_path(step.get("key"))
+        elif (step.get("data_type") or "").lower() != "current_url" and not _has_selector(step):
+            errors.append(f"{path}.xpath or {path}.selector is required")
+    elif action == "extract_detail":
+        _require_nonempty_str(errors, step, path, "as_column")
+        if not _has_selector(step):
+            errors.append(f"{path}.xpath or {path}.selector is required")
+    elif action == "redirect":
+        if context == "dom":
+            if not _is_nonempty_str(step.get("using_column")) and not _is_nonempty_str(
+                step.get("link_css")
+            ):
+                errors.append(f"{path}.using_column or {path}.link_css is required")
+        else:
+            _require_nonempty_str(errors, step, path, "using_column")
+        if "fetch" in step and step.get("fetch") not in {"browser", "http", "tabs"}:
+            errors.append(f'{path}.fetch must be "browser", "http", or "tabs"')
+        if "tabs" in step and (
+            not isinstance(step.get("tabs"), int) or step.get("tabs") < 1
+        ):
+            errors.append(f"{path}.tabs must be a positive integer")
+        compiled["link"] = _compile_selector(errors, step, path, "link_css")
+        compiled["wait"] = _compile_selector(errors, step, path, "wait_css")
+    elif action == "replace_text":
+        _require_nonempty_str(errors, step, path, "using_column")
+        _require_str_field(errors, step, path, "text_find")
+        _require_str_field(errors, step, path, "text_replace")
+    elif action == "regex_extract":
+        _require_nonempty_str(errors, step, path, "using_column")
+        _require_nonempty_str(errors, step, path, "as_column")
+        _require_nonempty_str(errors, step, path, "regex_pattern")
+        compiled["regex"] = _compile_regex(errors, step, path)
+    elif action == "sleep" and "seconds" in step and not isinstance(
+        step.get("seconds"), (int, float)
+    ):
+        errors.append(f"{path}.seconds must be a number")
+
+    if action in ("extract", "extract_detail") and context != "json":
+        field = "xpath" if _is_nonempty_str(step.get("xpath")) else "selector"
+        compiled["selector"] = _compile_selector(errors, step, path, field)
+
+    return StepPlan(action=action, raw=step, path=path, **compiled)
+
+
+def _compile_extract_steps(
+    errors: List[str],
+    step: Dict[str, Any],
+    path: str,
+    *,
+    context: str,
+) -> Tuple[StepPlan, ...]:
+    extract_steps = step.get("extract_steps")
+    if not isinstance(extract_steps, list) or not extract_steps:
+        errors.append(f"{path}.extract_steps must be a non-empty array")
+        return ()
+    plans = (
+        _compile_extract_step(
+            errors,
+            extract_step,
+            f"{path}.extract_steps[{idx}]",
+            context=context,
+        )
+        for idx, extract_step in enumerate(extract_steps)
+    )
+    return tuple(p for p in plans if p is not None)
+
+
+def _compile_top_level_step(errors: List[str], step: Any, path: str) -> Optional[StepPlan]:
+    if not isinstance(step, dict):
+        errors.append(f"{path} must be an object")
+        return None
+
+    action = step.get("action")
+    if not _is_nonempty_str(action):
+        errors.append(f"{path}.action is required")
+        return None
+    if action not in TOP_LEVEL_STEP_ACTIONS:
+        errors.append(f'{path}.action "{action}" is not supported by StepScraper')
+        return None
+
+    compiled: Dict[str, Any] = {}
+    if action == "load_url":
+        _require_nonempty_str(errors, step, path, "url")
+    elif action == "debug_print_dom_by_css":
+        _require_nonempty_str(errors, step, path, "find_css")
+    elif action in {"scroll_to", "click_button"}:
+        if not _has_selector(step):
+            errors.append(f"{path}.xpath or {path}.selector is required")
+    elif action in {"select_checkbox", "type_text"}:
+        _require_nonempty_str(errors, step, path, "selector")
+    elif action == "sleep" and "seconds" in step and not isinstance(
+        step.get("seconds"), (int, float)
+    ):
+        errors.append(f"{path}.seconds must be a number")
+    elif action == "site_config":
+        _validate_site_config(errors, step, path)
+    elif action == "data_extract":
+        _require_nonempty_str(errors, step, path, "focus_scope")
+        compiled["focus"] = _compile_selector(errors, step, path, "focus_scope")
+        compiled["extract_steps"] = _compile_extract_steps(
+            errors, step, path, context="dom"
+        )
+        if "pagination" in step:
+            _validate_pagination(errors, step["pagination"], path)
+    elif action == "json_replace_text":
+        _require_str_field(errors, step, path, "text_find")
+        _require_str_field(errors, step, path, "text_replace")
+    elif action == "json_data_extract":
+        _require_nonempty_str(errors, step, path, "focus_scope")
+        compiled["extract_steps"] = _compile_extract_steps(
+            errors, step, path, context="json"
+        )
+    elif action == "json_html_data_extract":
+        if not _is_nonempty_str(step.get("html_key")) and not _is_nonempty_str(
+            step.get("focus_html_key")
+        ):
+            errors.append(f"{path}.html_key or {path}.focus_html_key is required")
+        _require_nonempty_str(errors, step, path, "focus_scope")
+        compiled["focus"] = _compile_selector(errors, step, path, "focus_scope")
+        compiled["html_paths"] = tuple(
+            split_json_path(step.get(field))
+            for field in ("html_key", "focus_html_key")
+            if _is_nonempty_str(step.get(field))
+        )
+        compiled["extract_steps"] = _compile_extract_steps(
+            errors, step, path, context="json_html"
+        )
+
+    return StepPlan(action=action, raw=step, path=path, **compiled)
+
+
+def _compile_site(errors: List[str], site: str, steps: List[Any]) -> SitePlan:
+    plans = [
+        _compile_top_level_step(errors, step, f"{site}[{idx}]")
+        for idx, step in enumerate(steps)
+    ]
+    config = next((dict(p.raw) for p in plans if p and p.action == "site_config"), {})
+    engine = str(config.get("engine") or "browser")
+    if engine == "http":
+        for idx, plan in enumerate(plans):
+            if plan is not None and plan.action not in HTTP_ENGINE_STEP_ACTIONS:
+                errors.append(f'{site}[{idx}].action "{plan.action}" needs engine "browser"')
+    return SitePlan(
+        name=site,
+        steps=tuple(p for p in plans if p is not None),
+        config=config,
+        engine=engine,
+    )
+
+
+def compile_steps(data: Any) -> Dict[str, SitePlan]:
+    """Validate a parsed steps.json document and compile every site's plan."""
+    if not isinstance(data, dict):
+        raise StepPlanError(["steps.json must contain a top-level JSON object"])
+    errors: List[str] = []
+    plans: Dict[str, SitePlan] = {}
+    for site, steps in data.items():
+        if not isinstance(site, str) or not site.strip():
+            errors.append("site keys must be non-empty strings")
+            continue
+        if not isinstance(steps, list):
+            errors.append(f"{site} must be an array of step objects")
+            continue
+        plans[site] = _compile_site(errors, site, steps)
+
+    if errors:
+        raise StepPlanError(errors)
+    return plans
+
+
+def load_step_plans(path: str) -> Dict[str, SitePlan]:
+    with open(path, "r", encoding="utf-8") as f:
+        return compile_steps(json.load(f))
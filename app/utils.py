@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import functools
 import html
 import re
 from collections import Counter
+from typing import Iterable
 
 from bs4 import BeautifulSoup
 import nltk
@@ -44,6 +46,12 @@ def html_to_text(value: str | None) -> str:
     return "\n".join(line for line in lines if line)
 
 
+def canonical_job_id(value: object) -> str:
+    # Shared by the scraper and run.py so known-job lookups match delta keys.
+    text = "" if value is None else str(value)
+    return text.replace("\u202f", " ").replace("\u00a0", " ").strip().lower()
+
+
 def _ensure_nltk_resource(resource_path: str, download_name: str, verbose: bool) -> None:
     try:
         nltk.data.find(resource_path)
@@ -101,10 +109,25 @@ def ensure_nltk(verbose: bool = False):
             print("NLTK resource ready: averaged_perceptron_tagger")
 
 
+@functools.lru_cache(maxsize=1)
+def keyword_tagger():
+    # nltk.pos_tag may build its tagger, and read the model from disk, per
+    # call; one instance per process is enough.
+    from nltk.tag import PerceptronTagger
+
+    return PerceptronTagger()
+
+
+def warm_nltk() -> None:
+    """Load the tokenizer and tagger now instead of on the first job."""
+    ensure_nltk()
+    extract_keywords("warm up the keyword tagger")
+
+
 def extract_keywords(job_description: str, top_n: int = 10) -> list[str]:
     cleaned = re.sub(r"[^a-zA-Z\s]", " ", job_description or "")
     tokens = nltk.word_tokenize(cleaned.lower())
-    pos_tags = nltk.pos_tag(tokens)
+    pos_tags = keyword_tagger().tag(tokens)
     words = [w for (w, pos) in pos_tags if pos.startswith("NN") or pos.startswith("JJ")]
     counts = Counter(words)
     return [w for (w, _) in counts.most_common(top_n)]
@@ -208,20 +231,20 @@ def scan_for_pay_range(text: str) -> list[str]:
     return [summary] if summary else []
 
 
-def remove_canned_text(jobs: list[dict]) -> list[dict]:
+def canned_sentences(jobs: list[dict]) -> set[str] | None:
+    """Sentences found in every JobDesc of ``jobs``; None if none has one."""
     descs = [j.get("JobDesc", "") for j in jobs if j.get("JobDesc")]
-    if len(descs) < 2:
-        return jobs
+    if not descs:
+        return None
     ensure_nltk()
-    sent_lists = [nltk.sent_tokenize(d) for d in descs]
-    all_sents = [s.strip() for lst in sent_lists for s in lst]
-    counts = Counter(all_sents)
-    n = len(sent_lists)
-    recurring = {
-        s for s, c in counts.items() if c >= n and all(s in lst for lst in sent_lists)
-    }
+    sent_sets = [{s.strip() for s in nltk.sent_tokenize(d)} for d in descs]
+    return set.intersection(*sent_sets)
+
+
+def strip_sentences(jobs: list[dict], recurring: set[str]) -> list[dict]:
     if not recurring:
         return jobs
+    ensure_nltk()
     for j in jobs:
         d = j.get("JobDesc", "")
         if not d:
@@ -231,3 +254,71 @@ def remove_canned_text(jobs: list[dict]) -> list[dict]:
             [s for s in sents if s.strip() not in recurring]
         ).strip()
     return jobs
+
+
+def remove_canned_text(jobs: list[dict]) -> list[dict]:
+    descs = [j.get("JobDesc", "") for j in jobs if j.get("JobDesc")]
+    if len(descs) < 2:
+        return jobs
+    return strip_sentences(jobs, canned_sentences(jobs) or set())
+
+
+class CannedTextFilter:
+    """
+    remove_canned_text for a site that arrives in chunks. Canned sentences are
+    those shared by every description of the whole site, so jobs are held
+    back until that set is known: at the site's last chunk, or as soon as the
+    descriptions seen so far share nothing and no sentence can be canned.
+    Released jobs are then stripped exactly as remove_canned_text strips them.
+
+    ``max_held`` bounds the hold: once that many jobs wait, the set is settled
+    from the descriptions seen so far and they are released. Later chunks
+    narrow it to what they share too, so only the jobs released before a
+    narrowing can lose a sentence the whole site does not share.
+    """
+
+    def __init__(
+        self, sentences: Iterable[str] | None = None, *, max_held: int = 0
+    ) -> None:
+        # The site's canned sentences once known; a resumed site passes the
+        # set its earlier jobs were stripped with.
+        self.sentences: set[str] | None = (
+            set(sentences) if sentences is not None else None
+        )
+        self.max_held = max_held  # 0 holds until the set is known
+        self.held: list[dict] = []
+        # Whether max_held settled the set before the site's last chunk.
+        self.settled_early = False
+        self._shared: set[str] | None = None
+        self._descs = 0
+
+    def apply(self, jobs: list[dict], *, final: bool) -> list[dict]:
+        """Take one chunk; return the jobs that are ready, stripped."""
+        if self.sentences is not None:
+            shared = canned_sentences(jobs) if self.sentences else None
+            if shared is not None:
+                self.sentences &= shared
+            return strip_sentences(jobs, self.sentences)
+
+        self.held.extend(jobs)
+        shared = canned_sentences(jobs)
+        if shared is not None:
+            self._descs += sum(1 for j in jobs if j.get("JobDesc"))
+            self._shared = shared if self._shared is None else self._shared & shared
+        if self._shared is not None and not self._shared:
+            self.sentences = set()
+        elif final:
+            # remove_canned_text leaves a site with one description as is.
+            self.sentences = (self._shared or set()) if self._descs >= 2 else set()
+        elif self.max_held and len(self.held) >= self.max_held:
+            if self._descs < 2:
+                # Nothing to compare yet; at most one of these has a
+                # description, and it goes out as is.
+                jobs, self.held = self.held, []
+                return jobs
+            self.sentences = set(self._shared or ())
+            self.settled_early = True
+        else:
+            return []
+        jobs, self.held = self.held, []
+        return strip_sentences(jobs, self.sentences)
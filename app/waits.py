@@ -0,0 +1,89 @@
+# /app/waits.py
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Optional
+
+from .devtools import network_log
+
+# One round trip answers both "is the document loaded" and "is wait_css there".
+# querySelector avoids the driver's implicit wait on a missing selector.
+_READY_JS = (
+    "return [document.readyState,"
+    " arguments[0] ? !!document.querySelector(arguments[0]) : true];"
+)
+
+
+def _env_ms(name: str, default_ms: int) -> int:
+    try:
+        return max(0, int(float(os.getenv(name, str(default_ms)))))
+    except Exception:
+        return default_ms
+
+
+def adaptive_waits_enabled() -> bool:
+    return os.getenv("ADAPTIVE_WAITS", "true").lower() != "false"
+
+
+def network_idle_enabled() -> bool:
+    return adaptive_waits_enabled() and (
+        os.getenv("WAIT_NETWORK_IDLE", "true").lower() != "false"
+    )
+
+
+class PageWaiter:
+    """
+    Returns as soon as a page is ready instead of sleeping a fixed delay.
+
+    Ready means document.readyState is "complete", the optional wait_css is
+    present, and (when Chrome performance logging is on) no more than
+    ``max_inflight`` requests are pending with no network event for
+    ``idle_ms``. The wait never raises; after ``max_ms`` it simply returns so
+    callers keep their own explicit WebDriverWait error handling.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_ms: Optional[int] = None,
+        idle_ms: Optional[int] = None,
+        poll_ms: int = 100,
+        max_inflight: int = 2,
+        network_idle: Optional[bool] = None,
+    ):
+        self.max_ms = max_ms if max_ms is not None else _env_ms("WAIT_READY_MAX_MS", 5000)
+        self.idle_ms = idle_ms if idle_ms is not None else _env_ms("WAIT_IDLE_MS", 500)
+        self.poll_ms = max(10, poll_ms)
+        self.max_inflight = max(0, max_inflight)
+        self.network_idle = (
+            network_idle if network_idle is not None else network_idle_enabled()
+        )
+
+    def wait_ready(self, driver: Any, *, wait_css: Optional[str] = None) -> float:
+        """Block until the page is ready or max_ms passes; returns seconds waited."""
+        t0 = time.monotonic()
+        deadline = t0 + self.max_ms / 1000.0
+        idle_secs = self.idle_ms / 1000.0
+        log = network_log(driver) if self.network_idle else None
+
+        while True:
+            now = time.monotonic()
+            # A driver started without performance logging just skips the
+            # network check.
+            track_network = log is not None and log.drain(driver)
+
+            try:
+                state, css_present = driver.execute_script(_READY_JS, wait_css or "")
+                ready = state == "complete" and bool(css_present)
+            except Exception:
+                ready = False
+
+            if ready and track_network:
+                ready = (
+                    len(log.inflight) <= self.max_inflight
+                    and time.time() - log.last_activity >= idle_secs
+                )
+            if ready or now >= deadline:
+                return now - t0
+            time.sleep(self.poll_ms / 1000.0)
@@ -0,0 +1,96 @@
+# /app/watchdog.py
+from __future__ import annotations
+
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .driver_memory import process_tree_pids
+
+
+def kill_driver(driver: Any) -> None:
+    """
+    Kill chromedriver and every Chrome process it started. Any WebDriver call
+    blocked on them then fails at once instead of hanging.
+    """
+    setattr(driver, "_jobscrape_killed", True)
+    process = getattr(getattr(driver, "service", None), "process", None)
+    pid = getattr(process, "pid", None)
+    if not pid:
+        return
+    # Killing chromedriver alone would leave Chrome and its renderers running.
+    for child in reversed(process_tree_pids(int(pid))):
+        if child == pid:
+            continue
+        try:
+            os.kill(child, getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError:
+            pass
+    try:
+        process.kill()
+    except Exception:
+        pass
+
+
+class SiteWatchdog:
+    """
+    Background thread that fires a callback for every watched site still
+    running ``grace_sec`` after its deadline. Sites normally stop themselves
+    at the deadline; this only catches calls that never return.
+    """
+
+    def __init__(self, grace_sec: float, poll_sec: float = 1.0):
+        self.grace_sec = max(0.0, grace_sec)
+        self.poll_sec = poll_sec
+        self._lock = threading.Lock()
+        self._watched: Dict[str, Tuple[float, Callable[[], None]]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.fired = 0
+
+    def watch(self, key: str, deadline: float, on_expire: Callable[[], None]) -> None:
+        with self._lock:
+            self._watched[key] = (deadline + self.grace_sec, on_expire)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="site-watchdog", daemon=True
+                )
+                self._thread.start()
+
+    def unwatch(self, key: str) -> None:
+        with self._lock:
+            self._watched.pop(key, None)
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            self._watched.clear()
+            self._thread = None
+        self._stop.clear()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.poll_sec):
+            now = time.monotonic()
+            with self._lock:
+                expired = [
+                    (key, callback)
+                    for key, (kill_at, callback) in self._watched.items()
+                    if now >= kill_at
+                ]
+                for key, _ in expired:
+                    self._watched.pop(key, None)
+            for key, callback in expired:
+                self.fired += 1
+                print(
+                    f"[watchdog] {key}: still running "
+                    f"{self.grace_sec:.0f}s past its budget"
+                )
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"[watchdog] {key}: abort failed: {e}")
@@ -24,6 +24,8 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from bs4 import BeautifulSoup
 
+from app.rate_limit import shared_rate_limiter
+
 try:
     from dotenv import load_dotenv
 
@@ -272,14 +274,24 @@ def is_excluded_url(url: str, excluded_domains: Iterable[str]) -> bool:
 
 
 def fetch_page(url: str, max_links: int) -> FetchResult:
-    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
-    try:
-        with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT_SEC) as resp:
-            status = getattr(resp, "status", None)
-            content_type = resp.headers.get("Content-Type", "")
-            raw = resp.read(1_000_000)
-    except Exception as exc:
-        return FetchResult(url=url, ok=False, status=None, text="", links=[], error=str(exc))
+    limiter = shared_rate_limiter()
+    for attempt in range(limiter.retries + 1):
+        limiter.acquire(url)
+        req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+        try:
+            with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT_SEC) as resp:
+                status = getattr(resp, "status", None)
+                content_type = resp.headers.get("Content-Type", "")
+                raw = resp.read(1_000_000)
+            limiter.observe(url, status)
+            break
+        except urllib.error.HTTPError as exc:
+            backoff = limiter.observe(url, exc.code, exc.headers.get("Retry-After"))
+            if backoff and attempt < limiter.retries:
+                continue
+            return FetchResult(url=url, ok=False, status=exc.code, text="", links=[], error=str(exc))
+        except Exception as exc:
+            return FetchResult(url=url, ok=False, status=None, text="", links=[], error=str(exc))
 
     if "html" not in content_type and "text" not in content_type:
         return FetchResult(
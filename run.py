@@ -1,14 +1,20 @@
 # /run.py
 from __future__ import annotations
 
+from dataclasses import dataclass, field as dc_field
 from datetime import datetime, timezone
 import getpass
 import hashlib
 import json
 import logging
+import multiprocessing
 import os
+import socket
 import sys
 import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from logging.handlers import RotatingFileHandler
 from typing import Any, Dict, List
 
@@ -20,20 +26,43 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from sqlalchemy import select, func
+from sqlalchemy import func, insert, literal, null, select, update
 from sqlalchemy.exc import IntegrityError
 
+from app.bulk_upsert import insert_rows, update_rows, upsert_rows
+from app.fixtures import FixtureRecorder, FixtureReplayer, FixtureStore
 from app.scraper import StepScraper
-from app.json_writer import save_site_json
+from app.step_plan import load_step_plans
+from app.json_writer import SiteJsonStream, save_site_json
+from app.site_schedule import site_cadences
+from app.site_queue import (
+    LeaseKeeper,
+    enqueue_sites,
+    finish_site,
+    next_site,
+    release_site,
+    unfinished_count,
+)
 from app.utils import (
+    CannedTextFilter,
+    canonical_job_id,
     ensure_nltk,
     extract_keywords,
     get_job_level,
     html_to_text,
     scan_for_pay_range,
     remove_canned_text,
+    warm_nltk,
+)
+from app.models import (
+    SessionLocal,
+    init_db,
+    IntegrationRun,
+    Job,
+    JobChange,
+    SiteCheckpoint,
+    SiteQueueItem,
 )
-from app.models import SessionLocal, init_db, IntegrationRun, Job, JobChange
 
 OUTPUT_DIR = os.path.join(BASE_DIR, "output")
 
@@ -182,6 +211,13 @@ def log_startup_environment(logger: logging.LoggerAdapter) -> None:
         "LOG_LEVEL": os.getenv("LOG_LEVEL", ""),
         "LOG_SQL": os.getenv("LOG_SQL", ""),
         "ITEM_DELAY_MS": os.getenv("ITEM_DELAY_MS", ""),
+        "SCRAPER_POOL_SIZE": os.getenv("SCRAPER_POOL_SIZE", ""),
+        "IMPLICIT_WAIT_MS": os.getenv("IMPLICIT_WAIT_MS", ""),
+        "PROFILE_TOP_N": os.getenv("PROFILE_TOP_N", ""),
+        "INCREMENTAL_SCRAPE": os.getenv("INCREMENTAL_SCRAPE", ""),
+        "INCREMENTAL_FULL_REFRESH_EVERY": os.getenv(
+            "INCREMENTAL_FULL_REFRESH_EVERY", ""
+        ),
     }
     logger.info("startup env %s | base_dir=%s", env, BASE_DIR)
 
@@ -326,12 +362,51 @@ def _job_hash(
     return hashlib.sha256(canon).hexdigest()
 
 
-def _changed_fields(old: Job, new: Job) -> List[str]:
-    fields = ["title", "url", "desc", "keywords", "level", "pay", "reference_fields"]
-    return [f for f in fields if (getattr(old, f) or "") != (getattr(new, f) or "")]
+_CONTENT_FIELDS = ["title", "url", "desc", "keywords", "level", "pay", "reference_fields"]
+_INSERT_CHANGED_FIELDS = ",".join(_CONTENT_FIELDS)
+
+
+def _changed_fields(old: Any, new: Job) -> List[str]:
+    return [
+        f for f in _CONTENT_FIELDS if (getattr(old, f) or "") != (getattr(new, f) or "")
+    ]
+
+
+# Bump whenever _normalize_fields (or the text helpers it calls) gives different
+# output for the same scraped fields. Every stored raw_hash then stops
+# matching, so each job is normalized again on its next scrape.
+NORMALIZER_VERSION = 1
+
+
+def _raw_hash(job_data: Dict[str, Any]) -> str:
+    """Hash of the scraped fields _normalize_fields reads, before any cleanup."""
+    refs = {
+        str(key): value
+        for key, value in job_data.items()
+        if key not in _CORE_JOB_DATA_FIELDS and not str(key).startswith("__")
+    }
+    canon = json.dumps(
+        [
+            NORMALIZER_VERSION,
+            job_data.get("JobTitle"),
+            job_data.get("JobUrl"),
+            job_data.get("JobDesc"),
+            job_data.get("JobPay"),
+            refs,
+        ],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canon.encode("utf-8", "ignore")).hexdigest()
 
 
-def _normalize_job(site: str, run_id: int, job_data: Dict[str, Any]) -> Job | None:
+def _normalize_fields(job_data: Dict[str, Any]) -> Dict[str, Any] | None:
+    """
+    Normalized column values of one scraped job, plus content_hash and
+    list_fingerprint; None without a JobID. Plain data only, so it can run in
+    a normalization worker process.
+    """
     job_id = _norm_text(str(job_data.get("JobID", "")))
     job_id = job_id.strip()
     if not job_id:
@@ -356,28 +431,363 @@ def _normalize_job(site: str, run_id: int, job_data: Dict[str, Any]) -> Job | No
 
     reference_fields = _serialize_reference_fields(job_data)
 
+    return {
+        "job_id": job_id,
+        "title": title,
+        "url": url,
+        "desc": desc,
+        "keywords": keywords,
+        "level": level,
+        "pay": pay,
+        "reference_fields": reference_fields,
+        "content_hash": _job_hash(
+            title, url, desc, keywords, level, pay, reference_fields
+        ),
+        "list_fingerprint": job_data.get("__list_fingerprint") or None,
+    }
+
+
+def _job_from_fields(site: str, run_id: int, fields: Dict[str, Any]) -> Job:
     # NOTE: Keep setting discovery_date here for inserts,
     # but DO NOT copy it onto existing rows during updates.
-    discovery_date = datetime.now(timezone.utc)
-
-    job = Job(
-        job_id=job_id,
+    return Job(
         site=site,
-        title=title,
-        url=url,
-        desc=desc,
-        keywords=keywords,
-        level=level,
-        pay=pay,
-        reference_fields=reference_fields,
-        discovery_date=discovery_date,
         run_id=run_id,
+        discovery_date=datetime.now(timezone.utc),
+        **fields,
+    )
+
+
+# ------------------------------- normalization pool -------------------------------
+# Below this many jobs to normalize, handing them to worker processes costs
+# more than it saves.
+_NORMALIZE_POOL_MIN_JOBS = 50
+_NORMALIZE_POOL: ProcessPoolExecutor | None = None
+
+
+def _normalize_workers() -> int:
+    try:
+        return max(1, int(os.getenv("NORMALIZE_WORKERS", str(os.cpu_count() or 1))))
+    except ValueError:
+        return 1
+
+
+def _init_normalize_worker() -> None:
+    # Runs once per worker process, so no job pays for loading NLTK data.
+    warm_nltk()
+
+
+def _normalize_one(job_data: Dict[str, Any]) -> tuple[Dict[str, Any] | None, str | None]:
+    """(fields, None), or (None, traceback) if normalizing raised."""
+    try:
+        return _normalize_fields(job_data), None
+    except Exception:
+        return None, traceback.format_exc()
+
+
+def _normalize_many(
+    jobs: List[Dict[str, Any]], logger
+) -> List[tuple[Dict[str, Any] | None, str | None]]:
+    """_normalize_one for each job, fanned out to NORMALIZE_WORKERS processes."""
+    global _NORMALIZE_POOL
+    workers = _normalize_workers()
+    if workers <= 1 or len(jobs) < _NORMALIZE_POOL_MIN_JOBS:
+        return [_normalize_one(jd) for jd in jobs]
+    if _NORMALIZE_POOL is None:
+        # spawn, not fork: scraper threads are still running while sites
+        # persist, and a forked child could inherit one of their locks held.
+        _NORMALIZE_POOL = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_normalize_worker,
+        )
+    try:
+        return list(
+            _NORMALIZE_POOL.map(
+                _normalize_one, jobs, chunksize=max(1, len(jobs) // (workers * 4))
+            )
+        )
+    except BrokenProcessPool:
+        logger.warning("normalization pool broke; normalizing in process")
+        _shutdown_normalize_pool()
+        return [_normalize_one(jd) for jd in jobs]
+
+
+def _shutdown_normalize_pool() -> None:
+    global _NORMALIZE_POOL
+    if _NORMALIZE_POOL is not None:
+        _NORMALIZE_POOL.shutdown(cancel_futures=True)
+        _NORMALIZE_POOL = None
+
+
+# ------------------------------- incremental -------------------------------
+_FULL_RUN_MODE = "steps"
+_INCREMENTAL_RUN_MODE = "steps_incremental"
+
+
+def _full_refresh_every() -> int:
+    try:
+        return max(1, int(os.getenv("INCREMENTAL_FULL_REFRESH_EVERY", "7")))
+    except ValueError:
+        return 7
+
+
+def _full_refresh_due(s, every: int) -> bool:
+    # Count incremental runs since the last finished full run, so a crashed full
+    # run does not reset the cycle and skipped details are refreshed every N runs.
+    if every <= 1:
+        return True
+    last_full_id = s.scalar(
+        select(func.max(IntegrationRun.id)).where(
+            IntegrationRun.mode == _FULL_RUN_MODE,
+            IntegrationRun.finished_at.is_not(None),
+        )
     )
-    job.content_hash = _job_hash(title, url, desc, keywords, level, pay, reference_fields)
-    return job
+    if last_full_id is None:
+        return True
+    incremental_since = s.scalar(
+        select(func.count(IntegrationRun.id)).where(
+            IntegrationRun.mode == _INCREMENTAL_RUN_MODE,
+            IntegrationRun.id > last_full_id,
+        )
+    )
+    return (incremental_since or 0) + 1 >= every
+
+
+def _load_known_jobs(s) -> Dict[str, Dict[str, str]]:
+    # Only active rows with a stored list fingerprint can be skipped; anything
+    # else is hydrated normally and gets its fingerprint recorded this run.
+    known: Dict[str, Dict[str, str]] = {}
+    rows = s.execute(
+        select(Job.site, Job.job_id, Job.list_fingerprint).where(
+            Job.is_active.is_(True),
+            Job.list_fingerprint.is_not(None),
+        )
+    )
+    for site, job_id, fingerprint in rows:
+        known.setdefault(site, {})[canonical_job_id(job_id)] = fingerprint
+    return known
 
 
 # ------------------------------- delta logic -------------------------------
+def _bulk_upsert_enabled() -> bool:
+    return os.getenv("DB_BULK_UPSERT", "true").lower() != "false"
+
+
+def _bulk_batch_size() -> int:
+    try:
+        return max(1, int(os.getenv("DB_BULK_BATCH_SIZE", "500")))
+    except ValueError:
+        return 500
+
+
+@dataclass
+class _PlannedRow:
+    """One job of a bulk _process_site batch and what it does to its row."""
+
+    kind: str  # 'insert' | 'update' | 'touch' | 'known' (detail skipped)
+    cid: str
+    log: Any
+    job: Job | None
+    prev: Any  # the stored row's delta columns (id, job_id, content_hash)
+    fingerprint: str | None
+    changed: List[str] = dc_field(default_factory=list)
+
+
+def _write_planned_rows(s, site: str, run_id: int, batch: List[_PlannedRow]) -> None:
+    """
+    Write one batch with an upsert for new jobs, executemany UPDATEs for
+    known ones, and a single insert of the batch's JobChange rows.
+    """
+    planned_inserts = [row for row in batch if row.kind == "insert"]
+    if planned_inserts:
+        # Another writer (say a worker whose lease ran out mid-site) may have
+        # saved some of these JobIDs since the site's rows were loaded. They
+        # are updated or touched like any stored job rather than counted and
+        # logged as inserts. The locking read keeps MySQL writers from
+        # adding them between this check and the upsert.
+        stored_now = s.execute(
+            select(Job.id, Job.job_id, Job.content_hash, Job.is_active)
+            .where(
+                Job.site == site,
+                Job.job_id.in_([row.job.job_id for row in planned_inserts]),
+            )
+            .with_for_update()
+        )
+        taken = {canonical_job_id(r.job_id): r for r in stored_now}
+        for row in planned_inserts:
+            prev = taken.get(row.cid)
+            if prev is None:
+                continue
+            row.prev = prev
+            row.kind = "update" if prev.content_hash != row.job.content_hash else "touch"
+
+    new_rows = [
+        {
+            **{f: getattr(row.job, f) for f in _CONTENT_FIELDS},
+            "job_id": row.job.job_id,
+            "site": site,
+            "discovery_date": row.job.discovery_date,
+            "content_hash": row.job.content_hash,
+            "raw_hash": row.job.raw_hash,
+            "list_fingerprint": row.job.list_fingerprint,
+            "is_active": True,
+            "first_seen_run_id": run_id,
+            "last_seen_run_id": run_id,
+            "run_id": run_id,
+        }
+        for row in batch
+        if row.kind == "insert"
+    ]
+    # The upsert's update branch is the last guard against a JobID saved
+    # after the check above.
+    upsert_rows(
+        s,
+        Job.__table__,
+        new_rows,
+        key=("job_id", "site"),
+        update_columns=_CONTENT_FIELDS
+        + [
+            "content_hash",
+            "raw_hash",
+            "list_fingerprint",
+            "is_active",
+            "last_seen_run_id",
+        ],
+    )
+    new_pks: Dict[str, int] = {}
+    if new_rows:
+        inserted = s.execute(
+            select(Job.id, Job.job_id).where(
+                Job.site == site,
+                Job.job_id.in_([values["job_id"] for values in new_rows]),
+            )
+        )
+        new_pks = {canonical_job_id(job_id): pk for pk, job_id in inserted}
+
+    # Text columns are only read for the rows whose content_hash changed.
+    changed_pks = [row.prev.id for row in batch if row.kind == "update"]
+    stored: Dict[int, Any] = {}
+    if changed_pks:
+        stored_rows = s.execute(
+            select(Job.id, *(getattr(Job, f) for f in _CONTENT_FIELDS)).where(
+                Job.id.in_(changed_pks)
+            )
+        )
+        stored = {stored_row.id: stored_row for stored_row in stored_rows}
+
+    updates: List[Dict[str, Any]] = []
+    changes: List[Dict[str, Any]] = []
+    for row in batch:
+        if row.kind == "insert":
+            changes.append(
+                {
+                    "run_id": run_id,
+                    "job_pk": new_pks.get(row.cid),
+                    "job_id_text": row.job.job_id,
+                    "site": site,
+                    "change_type": "insert",
+                    "change_source": "site",
+                    "old_hash": None,
+                    "new_hash": row.job.content_hash,
+                    "changed_fields": _INSERT_CHANGED_FIELDS,
+                }
+            )
+        elif row.kind == "update":
+            # discovery_date stays as the first-seen timestamp.
+            row.changed = _changed_fields(stored[row.prev.id], row.job)
+            updates.append(
+                {
+                    "id": row.prev.id,
+                    **{f: getattr(row.job, f) for f in _CONTENT_FIELDS},
+                    "content_hash": row.job.content_hash,
+                    "raw_hash": row.job.raw_hash,
+                    "list_fingerprint": row.job.list_fingerprint,
+                    "is_active": True,
+                    "last_seen_run_id": run_id,
+                }
+            )
+            changes.append(
+                {
+                    "run_id": run_id,
+                    "job_pk": row.prev.id,
+                    "job_id_text": row.prev.job_id,
+                    "site": site,
+                    "change_type": "update",
+                    "change_source": "site",
+                    "old_hash": row.prev.content_hash,
+                    "new_hash": row.job.content_hash,
+                    "changed_fields": ",".join(row.changed),
+                }
+            )
+        else:
+            touch = {"id": row.prev.id, "is_active": True, "last_seen_run_id": run_id}
+            if row.fingerprint:
+                touch["list_fingerprint"] = row.fingerprint
+            if row.job is not None:
+                touch["raw_hash"] = row.job.raw_hash
+            updates.append(touch)
+    update_rows(s, Job.__table__, updates)
+    insert_rows(s, JobChange.__table__, changes)
+
+
+def _canned_hold_limit() -> int:
+    # Jobs wait for the site's canned text for about one stream chunk at most.
+    try:
+        return max(0, int(os.getenv("STREAM_CHUNK_SIZE", "50")))
+    except ValueError:
+        return 50
+
+
+class SiteChunks:
+    """
+    State carried between the chunks of one site (StepScraper.run_iter_chunks)
+    until its last chunk, when unseen jobs are marked missing. A resumed site
+    starts from its checkpoint and the JobIDs the run already committed.
+    """
+
+    def __init__(
+        self,
+        committed: set[str] | None = None,
+        checkpoint: SiteCheckpoint | None = None,
+    ) -> None:
+        canned = checkpoint.canned_sentences if checkpoint else None
+        self.canned = CannedTextFilter(
+            json.loads(canned) if canned is not None else None,
+            max_held=_canned_hold_limit(),
+        )
+        # The canned set the checkpoint holds, if any.
+        self.canned_saved: set[str] | None = (
+            set(json.loads(canned)) if canned is not None else None
+        )
+        self.json: SiteJsonStream | None = None
+        self.json_discarded = False
+        self.committed = set(committed or ())
+        self.seen_cids: set[str] = set(self.committed)
+        self.jobs = 0
+        self.saved_before = checkpoint.jobs_saved if checkpoint else 0
+        self.counters: Dict[str, int] = _checkpoint_counters(checkpoint)
+
+    def has_jobs(self) -> bool:
+        return bool(self.jobs or self.committed or self.canned.held)
+
+    def add_counters(self, before: Dict[str, int], after: Dict[str, int]) -> None:
+        for key, value in after.items():
+            self.counters[key] = self.counters.get(key, 0) + value - before.get(key, 0)
+
+    def close_json(self) -> None:
+        if self.json is not None:
+            self.json.close()
+            self.json = None
+
+    def discard_json(self) -> None:
+        """Drop the site's unfinished JSON; later chunks do not start another."""
+        if self.json is not None:
+            self.json.discard()
+            self.json = None
+        self.json_discarded = True
+
+
 def _process_site(
     s,
     site: str,
@@ -388,15 +798,54 @@ def _process_site(
     use_savepoints: bool,
     per_job_commit: bool,
     logger,
+    mark_missing: bool = True,
+    chunks: SiteChunks | None = None,
+    final: bool = True,
 ) -> None:
-    site_log = get_logger(run_id=run_id, site=site)
-    if not jobs_raw:
-        site_log.info("no jobs for site")
-        return
+    """
+    Persist a site's jobs and mark stored jobs it no longer lists as missing.
+    With ``chunks``, jobs_raw is one chunk of the site; only the rows it
+    names are loaded, and the missing pass waits for the ``final`` chunk.
+    """
+    try:
+        _process_site_jobs(
+            s,
+            site,
+            jobs_raw,
+            run_id,
+            counters,
+            use_savepoints=use_savepoints,
+            per_job_commit=per_job_commit,
+            logger=logger,
+            mark_missing=mark_missing,
+            chunks=chunks,
+            final=final,
+        )
+    except BaseException:
+        # The site's JSON now disagrees with what was saved; keep the last
+        # complete file instead of leaking the handle and the .tmp file.
+        if chunks is not None:
+            chunks.discard_json()
+        raise
+    if chunks is not None and final:
+        chunks.close_json()
 
-    def _canon_job_id(x: str | None) -> str:
-        # Canonical form for comparisons (prevents case/whitespace mismatch issues)
-        return _norm_text(x or "").strip().lower()
+
+def _process_site_jobs(
+    s,
+    site: str,
+    jobs_raw: List[Dict[str, Any]],
+    run_id: int,
+    counters: Dict[str, int],
+    *,
+    use_savepoints: bool,
+    per_job_commit: bool,
+    logger,
+    mark_missing: bool,
+    chunks: SiteChunks | None,
+    final: bool,
+) -> None:
+    site_log = get_logger(run_id=run_id, site=site)
 
     def _do_commit():
         try:
@@ -406,31 +855,127 @@ def _process_site(
             site_log.exception("commit failed")
             raise
 
-    with Timer(f"{site} preproc+save_json", logger=site_log):
-        jobs_raw = remove_canned_text(jobs_raw)
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
-        save_site_json(OUTPUT_DIR, site, jobs_raw)
+    if chunks is not None:
+        if chunks.committed:
+            jobs_raw = [
+                jd
+                for jd in jobs_raw
+                if canonical_job_id(_norm_text(str(jd.get("JobID", ""))))
+                not in chunks.committed
+            ]
+        with Timer(f"{site} preproc+save_json", logger=site_log):
+            # Canned sentences depend on every job of the site, so the filter
+            # may hold this chunk back until a later one settles them.
+            settled_early = chunks.canned.settled_early
+            jobs_raw = chunks.canned.apply(jobs_raw, final=final)
+            if chunks.canned.settled_early and not settled_early:
+                site_log.info(
+                    "canned text settled from the first %d jobs to stop holding "
+                    "them; later chunks narrow it",
+                    len(jobs_raw),
+                )
+            chunks.jobs += len(jobs_raw)
+            if (
+                chunks.json is None
+                and not chunks.json_discarded
+                and (jobs_raw or (final and chunks.committed))
+            ):
+                chunks.json = SiteJsonStream(OUTPUT_DIR, site)
+                if chunks.committed:
+                    # A resumed site's file also lists what was saved before.
+                    chunks.json.write(
+                        _committed_job_json(s, run_id, site, chunks.committed)
+                    )
+            if chunks.json is not None:
+                chunks.json.write(jobs_raw)
+        if (
+            per_job_commit
+            and chunks.canned.sentences is not None
+            and chunks.canned.sentences != chunks.canned_saved
+        ):
+            # Rows are committed one by one before the checkpoint is written;
+            # a resume must strip the rest of the site with the same set.
+            _save_canned_sentences(s, run_id, site, chunks.canned.sentences)
+            _do_commit()
+            chunks.canned_saved = set(chunks.canned.sentences)
+    if not jobs_raw and not (chunks and chunks.has_jobs() and final):
+        if chunks is not None and chunks.canned.held:
+            site_log.info(
+                "holding %d jobs until the site's canned text is known",
+                len(chunks.canned.held),
+            )
+        else:
+            site_log.info("no jobs for site")
+        return
 
-    # Load existing jobs for the site, keyed by canonical job_id
-    existing_rows = s.execute(select(Job).where(Job.site == site)).scalars().all()
-    existing_by_cid: Dict[str, Job] = {
+    def _canon_job_id(x: str | None) -> str:
+        # Canonical form for comparisons (prevents case/whitespace mismatch issues)
+        return canonical_job_id(x)
+
+    if chunks is None:
+        with Timer(f"{site} preproc+save_json", logger=site_log):
+            jobs_raw = remove_canned_text(jobs_raw)
+            os.makedirs(OUTPUT_DIR, exist_ok=True)
+            save_site_json(OUTPUT_DIR, site, jobs_raw)
+
+    # Load existing jobs for the site (or just this chunk's), keyed by
+    # canonical job_id. Only the delta columns are read; the text columns
+    # are fetched later for the rows that changed.
+    query = select(
+        Job.id, Job.job_id, Job.content_hash, Job.raw_hash, Job.is_active
+    ).where(Job.site == site)
+    if chunks is not None:
+        # Match the column as stored so the (job_id, site) index is used;
+        # canonical_job_id is applied to the results below.
+        chunk_ids: set[str] = set()
+        for jd in jobs_raw:
+            raw_id = str(jd.get("JobID", ""))
+            chunk_ids.update((raw_id, _norm_text(raw_id), _canon_job_id(raw_id)))
+        query = query.where(Job.job_id.in_(chunk_ids))
+    existing_rows = s.execute(query).all() if jobs_raw else []
+    # Values are delta rows, or Job objects once a row was loaded in full.
+    existing_by_cid: Dict[str, Any] = {
         _canon_job_id(r.job_id): r for r in existing_rows
     }
-    missing_cids = set(existing_by_cid.keys())
+    seen_cids = chunks.seen_cids if chunks is not None else set()
 
     def _fetch_existing_by_cid(cid: str) -> Job | None:
         # In case of collation/case-insensitive uniqueness, find the existing row reliably
         return (
             s.execute(
-                select(Job).where(
+                select(Job)
+                .where(
                     Job.site == site,
                     func.lower(func.trim(Job.job_id)) == cid,
                 )
+                # Bulk writes bypass the session, so reload its copy.
+                .execution_options(populate_existing=True)
             )
             .scalars()
             .first()
         )
 
+    # Full rows of stored jobs whose content changed, loaded in batches
+    # before _update_existing reads them.
+    changed_rows: Dict[int, Job] = {}
+
+    def _load_changed_rows(pks: List[int]) -> None:
+        pks = [pk for pk in dict.fromkeys(pks) if pk not in changed_rows]
+        batch_size = _bulk_batch_size()
+        for start in range(0, len(pks), batch_size):
+            rows = s.execute(
+                select(Job)
+                .where(Job.id.in_(pks[start : start + batch_size]))
+                # Bulk writes bypass the session, so reload its copies.
+                .execution_options(populate_existing=True)
+            ).scalars()
+            changed_rows.update((row.id, row) for row in rows)
+
+    def _changed_pk(job_obj: Job | None, prev) -> int | None:
+        if job_obj is None or prev is None or isinstance(prev, Job):
+            return None
+        return prev.id if prev.content_hash != job_obj.content_hash else None
+
     def _run_op(op_fn, row_log, on_integrity=None):
         if per_job_commit:
             try:
@@ -483,34 +1028,19 @@ def _process_site(
             row_log.exception("row operation failed (no sp)")
             return False
 
-    for jd in jobs_raw:
-        job_id_text = _norm_text(str(jd.get("JobID", ""))) or "-"
-        row_log = get_logger(run_id=run_id, site=site, job_id=job_id_text)
-
-        try:
-            job_obj = _normalize_job(site, run_id, jd)
-        except Exception:
-            counters["error_count"] += 1
-            raw_cid = _canon_job_id(job_id_text)
-            if raw_cid and raw_cid != "-":
-                missing_cids.discard(raw_cid)
-            row_log.exception("skip row: normalization failed")
-            continue
-
-        if not job_obj:
-            counters["error_count"] += 1
-            row_log.warning("skip row: missing JobID")
-            continue
-
-        counters["total_seen"] += 1
-
-        cid = _canon_job_id(job_obj.job_id)
-
-        # If we saw this ID in the scrape, it is not missing (even if insert/update fails later)
-        missing_cids.discard(cid)
+    def _touch_row(pk: int, fingerprint: str | None, raw_hash: str | None = None):
+        values: Dict[str, Any] = {"is_active": True, "last_seen_run_id": run_id}
+        if fingerprint:
+            values["list_fingerprint"] = fingerprint
+        if raw_hash:
+            values["raw_hash"] = raw_hash
+        s.execute(update(Job).where(Job.id == pk).values(**values))
 
-        prev = existing_by_cid.get(cid)
+    def _touch_known(target, fingerprint: str | None):
+        _touch_row(target.id, fingerprint)
+        counters["unchanged_count"] += 1
 
+    def _save_row(job_obj: Job, prev, cid: str, row_log) -> None:
         def _insert_job():
             job_obj.is_active = True
             job_obj.first_seen_run_id = run_id
@@ -527,14 +1057,18 @@ def _process_site(
                     change_source="site",
                     old_hash=None,
                     new_hash=job_obj.content_hash,
-                    changed_fields="title,url,desc,keywords,level,pay,reference_fields",
+                    changed_fields=_INSERT_CHANGED_FIELDS,
                 )
             )
             counters["inserted_count"] += 1
             row_log.info("inserted")
             existing_by_cid[cid] = job_obj
 
-        def _update_existing(target: Job):
+        def _update_existing(prev_row):
+            if isinstance(prev_row, Job):
+                target = prev_row
+            else:
+                target = changed_rows.get(prev_row.id) or s.get(Job, prev_row.id)
             old_hash = target.content_hash
             changed = _changed_fields(target, job_obj)
 
@@ -550,6 +1084,8 @@ def _process_site(
             # target.discovery_date stays as first-seen timestamp
 
             target.content_hash = job_obj.content_hash
+            target.raw_hash = job_obj.raw_hash
+            target.list_fingerprint = job_obj.list_fingerprint
             target.is_active = True
             target.last_seen_run_id = run_id
 
@@ -569,10 +1105,9 @@ def _process_site(
             counters["updated_count"] += 1
             row_log.info("updated fields=%s", changed)
 
-        def _touch_existing(target: Job):
+        def _touch_existing(target):
             # Seen but content unchanged
-            target.is_active = True
-            target.last_seen_run_id = run_id
+            _touch_row(target.id, job_obj.list_fingerprint, job_obj.raw_hash)
             counters["unchanged_count"] += 1
             row_log.debug("unchanged")
 
@@ -584,14 +1119,14 @@ def _process_site(
                 if not existing:
                     return
                 existing_by_cid[cid] = existing
-                # We already missing_cids.discard(cid) above, so it won't be marked missing.
+                # We already added cid to seen_cids above, so it won't be marked missing.
                 if existing.content_hash != job_obj.content_hash:
                     _run_op(lambda: _update_existing(existing), row_log)
                 else:
                     _run_op(lambda: _touch_existing(existing), row_log)
 
             _run_op(_insert_job, row_log, on_integrity=_on_insert_integrity)
-            continue
+            return
 
         # Existing row path
         if prev.content_hash != job_obj.content_hash:
@@ -599,51 +1134,843 @@ def _process_site(
         else:
             _run_op(lambda: _touch_existing(prev), row_log)
 
-    # Mark missing: anything previously active that we did NOT see this run
-    if missing_cids:
-        # Convert canonical IDs back to stored job_id values for querying
-        missing_job_ids = [
-            existing_by_cid[cid].job_id
-            for cid in missing_cids
-            if cid in existing_by_cid
-        ]
-        if missing_job_ids:
-            site_log.info("marking missing count=%d", len(missing_job_ids))
-            rows = (
-                s.execute(
-                    select(Job).where(Job.site == site, Job.job_id.in_(missing_job_ids))
+    # Bulk mode plans every row first and writes them in batches; a batch
+    # that hits an IntegrityError is replayed through _save_row.
+    bulk = use_savepoints and not per_job_commit and _bulk_upsert_enabled()
+    planned: List[_PlannedRow] = []
+    planned_cids: set[str] = set()
+    repeats: List[tuple[Job, str, Any]] = []
+    # Row-by-row saves wait until the changed rows they update are loaded.
+    row_saves: List[tuple[Job, str, Any]] = []
+
+    def _known_row(jd: Dict[str, Any], cid: str, raw_hash: str):
+        # Incremental scrape skipped the detail page because the list row
+        # matches what we stored, so there is nothing new to normalize.
+        known = existing_by_cid.get(cid)
+        if known is None or jd.get("__detail_skipped"):
+            return known
+        # The same scraped fields under the same NORMALIZER_VERSION would
+        # normalize to the stored content, so skip normalizing them.
+        return known if known.raw_hash == raw_hash else None
+
+    job_id_texts = [_norm_text(str(jd.get("JobID", ""))) or "-" for jd in jobs_raw]
+    raw_hashes = [_raw_hash(jd) for jd in jobs_raw]
+    # Everything that needs normalizing is done up front, in the worker
+    # pool when there is enough of it; the loop below only does DB work.
+    to_normalize = [
+        i
+        for i, jd in enumerate(jobs_raw)
+        if _known_row(jd, _canon_job_id(job_id_texts[i]), raw_hashes[i]) is None
+    ]
+    with Timer(f"{site} normalize ({len(to_normalize)} jobs)", logger=site_log):
+        normalized = dict(
+            zip(
+                to_normalize,
+                _normalize_many([jobs_raw[i] for i in to_normalize], site_log),
+            )
+        )
+
+    for i, jd in enumerate(jobs_raw):
+        job_id_text = job_id_texts[i]
+        row_log = get_logger(run_id=run_id, site=site, job_id=job_id_text)
+
+        known_cid = _canon_job_id(job_id_text)
+        raw_hash = raw_hashes[i]
+        known = _known_row(jd, known_cid, raw_hash)
+        if known is None and jd.get("__detail_skipped"):
+            row_log.warning("detail skipped for unknown row; saving list fields")
+        if known is not None:
+            counters["total_seen"] += 1
+            seen_cids.add(known_cid)
+            fingerprint = jd.get("__list_fingerprint")
+            if bulk and known_cid not in planned_cids:
+                planned_cids.add(known_cid)
+                planned.append(
+                    _PlannedRow("known", known_cid, row_log, None, known, fingerprint)
                 )
-                .scalars()
-                .all()
+            else:
+                _run_op(lambda: _touch_known(known, fingerprint), row_log)
+            row_log.debug(
+                "unchanged (%s)",
+                "detail skipped" if jd.get("__detail_skipped") else "raw fields match",
             )
+            continue
 
-            for r in rows:
-                if not r.is_active:
-                    continue
-
-                def _mark_missing():
-                    r.is_active = False
-                    s.add(
-                        JobChange(
-                            run_id=run_id,
-                            job_pk=r.id,
-                            job_id_text=r.job_id,
-                            site=site,
-                            change_type="missing",
-                            change_source="site",
-                            old_hash=r.content_hash,
-                            new_hash=None,
-                            changed_fields="",
-                        )
+        # A match found up front can be lost once an earlier copy of the same
+        # JobID is saved.
+        fields, error = normalized[i] if i in normalized else _normalize_one(jd)
+        if error is not None:
+            counters["error_count"] += 1
+            if known_cid and known_cid != "-":
+                seen_cids.add(known_cid)
+            row_log.error("skip row: normalization failed\n%s", error.rstrip())
+            continue
+
+        if not fields:
+            counters["error_count"] += 1
+            row_log.warning("skip row: missing JobID")
+            continue
+
+        job_obj = _job_from_fields(site, run_id, fields)
+
+        counters["total_seen"] += 1
+        job_obj.raw_hash = raw_hash
+
+        cid = _canon_job_id(job_obj.job_id)
+
+        # If we saw this ID in the scrape, it is not missing (even if insert/update fails later)
+        seen_cids.add(cid)
+
+        prev = existing_by_cid.get(cid)
+        if not bulk:
+            row_saves.append((job_obj, cid, row_log))
+        elif cid in planned_cids:
+            # A JobID listed twice compares against the first copy once it
+            # is written.
+            repeats.append((job_obj, cid, row_log))
+        else:
+            planned_cids.add(cid)
+            if prev is None:
+                kind = "insert"
+            elif prev.content_hash != job_obj.content_hash:
+                kind = "update"
+            else:
+                kind = "touch"
+            planned.append(
+                _PlannedRow(kind, cid, row_log, job_obj, prev, job_obj.list_fingerprint)
+            )
+
+    if row_saves:
+        _load_changed_rows(
+            [
+                pk
+                for job_obj, cid, _ in row_saves
+                if (pk := _changed_pk(job_obj, existing_by_cid.get(cid))) is not None
+            ]
+        )
+        for job_obj, cid, row_log in row_saves:
+            # Looked up now, so a JobID listed twice sees its first copy.
+            _save_row(job_obj, existing_by_cid.get(cid), cid, row_log)
+
+    batch_size = _bulk_batch_size()
+    for start in range(0, len(planned), batch_size):
+        batch = planned[start : start + batch_size]
+        try:
+            with s.begin_nested():
+                _write_planned_rows(s, site, run_id, batch)
+        except IntegrityError:
+            site_log.warning(
+                "bulk batch of %d rows hit an integrity error; saving it row by row",
+                len(batch),
+            )
+            _load_changed_rows(
+                [
+                    pk
+                    for row in batch
+                    if (pk := _changed_pk(row.job, row.prev)) is not None
+                ]
+            )
+            for row in batch:
+                if row.job is None:
+                    _run_op(
+                        lambda row=row: _touch_known(row.prev, row.fingerprint),
+                        row.log,
                     )
-                    counters["missing_count"] += 1
-                    get_logger(run_id=run_id, site=site, job_id=r.job_id).info(
-                        "marked missing"
+                else:
+                    _save_row(row.job, row.prev, row.cid, row.log)
+            continue
+        for row in batch:
+            if row.kind == "insert":
+                counters["inserted_count"] += 1
+                row.log.info("inserted")
+            elif row.kind == "update":
+                counters["updated_count"] += 1
+                row.log.info("updated fields=%s", row.changed)
+            else:
+                counters["unchanged_count"] += 1
+                if row.kind == "touch":
+                    row.log.debug("unchanged")
+
+    for job_obj, cid, row_log in repeats:
+        _save_row(job_obj, _fetch_existing_by_cid(cid), cid, row_log)
+
+    if not final:
+        return
+
+    # Mark missing: anything previously active that we did NOT see this run.
+    # A partial scrape (time budget, crash) proves nothing about absent jobs.
+    if chunks is None:
+        stored_job_ids = [r.job_id for r in existing_by_cid.values() if r.is_active]
+    else:
+        # Earlier chunks' rows were never all loaded; list the site's active
+        # IDs only now that every chunk is in.
+        stored_job_ids = (
+            s.execute(
+                select(Job.job_id).where(Job.site == site, Job.is_active.is_(True))
+            )
+            .scalars()
+            .all()
+        )
+    # Stored job_id values (not canonical IDs) for querying
+    missing_job_ids = [
+        job_id for job_id in stored_job_ids if _canon_job_id(job_id) not in seen_cids
+    ]
+    if missing_job_ids and not mark_missing:
+        site_log.warning(
+            "site scrape incomplete; not marking %d unseen jobs missing",
+            len(missing_job_ids),
+        )
+    elif missing_job_ids:
+        site_log.info("marking missing count=%d", len(missing_job_ids))
+        batch_size = _bulk_batch_size()
+        for start in range(0, len(missing_job_ids), batch_size):
+            batch = missing_job_ids[start : start + batch_size]
+            still_active = (
+                Job.site == site,
+                Job.job_id.in_(batch),
+                Job.is_active.is_(True),
+            )
+            marked: List[int] = []
+
+            def _mark_missing():
+                # Change rows first: the UPDATE clears the predicate they
+                # are selected by.
+                s.execute(
+                    insert(JobChange.__table__).from_select(
+                        [
+                            "run_id",
+                            "job_pk",
+                            "job_id_text",
+                            "site",
+                            "change_type",
+                            "change_source",
+                            "old_hash",
+                            "new_hash",
+                            "changed_fields",
+                        ],
+                        select(
+                            literal(run_id),
+                            Job.id,
+                            Job.job_id,
+                            literal(site),
+                            literal("missing"),
+                            literal("site"),
+                            Job.content_hash,
+                            null(),
+                            literal(""),
+                        ).where(*still_active),
                     )
+                )
+                result = s.execute(
+                    update(Job)
+                    .where(*still_active)
+                    .values(is_active=False)
+                    .execution_options(synchronize_session=False)
+                )
+                marked.append(result.rowcount)
+
+            if _run_op(_mark_missing, site_log) and marked:
+                counters["missing_count"] += marked[0]
+                site_log.info("marked missing count=%d", marked[0])
+
+
+# ---------------------------- checkpoints ----------------------------
+def _checkpoint_counters(checkpoint: SiteCheckpoint | None) -> Dict[str, int]:
+    if checkpoint is None or not checkpoint.counters:
+        return {}
+    try:
+        return {k: int(v) for k, v in json.loads(checkpoint.counters).items()}
+    except (TypeError, ValueError):
+        return {}
+
 
-                _run_op(
-                    _mark_missing, get_logger(run_id=run_id, site=site, job_id=r.job_id)
+def _save_checkpoint(
+    s,
+    run_id: int,
+    site: str,
+    chunks: SiteChunks,
+    counters_before: Dict[str, int],
+    counters: Dict[str, int],
+    *,
+    done: bool,
+    site_error: str | None = None,
+) -> None:
+    """
+    Record a site's progress in the transaction that saved its jobs.
+    ``site_error`` is the scraper's reason the site ended early, if any.
+    """
+    chunks.add_counters(counters_before, counters)
+    row = _checkpoint_row(s, run_id, site)
+    row.status = "done" if done else "running"
+    row.site_error = site_error
+    row.jobs_saved = chunks.saved_before + chunks.jobs
+    row.counters = json.dumps(chunks.counters, sort_keys=True)
+    if chunks.canned.sentences is not None:
+        row.canned_sentences = json.dumps(sorted(chunks.canned.sentences))
+
+
+def _checkpoint_row(s, run_id: int, site: str) -> SiteCheckpoint:
+    row = (
+        s.execute(
+            select(SiteCheckpoint).where(
+                SiteCheckpoint.run_id == run_id, SiteCheckpoint.site == site
+            )
+        )
+        .scalars()
+        .first()
+    )
+    if row is None:
+        row = SiteCheckpoint(run_id=run_id, site=site, status="running")
+        s.add(row)
+    return row
+
+
+def _save_canned_sentences(s, run_id: int, site: str, sentences: set[str]) -> None:
+    _checkpoint_row(s, run_id, site).canned_sentences = json.dumps(sorted(sentences))
+
+
+def _load_committed_jobs(s, run_id: int, sites: List[str]) -> Dict[str, set[str]]:
+    # Rows the run already touched are the resume cursor: they were committed
+    # together with (or, in per_job mode, just before) their checkpoint.
+    committed: Dict[str, set[str]] = {}
+    if not sites:
+        return committed
+    rows = s.execute(
+        select(Job.site, Job.job_id).where(
+            Job.last_seen_run_id == run_id, Job.site.in_(sites)
+        )
+    )
+    for site, job_id in rows:
+        committed.setdefault(site, set()).add(canonical_job_id(job_id))
+    return committed
+
+
+def _committed_job_json(
+    s, run_id: int, site: str, committed: set[str]
+) -> List[Dict[str, Any]]:
+    """The site's jobs saved before a resume, as stored, in scraped-JSON shape."""
+    rows = s.execute(
+        select(
+            Job.job_id, Job.title, Job.url, Job.desc, Job.pay, Job.reference_fields
+        )
+        .where(Job.site == site, Job.last_seen_run_id == run_id)
+        .order_by(Job.id)
+    )
+    jobs: List[Dict[str, Any]] = []
+    for row in rows:
+        if canonical_job_id(row.job_id) not in committed:
+            continue
+        job = {
+            "JobID": row.job_id,
+            "JobTitle": row.title,
+            "JobUrl": row.url,
+            "JobDesc": row.desc,
+            "JobPay": row.pay,
+        }
+        if row.reference_fields:
+            job.update(json.loads(row.reference_fields))
+        jobs.append(job)
+    return jobs
+
+
+def _persist_site_chunk(
+    scraper: StepScraper,
+    run_id: int,
+    site: str,
+    jobs_raw: List[Dict[str, Any]],
+    done: bool,
+    chunks: SiteChunks,
+    counters: Dict[str, int],
+    run_log: logging.LoggerAdapter,
+    *,
+    on_done=None,
+) -> bool:
+    """
+    Save one chunk of a site and its checkpoint in one transaction (per_site
+    mode). ``on_done(s)`` joins the site's last transaction. Returns False
+    if the transaction was rolled back.
+    """
+    site_log = get_logger(run_id=run_id, site=site)
+    before = dict(counters)
+    incomplete = done and _site_incomplete(scraper, site, counters, site_log)
+    site_error = scraper.site_errors.get(site) if done else None
+    if not jobs_raw and not chunks.has_jobs():
+        site_log.info("skip empty site")
+        with SessionLocal.begin() as s:
+            _save_checkpoint(
+                s,
+                run_id,
+                site,
+                chunks,
+                before,
+                counters,
+                done=done,
+                site_error=site_error,
+            )
+            if done and on_done is not None:
+                on_done(s)
+        return True
+    site_log.info(
+        "begin site transaction%s",
+        "" if done else f" (chunk of {len(jobs_raw)})",
+    )
+    try:
+        with SessionLocal.begin() as s:
+            with Timer(f"persist {site}", logger=run_log, site=site):
+                _process_site(
+                    s,
+                    site,
+                    jobs_raw,
+                    run_id,
+                    counters,
+                    use_savepoints=True,
+                    per_job_commit=False,
+                    logger=run_log,
+                    mark_missing=not incomplete,
+                    chunks=chunks,
+                    final=done,
                 )
+            _save_checkpoint(
+                s,
+                run_id,
+                site,
+                chunks,
+                before,
+                counters,
+                done=done,
+                site_error=site_error,
+            )
+            if done and on_done is not None:
+                on_done(s)
+        site_log.info(
+            "commit site transaction (ok) | totals so far new=%d upd=%d miss=%d same=%d err=%d",
+            counters["inserted_count"],
+            counters["updated_count"],
+            counters["missing_count"],
+            counters["unchanged_count"],
+            counters["error_count"],
+        )
+    except Exception:
+        site_log.exception("rollback site transaction (error)")
+        return False
+    return True
+
+
+# ---------------------------- site errors ----------------------------
+def _site_incomplete(
+    scraper: StepScraper, site: str, counters: Dict[str, int], logger
+) -> bool:
+    """Count and log a site that ended early; its jobs are a partial list."""
+    err = scraper.site_errors.get(site)
+    if not err:
+        return False
+    counters["error_count"] += 1
+    logger.warning("site scrape incomplete: %s", err)
+    return True
+
+
+def _site_error_notes(scraper: StepScraper) -> str | None:
+    if not scraper.site_errors:
+        return None
+    return "\n".join(f"{site}: {err}" for site, err in scraper.site_errors.items())
+
+
+# ---------------------------- step profiles ----------------------------
+def _profile_top_n() -> int:
+    try:
+        return max(0, int(os.getenv("PROFILE_TOP_N", "10")))
+    except ValueError:
+        return 10
+
+
+def _write_step_profile(
+    scraper: StepScraper, logger: logging.LoggerAdapter, label: str
+) -> None:
+    """Write the run's per-step profile JSON and log the slowest steps."""
+    path = os.path.join(OUTPUT_DIR, "profiles", f"{label}.json")
+    try:
+        scraper.profiler.write_json(path)
+    except OSError:
+        logger.exception("step profile write failed | path=%s", path)
+        return
+    logger.info("step profile written | path=%s", path)
+    for rank, row in enumerate(scraper.profiler.top(_profile_top_n()), 1):
+        logger.info(
+            "slow step #%d site=%s path=%s action=%s kind=%s calls=%d items=%d "
+            "wall=%.3fs cpu=%.3fs wait=%.3fs",
+            rank,
+            row["site"],
+            row["path"],
+            row["action"],
+            row["kind"],
+            row["calls"],
+            row["items"],
+            row["wall_s"],
+            row["cpu_s"],
+            row["wait_s"],
+        )
+
+
+# ---------------------------- record / replay ----------------------------
+def _cli_option(name: str) -> str | None:
+    args = sys.argv[2:]
+    if name not in args:
+        return None
+    idx = args.index(name)
+    return args[idx + 1] if idx + 1 < len(args) else None
+
+
+def _run_fixture_scrape(
+    scraper: StepScraper, logger: logging.LoggerAdapter, label: str, out_dir: str
+) -> None:
+    """Scrape without touching the DB; log time per site and per step."""
+    t0 = time.perf_counter()
+    for site, jobs_raw in scraper.run_iter():
+        save_site_json(out_dir, site, jobs_raw)
+        if scraper.site_errors.get(site):
+            logger.warning("%s site=%s incomplete: %s", label, site, scraper.site_errors[site])
+        rows = scraper.profiler.site_rows(site)
+        logger.info(
+            "%s site=%s jobs=%d secs=%.3f",
+            label,
+            site,
+            len(jobs_raw),
+            sum(row["wall_s"] for row in rows),
+        )
+        for row in rows:
+            logger.info(
+                "%s site=%s step=%s action=%s secs=%.3f",
+                label,
+                site,
+                row["path"],
+                row["action"],
+                row["wall_s"],
+            )
+    logger.info("%s total secs=%.3f", label, time.perf_counter() - t0)
+    _write_step_profile(scraper, logger, f"{label}_{time.strftime('%Y%m%d_%H%M%S')}")
+
+
+# ------------------------------- runs -------------------------------
+def _new_counters() -> Dict[str, int]:
+    return {
+        "total_seen": 0,
+        "inserted_count": 0,
+        "updated_count": 0,
+        "missing_count": 0,
+        "unchanged_count": 0,
+        "error_count": 0,
+    }
+
+
+def _open_run() -> tuple[int, str, Dict[str, Dict[str, str]]]:
+    """Insert a new IntegrationRun; returns (run_id, mode, known_jobs)."""
+    # Incremental runs skip detail pages for known, unchanged list rows; a
+    # full run every INCREMENTAL_FULL_REFRESH_EVERY runs re-reads everything.
+    run_mode = _FULL_RUN_MODE
+    known_jobs: Dict[str, Dict[str, str]] = {}
+    if os.getenv("INCREMENTAL_SCRAPE", "").lower() == "true":
+        with SessionLocal() as s:
+            if not _full_refresh_due(s, _full_refresh_every()):
+                run_mode = _INCREMENTAL_RUN_MODE
+                known_jobs = _load_known_jobs(s)
+
+    with SessionLocal.begin() as s:
+        run = IntegrationRun(user=getpass.getuser(), mode=run_mode)
+        s.add(run)
+        s.flush()
+        return run.id, run_mode, known_jobs
+
+
+def _finalize_run(
+    run_id: int,
+    counters: Dict[str, int],
+    notes: str | None,
+    run_log: logging.LoggerAdapter,
+) -> bool:
+    """Store the run's totals and close it; False if it was already closed."""
+    with Timer("finalize run", logger=run_log):
+        with SessionLocal.begin() as s:
+            # The guard lets several queue workers race to close one run.
+            closed = s.execute(
+                update(IntegrationRun)
+                .where(
+                    IntegrationRun.id == run_id,
+                    IntegrationRun.finished_at.is_(None),
+                )
+                .values(
+                    total_seen=counters["total_seen"],
+                    inserted_count=counters["inserted_count"],
+                    updated_count=counters["updated_count"],
+                    missing_count=counters["missing_count"],
+                    unchanged_count=counters["unchanged_count"],
+                    error_count=counters["error_count"],
+                    notes=notes,
+                    finished_at=func.now(),
+                )
+            )
+            if closed.rowcount != 1:
+                return False
+    run_log.info(
+        "done totals total=%d new=%d upd=%d missing=%d same=%d err=%d",
+        counters["total_seen"],
+        counters["inserted_count"],
+        counters["updated_count"],
+        counters["missing_count"],
+        counters["unchanged_count"],
+        counters["error_count"],
+    )
+    return True
+
+
+# ---------------------------- scheduling ----------------------------
+def _due_sites(steps_path: str, logger: logging.LoggerAdapter) -> List[str] | None:
+    """
+    With SITE_SCHEDULE=true, the steps.json sites whose cadence says they are
+    due; None means scrape everything (the default, or ``--all``).
+    """
+    if os.getenv("SITE_SCHEDULE", "").lower() != "true" or "--all" in sys.argv[2:]:
+        return None
+    with SessionLocal() as s:
+        cadences = site_cadences(s, load_step_plans(steps_path))
+    for cadence in cadences.values():
+        logger.info(
+            "schedule site=%s due=%s changed=%d/%d every=%.0fh last=%s",
+            cadence.site,
+            "yes" if cadence.due else "no",
+            cadence.changed,
+            cadence.scrapes,
+            cadence.interval_hours,
+            cadence.last_scraped_at or "never",
+        )
+    due = [site for site, cadence in cadences.items() if cadence.due]
+    logger.info(
+        "schedule | due_sites=%d | skipped_sites=%d",
+        len(due),
+        len(cadences) - len(due),
+    )
+    return due
+
+
+# ---------------------------- site queue ----------------------------
+def _worker_setting(name: str, default: float) -> float:
+    try:
+        return max(1.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _enqueue_run(steps_path: str, logger: logging.LoggerAdapter) -> int:
+    """Open a run and queue the steps.json sites that are due for ``run.py worker``."""
+    due = _due_sites(steps_path, logger)
+    run_id, run_mode, _ = _open_run()
+    with SessionLocal.begin() as s:
+        added = enqueue_sites(
+            s, run_id, load_step_plans(steps_path) if due is None else due
+        )
+    logger.info(
+        "run queued | run_id=%d | mode=%s | sites=%d | steps_path=%s",
+        run_id,
+        run_mode,
+        added,
+        steps_path,
+    )
+    return run_id
+
+
+def _queued_run_id(logger: logging.LoggerAdapter) -> int:
+    arg = sys.argv[2] if len(sys.argv) > 2 else None
+    if arg is not None:
+        try:
+            return int(arg)
+        except ValueError:
+            logger.error("worker expects a run id, got %s", arg)
+            sys.exit(1)
+    # Without an id, join the newest unfinished run that has a queue.
+    with SessionLocal() as s:
+        run_id = s.scalar(
+            select(func.max(SiteQueueItem.run_id))
+            .join(IntegrationRun, IntegrationRun.id == SiteQueueItem.run_id)
+            .where(IntegrationRun.finished_at.is_(None))
+        )
+    if run_id is None:
+        logger.error("no queued run to join; start one with: python run.py enqueue")
+        sys.exit(1)
+    return int(run_id)
+
+
+def _finish_queued_run(run_id: int, run_log: logging.LoggerAdapter) -> bool:
+    """
+    Close a queued run once no site is pending or claimed. Totals come from
+    the site checkpoints, since every worker only saw its own sites.
+    """
+    with SessionLocal() as s:
+        left = unfinished_count(s, run_id)
+        if left:
+            run_log.info("worker finished | sites still queued or running=%d", left)
+            return False
+        counters = _new_counters()
+        for checkpoint in s.execute(
+            select(SiteCheckpoint).where(SiteCheckpoint.run_id == run_id)
+        ).scalars():
+            for key, value in _checkpoint_counters(checkpoint).items():
+                counters[key] = counters.get(key, 0) + value
+        errors = (
+            s.execute(
+                select(SiteQueueItem)
+                .where(
+                    SiteQueueItem.run_id == run_id,
+                    SiteQueueItem.last_error.is_not(None),
+                )
+                .order_by(SiteQueueItem.id)
+            )
+            .scalars()
+            .all()
+        )
+    # Failed sites never saved a final checkpoint, so count them here.
+    counters["error_count"] += sum(1 for item in errors if item.status == "failed")
+    notes = "\n".join(f"{item.site}: {item.last_error}" for item in errors) or None
+    return _finalize_run(run_id, counters, notes, run_log)
+
+
+def _run_worker(steps_path: str, logger: logging.LoggerAdapter) -> None:
+    """
+    Claim sites of a queued run one at a time and persist them per_site,
+    until the queue is drained; the last worker out closes the run.
+    """
+    run_id = _queued_run_id(logger)
+    with SessionLocal() as s:
+        run = s.get(IntegrationRun, run_id)
+        if run is None or run.finished_at is not None:
+            logger.error("run %s is not an unfinished run; cannot join", run_id)
+            sys.exit(1)
+        run_mode = run.mode
+        known_jobs = _load_known_jobs(s) if run_mode == _INCREMENTAL_RUN_MODE else {}
+
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    lease_sec = _worker_setting("WORKER_LEASE_SEC", 300)
+    poll_sec = _worker_setting("WORKER_POLL_SEC", 10)
+    try:
+        max_attempts = max(1, int(os.getenv("WORKER_MAX_ATTEMPTS", "3")))
+    except ValueError:
+        max_attempts = 3
+
+    ts_label = time.strftime("%Y%m%d_%H%M%S")
+    add_run_file_handler(f"{ts_label}_{run_id}_{os.getpid()}")
+    run_log = get_logger(run_id=run_id)
+    run_log.info(
+        "worker joined | worker=%s | mode=%s | lease=%ss | max_attempts=%d",
+        worker,
+        run_mode,
+        lease_sec,
+        max_attempts,
+    )
+
+    scraper = StepScraper(steps_path, known_jobs=known_jobs)
+    lease = LeaseKeeper(SessionLocal, run_id, worker, lease_sec)
+    site_chunks: Dict[str, SiteChunks] = {}
+    failed: Dict[str, str] = {}
+    counters = _new_counters()
+
+    def _claim() -> str | None:
+        # Called from the scraper's driver threads.
+        site = next_site(
+            SessionLocal,
+            run_id,
+            worker,
+            lease_sec=lease_sec,
+            max_attempts=max_attempts,
+            poll_sec=poll_sec,
+        )
+        if site is None:
+            return None
+        lease.hold(site)
+        # A site reclaimed from a dead worker resumes from its checkpoint.
+        with SessionLocal() as s:
+            checkpoint = (
+                s.execute(
+                    select(SiteCheckpoint).where(
+                        SiteCheckpoint.run_id == run_id, SiteCheckpoint.site == site
+                    )
+                )
+                .scalars()
+                .first()
+            )
+            committed = (
+                _load_committed_jobs(s, run_id, [site]).get(site)
+                if checkpoint is not None
+                else None
+            )
+        if committed:
+            scraper.resume_jobs[site] = committed
+        site_chunks[site] = SiteChunks(committed, checkpoint)
+        get_logger(run_id=run_id, site=site).info(
+            "claimed site | worker=%s | committed_jobs=%d",
+            worker,
+            len(committed or ()),
+        )
+        return site
+
+    def _on_done(site: str):
+        def _finish(s) -> None:
+            if not finish_site(
+                s, run_id, site, worker, error=scraper.site_errors.get(site)
+            ):
+                get_logger(run_id=run_id, site=site).warning(
+                    "site lease was lost; another worker may redo the site"
+                )
+
+        return _finish
+
+    try:
+        for site, jobs_raw, done in scraper.run_iter_chunks(claim=_claim):
+            chunks = site_chunks[site]
+            if site not in failed and not _persist_site_chunk(
+                scraper,
+                run_id,
+                site,
+                jobs_raw,
+                done,
+                chunks,
+                counters,
+                run_log,
+                on_done=_on_done(site),
+            ):
+                failed[site] = "site persistence failed"
+            if not done:
+                continue
+            site_chunks.pop(site, None)
+            scraper.resume_jobs.pop(site, None)
+            lease.drop(site)
+            if site in failed:
+                # Hand the site back; the next claim resumes from its checkpoint.
+                release_site(
+                    SessionLocal,
+                    run_id,
+                    site,
+                    worker,
+                    failed.pop(site),
+                    max_attempts=max_attempts,
+                )
+    except Exception:
+        run_log.exception("worker crashed; its sites return to the queue")
+        raise
+    finally:
+        for chunks in site_chunks.values():
+            chunks.discard_json()
+        lease.stop()
+        _shutdown_normalize_pool()
+        _write_step_profile(scraper, run_log, f"{ts_label}_{run_id}_{os.getpid()}")
+
+    run_log.info(
+        "worker totals total=%d new=%d upd=%d missing=%d same=%d err=%d",
+        counters["total_seen"],
+        counters["inserted_count"],
+        counters["updated_count"],
+        counters["missing_count"],
+        counters["unchanged_count"],
+        counters["error_count"],
+    )
+    _finish_queued_run(run_id, run_log)
 
 
 # ------------------------------- main -------------------------------
@@ -653,7 +1980,11 @@ def main():
     log_startup_environment(base_log)
 
     if len(sys.argv) < 2:
-        base_log.error("Usage: python run.py [initdb|steps|test|download|reprocess]")
+        base_log.error(
+            "Usage: python run.py [initdb|steps [--replay DIR|--resume RUN_ID|--all]"
+            "|enqueue [--all]|worker [RUN_ID]|test|record [DIR]"
+            "|download|reprocess]"
+        )
         sys.exit(1)
 
     cmd = sys.argv[1].lower()
@@ -694,6 +2025,44 @@ def main():
                 _print_test_extracted_values(site, jobs_raw)
         return
 
+    if cmd == "record":
+        # Record pages from a live scrape so later runs can replay them offline.
+        steps_path = os.path.join(BASE_DIR, "steps.json")
+        fixtures_dir = (
+            sys.argv[2]
+            if len(sys.argv) > 2
+            else os.path.join(OUTPUT_DIR, "fixtures", time.strftime("%Y%m%d_%H%M%S"))
+        )
+        record_log = get_logger(run_id="record")
+        record_log.info("recording fixtures | dir=%s | steps_path=%s", fixtures_dir, steps_path)
+        store = FixtureStore(fixtures_dir)
+        scraper = StepScraper(steps_path, fixtures=FixtureRecorder(store))
+        _run_fixture_scrape(
+            scraper, record_log, "record", os.path.join(fixtures_dir, "output")
+        )
+        record_log.info("recorded fixtures=%d dir=%s", store.count(), fixtures_dir)
+        return
+
+    replay_dir = _cli_option("--replay") if cmd == "steps" else None
+    if replay_dir:
+        # Replays never write to the DB; the results are timings and JSON.
+        steps_path = os.path.join(BASE_DIR, "steps.json")
+        if not os.path.isdir(replay_dir):
+            base_log.error("replay fixtures dir not found: %s", replay_dir)
+            sys.exit(1)
+        replay_log = get_logger(run_id="replay")
+        replay_log.info("replaying fixtures | dir=%s | steps_path=%s", replay_dir, steps_path)
+        replayer = FixtureReplayer(FixtureStore(replay_dir))
+        try:
+            scraper = StepScraper(steps_path, fixtures=replayer)
+            _run_fixture_scrape(
+                scraper, replay_log, "replay", os.path.join(OUTPUT_DIR, "replay")
+            )
+        finally:
+            replayer.close()
+        replay_log.info("replay fixture misses=%d", replayer.misses)
+        return
+
     commit_mode = os.getenv("DB_COMMIT_MODE", "all_at_end").lower()
     if commit_mode not in {"all_at_end", "per_site", "per_job"}:
         base_log.warning(
@@ -709,37 +2078,116 @@ def main():
         ensure_nltk()
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    # Open run row
-    with SessionLocal.begin() as s:
-        run = IntegrationRun(user=getpass.getuser(), mode="steps")
-        s.add(run)
-        s.flush()
-        run_id = run.id
+    if cmd == "enqueue":
+        _enqueue_run(steps_path, base_log)
+        return
+    if cmd == "worker":
+        _run_worker(steps_path, base_log)
+        return
+
+    counters = _new_counters()
+
+    # steps --resume <run_id> continues an unfinished run: finished sites are
+    # skipped, and the JobIDs a site already committed are not scraped again.
+    checkpoints: Dict[str, SiteCheckpoint] = {}
+    committed: Dict[str, set[str]] = {}
+    sites: List[str] | None = None
+    known_jobs: Dict[str, Dict[str, str]] = {}
+    resume_arg = _cli_option("--resume") if cmd == "steps" else None
+    if cmd == "steps" and "--resume" in sys.argv[2:] and not resume_arg:
+        base_log.error("Usage: python run.py steps --resume <run_id>")
+        sys.exit(1)
+
+    if resume_arg:
+        try:
+            run_id = int(resume_arg)
+        except ValueError:
+            base_log.error("--resume expects a run id, got %s", resume_arg)
+            sys.exit(1)
+        with SessionLocal() as s:
+            run = s.get(IntegrationRun, run_id)
+            if run is None or run.finished_at is not None:
+                base_log.error("run %s is not an unfinished run; cannot resume", run_id)
+                sys.exit(1)
+            run_mode = run.mode
+            checkpoints = {
+                c.site: c
+                for c in s.execute(
+                    select(SiteCheckpoint).where(SiteCheckpoint.run_id == run_id)
+                ).scalars()
+            }
+            sites = [
+                site
+                for site in load_step_plans(steps_path)
+                if site not in checkpoints or checkpoints[site].status != "done"
+            ]
+            committed = _load_committed_jobs(
+                s, run_id, [site for site in sites if site in checkpoints]
+            )
+            if run_mode == _INCREMENTAL_RUN_MODE:
+                known_jobs = _load_known_jobs(s)
+        for checkpoint in checkpoints.values():
+            for key, value in _checkpoint_counters(checkpoint).items():
+                counters[key] = counters.get(key, 0) + value
+    else:
+        sites = _due_sites(steps_path, base_log)
+        run_id, run_mode, known_jobs = _open_run()
 
     ts_label = time.strftime("%Y%m%d_%H%M%S")
     add_run_file_handler(f"{ts_label}_{run_id}")
     run_log = get_logger(run_id=run_id)
-    run_log.info("run opened | commit_mode=%s | steps_path=%s", commit_mode, steps_path)
+    run_log.info(
+        "run %s | commit_mode=%s | mode=%s | known_sites=%d | steps_path=%s",
+        "resumed" if resume_arg else "opened",
+        commit_mode,
+        run_mode,
+        len(known_jobs),
+        steps_path,
+    )
+    if resume_arg:
+        run_log.info(
+            "resume | done_sites=%d | pending_sites=%d | committed_jobs=%d",
+            sum(1 for c in checkpoints.values() if c.status == "done"),
+            len(sites),
+            sum(len(cids) for cids in committed.values()),
+        )
 
-    scraper = StepScraper(steps_path)
+    scraper = StepScraper(
+        steps_path, known_jobs=known_jobs, sites=sites, resume_jobs=committed
+    )
 
-    counters = {
-        "total_seen": 0,
-        "inserted_count": 0,
-        "updated_count": 0,
-        "missing_count": 0,
-        "unchanged_count": 0,
-        "error_count": 0,
-    }
+    def _site_chunks(site: str) -> SiteChunks:
+        return SiteChunks(committed.get(site), checkpoints.get(site))
 
+    # Sites whose last chunk has not arrived yet.
+    site_chunks: Dict[str, SiteChunks] = {}
     try:
         if commit_mode == "per_job":
             run_log.info("streaming mode: persisting per job")
             with SessionLocal() as s:
-                for site, jobs_raw in scraper.run_iter():
+                for site, jobs_raw, done in scraper.run_iter_chunks():
                     site_log = get_logger(run_id=run_id, site=site)
-                    if not jobs_raw:
+                    if site not in site_chunks:
+                        site_chunks[site] = _site_chunks(site)
+                    chunks = site_chunks.pop(site) if done else site_chunks[site]
+                    before = dict(counters)
+                    incomplete = done and _site_incomplete(
+                        scraper, site, counters, site_log
+                    )
+                    site_error = scraper.site_errors.get(site) if done else None
+                    if not jobs_raw and not chunks.has_jobs():
                         site_log.info("skip empty site")
+                        _save_checkpoint(
+                            s,
+                            run_id,
+                            site,
+                            chunks,
+                            before,
+                            counters,
+                            done=done,
+                            site_error=site_error,
+                        )
+                        s.commit()
                         continue
                     try:
                         with Timer(f"persist {site}", logger=run_log, site=site):
@@ -752,6 +2200,9 @@ def main():
                                 use_savepoints=False,
                                 per_job_commit=True,
                                 logger=run_log,
+                                mark_missing=not incomplete,
+                                chunks=chunks,
+                                final=done,
                             )
                     except Exception:
                         s.rollback()
@@ -760,6 +2211,20 @@ def main():
                             "site persistence failed in per_job mode; continuing"
                         )
                         continue
+                    # Jobs were committed one by one; the checkpoint follows.
+                    _save_checkpoint(
+                        s,
+                        run_id,
+                        site,
+                        chunks,
+                        before,
+                        counters,
+                        done=done,
+                        site_error=site_error,
+                    )
+                    s.commit()
+                    if not done:
+                        continue
                     site_log.info(
                         "site persisted (per_job) | totals so far new=%d upd=%d miss=%d same=%d err=%d",
                         counters["inserted_count"],
@@ -771,36 +2236,15 @@ def main():
 
         elif commit_mode == "per_site":
             run_log.info("streaming mode: persisting per site")
-            for site, jobs_raw in scraper.run_iter():
-                site_log = get_logger(run_id=run_id, site=site)
-                if not jobs_raw:
-                    site_log.info("skip empty site")
-                    continue
-                site_log.info("begin site transaction")
-                try:
-                    with SessionLocal.begin() as s:
-                        with Timer(f"persist {site}", logger=run_log, site=site):
-                            _process_site(
-                                s,
-                                site,
-                                jobs_raw,
-                                run_id,
-                                counters,
-                                use_savepoints=True,
-                                per_job_commit=False,
-                                logger=run_log,
-                            )
-                    site_log.info(
-                        "commit site transaction (ok) | totals so far new=%d upd=%d miss=%d same=%d err=%d",
-                        counters["inserted_count"],
-                        counters["updated_count"],
-                        counters["missing_count"],
-                        counters["unchanged_count"],
-                        counters["error_count"],
-                    )
-                except Exception:
-                    site_log.exception("rollback site transaction (error)")
-                    continue
+            # Paginated sites arrive in chunks, each committed in its own
+            # transaction; the last one also marks unseen jobs missing.
+            for site, jobs_raw, done in scraper.run_iter_chunks():
+                if site not in site_chunks:
+                    site_chunks[site] = _site_chunks(site)
+                chunks = site_chunks.pop(site) if done else site_chunks[site]
+                _persist_site_chunk(
+                    scraper, run_id, site, jobs_raw, done, chunks, counters, run_log
+                )
 
         else:  # all_at_end
             run_log.info("bulk mode: scraping all then one big transaction")
@@ -811,44 +2255,55 @@ def main():
                 with s.begin():  # one big transaction
                     for site, jobs_raw in site_to_jobs.items():
                         site_log = get_logger(run_id=run_id, site=site)
-                        if not jobs_raw:
+                        before = dict(counters)
+                        incomplete = _site_incomplete(scraper, site, counters, site_log)
+                        chunks = _site_chunks(site)
+                        # A resumed site only lists the jobs it had not
+                        # committed; like the streaming modes, it goes
+                        # through SiteChunks so the committed ones count as
+                        # seen and are not marked missing.
+                        resumed = bool(chunks.committed)
+                        if not jobs_raw and not chunks.has_jobs():
                             site_log.info("skip empty site")
-                            continue
-                        with Timer(f"persist {site}", logger=run_log, site=site):
-                            _process_site(
-                                s,
-                                site,
-                                jobs_raw,
-                                run_id,
-                                counters,
-                                use_savepoints=True,
-                                per_job_commit=False,
-                                logger=run_log,
-                            )
+                        else:
+                            with Timer(f"persist {site}", logger=run_log, site=site):
+                                _process_site(
+                                    s,
+                                    site,
+                                    jobs_raw,
+                                    run_id,
+                                    counters,
+                                    use_savepoints=True,
+                                    per_job_commit=False,
+                                    logger=run_log,
+                                    mark_missing=not incomplete,
+                                    chunks=chunks if resumed else None,
+                                )
+                            if not resumed:
+                                chunks.jobs = len(jobs_raw)
+                        # Checkpoints are also the scrape history that
+                        # SITE_SCHEDULE reads.
+                        _save_checkpoint(
+                            s,
+                            run_id,
+                            site,
+                            chunks,
+                            before,
+                            counters,
+                            done=True,
+                            site_error=scraper.site_errors.get(site),
+                        )
 
     except Exception:
         run_log.exception("persistence phase crashed")
         raise
+    finally:
+        for chunks in site_chunks.values():
+            chunks.discard_json()
+        _shutdown_normalize_pool()
+        _write_step_profile(scraper, run_log, f"{ts_label}_{run_id}")
 
-    with Timer("finalize run", logger=run_log):
-        with SessionLocal.begin() as s:
-            r = s.get(IntegrationRun, run_id)
-            r.total_seen = counters["total_seen"]
-            r.inserted_count = counters["inserted_count"]
-            r.updated_count = counters["updated_count"]
-            r.missing_count = counters["missing_count"]
-            r.unchanged_count = counters["unchanged_count"]
-            r.error_count = counters["error_count"]
-            r.finished_at = func.now()
-        run_log.info(
-            "done totals total=%d new=%d upd=%d missing=%d same=%d err=%d",
-            counters["total_seen"],
-            counters["inserted_count"],
-            counters["updated_count"],
-            counters["missing_count"],
-            counters["unchanged_count"],
-            counters["error_count"],
-        )
+    _finalize_run(run_id, counters, _site_error_notes(scraper), run_log)
 
 
 if __name__ == "__main__":
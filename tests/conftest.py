@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+# app.models builds its engine at import; keep tests off data/jobs.db and any
+# DB_URL from .env (load_dotenv does not override a variable already set).
+os.environ["DB_URL"] = "sqlite://"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base, make_session_factory
+from app.models import IntegrationRun
+
+
+@pytest.fixture
+def session_factory():
+    """A fresh in-memory database shared by every session and thread."""
+    engine = create_engine(
+        "sqlite://",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    try:
+        yield make_session_factory(engine)
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def run_id(session_factory):
+    with session_factory.begin() as s:
+        run = IntegrationRun(user="test", mode="steps")
+        s.add(run)
+        s.flush()
+        return run.id
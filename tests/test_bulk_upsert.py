@@ -0,0 +1,130 @@
+from sqlalchemy import select
+
+import run
+from app.bulk_upsert import insert_rows, update_rows, upsert_rows
+from app.db import utc_now_naive
+from app.models import Job, JobChange
+
+
+def _job_values(run_id, job_id, title, content_hash):
+    return {
+        "job_id": job_id,
+        "site": "acme",
+        "title": title,
+        "content_hash": content_hash,
+        "run_id": run_id,
+        "first_seen_run_id": run_id,
+        "last_seen_run_id": run_id,
+    }
+
+
+def _jobs(session_factory):
+    with session_factory() as s:
+        return {
+            job.job_id: job
+            for job in s.execute(select(Job).order_by(Job.id)).scalars()
+        }
+
+
+def test_upsert_rows_inserts_new_keys_and_updates_existing(session_factory, run_id):
+    with session_factory.begin() as s:
+        insert_rows(s, Job.__table__, [_job_values(run_id, "1", "Old", "h1")])
+    with session_factory.begin() as s:
+        upsert_rows(
+            s,
+            Job.__table__,
+            [
+                _job_values(run_id, "1", "New", "h1b"),
+                _job_values(run_id, "2", "Second", "h2"),
+            ],
+            key=("job_id", "site"),
+            update_columns=["title", "content_hash"],
+        )
+
+    jobs = _jobs(session_factory)
+    assert sorted(jobs) == ["1", "2"]
+    assert (jobs["1"].title, jobs["1"].content_hash) == ("New", "h1b")
+    assert jobs["2"].title == "Second"
+
+
+def test_update_rows_groups_rows_by_their_columns(session_factory, run_id):
+    with session_factory.begin() as s:
+        insert_rows(
+            s,
+            Job.__table__,
+            [
+                _job_values(run_id, "1", "One", "h1"),
+                _job_values(run_id, "2", "Two", "h2"),
+            ],
+        )
+    ids = {job_id: job.id for job_id, job in _jobs(session_factory).items()}
+    with session_factory.begin() as s:
+        update_rows(
+            s,
+            Job.__table__,
+            [
+                {"id": ids["1"], "title": "One!"},
+                {"id": ids["2"], "content_hash": "h2b", "is_active": False},
+                {"id": ids["1"]},  # nothing to set
+            ],
+        )
+
+    jobs = _jobs(session_factory)
+    assert (jobs["1"].title, jobs["1"].content_hash) == ("One!", "h1")
+    assert (jobs["2"].title, jobs["2"].content_hash) == ("Two", "h2b")
+    assert jobs["2"].is_active is False
+
+
+def _planned_insert(job_id, title, content_hash):
+    job = Job(
+        job_id=job_id,
+        site="acme",
+        title=title,
+        content_hash=content_hash,
+        raw_hash="r-" + job_id,
+        discovery_date=utc_now_naive(),
+    )
+    return run._PlannedRow("insert", job_id, None, job, None, None)
+
+
+def test_write_planned_rows_replans_inserts_saved_by_another_writer(
+    session_factory, run_id
+):
+    # Another writer saved "1" and "2" after this batch was planned.
+    with session_factory.begin() as s:
+        insert_rows(
+            s,
+            Job.__table__,
+            [
+                _job_values(run_id, "1", "Same", "h1"),
+                _job_values(run_id, "2", "Old", "h2"),
+            ],
+        )
+
+    batch = [
+        _planned_insert("1", "Same", "h1"),
+        _planned_insert("2", "New", "h2b"),
+        _planned_insert("3", "Fresh", "h3"),
+    ]
+    with session_factory.begin() as s:
+        run._write_planned_rows(s, "acme", run_id, batch)
+
+    assert [row.kind for row in batch] == ["touch", "update", "insert"]
+    assert batch[1].changed == ["title"]
+
+    jobs = _jobs(session_factory)
+    assert sorted(jobs) == ["1", "2", "3"]
+    assert jobs["2"].title == "New"
+    assert jobs["1"].raw_hash == "r-1"
+    with session_factory() as s:
+        changes = {
+            change.job_id_text: change
+            for change in s.execute(select(JobChange)).scalars()
+        }
+    # The touched job logs nothing, the conflicting one an update.
+    assert sorted(changes) == ["2", "3"]
+    assert changes["2"].change_type == "update"
+    assert (changes["2"].old_hash, changes["2"].new_hash) == ("h2", "h2b")
+    assert changes["2"].job_pk == jobs["2"].id
+    assert changes["3"].change_type == "insert"
+    assert changes["3"].job_pk == jobs["3"].id
@@ -0,0 +1,148 @@
+import copy
+import random
+import re
+
+import pytest
+
+from app import utils
+from app.utils import CannedTextFilter, remove_canned_text
+
+
+@pytest.fixture(autouse=True)
+def plain_sentences(monkeypatch):
+    # No NLTK data is needed to check how sentences are matched and dropped.
+    monkeypatch.setattr(utils, "ensure_nltk", lambda verbose=False: None)
+    monkeypatch.setattr(
+        utils.nltk, "sent_tokenize", lambda text: re.split(r"(?<=[.!?])\s+", text)
+    )
+
+
+CANNED = ["We are an equal opportunity employer.", "Apply today!"]
+OWN = [f"Role detail {n}." for n in range(8)] + ["Team A rocks.", "Remote ok?"]
+
+
+def _site(rng, n_jobs):
+    jobs = []
+    for n in range(n_jobs):
+        job = {"JobID": str(n), "JobTitle": f"Job {n}"}
+        if rng.random() < 0.85:
+            sents = rng.sample(OWN, rng.randint(1, 3))
+            if rng.random() < 0.9:
+                sents += CANNED
+            rng.shuffle(sents)
+            job["JobDesc"] = " ".join(sents)
+        jobs.append(job)
+    return jobs
+
+
+def _stream(jobs, cuts, canned=None):
+    canned = canned or CannedTextFilter()
+    out = []
+    bounds = [0, *cuts, len(jobs)]
+    for i, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        out += canned.apply(jobs[start:end], final=i == len(bounds) - 2)
+    return out
+
+
+def test_streamed_chunks_match_remove_canned_text():
+    rng = random.Random(16)
+    for _ in range(500):
+        jobs = _site(rng, rng.randint(0, 12))
+        splits = range(1, len(jobs))
+        cuts = sorted(rng.sample(splits, rng.randint(0, min(4, len(splits)))))
+        expected = remove_canned_text(copy.deepcopy(jobs))
+        assert _stream(copy.deepcopy(jobs), cuts) == expected
+
+
+def test_sentence_canned_in_one_chunk_only_is_kept():
+    jobs = [
+        {"JobID": "1", "JobDesc": "Team A rocks. Apply today!"},
+        {"JobID": "2", "JobDesc": "Team A rocks. Apply today!"},
+        {"JobID": "3", "JobDesc": "Remote ok? Apply today!"},
+    ]
+    out = _stream(copy.deepcopy(jobs), [2])
+    assert [j["JobDesc"] for j in out] == [
+        "Team A rocks.",
+        "Team A rocks.",
+        "Remote ok?",
+    ]
+    assert out == remove_canned_text(copy.deepcopy(jobs))
+
+
+def test_jobs_are_held_until_the_canned_set_is_known():
+    canned = CannedTextFilter()
+    first = [
+        {"JobID": "1", "JobDesc": "Role detail 1. Apply today!"},
+        {"JobID": "2", "JobDesc": "Role detail 2. Apply today!"},
+    ]
+    assert canned.apply(first, final=False) == []
+    assert len(canned.held) == 2
+
+    # Nothing is shared any more, so every held job is released unstripped.
+    out = canned.apply([{"JobID": "3", "JobDesc": "Remote ok?"}], final=False)
+    assert [j["JobID"] for j in out] == ["1", "2", "3"]
+    assert canned.sentences == set()
+    assert out[0]["JobDesc"] == "Role detail 1. Apply today!"
+    assert canned.held == []
+
+
+def test_a_single_description_is_left_as_is():
+    jobs = [{"JobID": "1", "JobDesc": "Apply today!"}, {"JobID": "2"}]
+    assert _stream(copy.deepcopy(jobs), [1]) == jobs
+
+
+def test_resumed_filter_strips_with_the_saved_sentences():
+    canned = CannedTextFilter(["Apply today!"])
+    out = canned.apply(
+        [{"JobID": "9", "JobDesc": "Role detail 9. Apply today!"}], final=False
+    )
+    assert [j["JobDesc"] for j in out] == ["Role detail 9."]
+
+
+def test_shared_boilerplate_releases_jobs_before_the_last_chunk():
+    canned = CannedTextFilter(max_held=2)
+    chunks = [
+        [{"JobID": "1", "JobDesc": "Role detail 1. Apply today!"}],
+        [{"JobID": "2", "JobDesc": "Role detail 2. Apply today!"}],
+        [{"JobID": "3", "JobDesc": "Role detail 3. Apply today!"}],
+    ]
+    assert canned.apply(chunks[0], final=False) == []
+
+    out = canned.apply(chunks[1], final=False)
+    assert [j["JobDesc"] for j in out] == ["Role detail 1.", "Role detail 2."]
+    assert canned.settled_early
+    assert canned.held == []
+
+    out = canned.apply(chunks[2], final=False)
+    assert [j["JobDesc"] for j in out] == ["Role detail 3."]
+
+
+def test_later_chunks_narrow_an_early_set():
+    canned = CannedTextFilter(max_held=2)
+    canned.apply(
+        [
+            {"JobID": "1", "JobDesc": "Team A rocks. Apply today!"},
+            {"JobID": "2", "JobDesc": "Team A rocks. Apply today!"},
+        ],
+        final=False,
+    )
+    assert canned.sentences == {"Team A rocks.", "Apply today!"}
+
+    out = canned.apply(
+        [{"JobID": "3", "JobDesc": "Team A rocks. Remote ok? Apply today!"}],
+        final=False,
+    )
+    assert [j["JobDesc"] for j in out] == ["Remote ok?"]
+    out = canned.apply(
+        [{"JobID": "4", "JobDesc": "Remote ok? Apply today!"}], final=True
+    )
+    assert canned.sentences == {"Apply today!"}
+    assert [j["JobDesc"] for j in out] == ["Remote ok?"]
+
+
+def test_hold_limit_releases_jobs_without_descriptions():
+    canned = CannedTextFilter(max_held=2)
+    jobs = [{"JobID": "1"}, {"JobID": "2", "JobDesc": "Apply today!"}]
+    assert canned.apply(copy.deepcopy(jobs), final=False) == jobs
+    assert canned.sentences is None
+    assert not canned.settled_early
@@ -0,0 +1,49 @@
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.fixtures import Fixture, FixtureReplayer, FixtureStore
+
+
+@pytest.fixture
+def replayer(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    store.save(
+        Fixture(
+            url="https://jobs.example.com/list",
+            status=200,
+            content_type="text/html",
+            body="<p>Jobs</p><script>track()</script>",
+        )
+    )
+    replayer = FixtureReplayer(store)
+    try:
+        yield replayer
+    finally:
+        replayer.close()
+
+
+def _get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=10) as resp:
+            return resp.status, resp.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+
+def test_replay_serves_stored_pages_without_scripts(replayer):
+    status, body = _get(replayer.nav_url("https://jobs.example.com/list"))
+    assert (status, body) == (200, "<p>Jobs</p>")
+    assert replayer.misses == 0
+
+
+def test_concurrent_misses_are_all_counted(replayer):
+    urls = [
+        replayer.nav_url(f"https://jobs.example.com/jobs/{n}") for n in range(200)
+    ]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = [status for status, _ in pool.map(_get, urls)]
+    assert statuses == [404] * len(urls)
+    assert replayer.misses == len(urls)
@@ -0,0 +1,107 @@
+from bs4 import BeautifulSoup
+
+from app import scraper as scraper_module
+from app.http_fetch import HttpPage
+from app.scraper import StepScraper
+from app.step_plan import compile_steps
+
+LIST_URL = "https://jobs.example.com/list"
+LIST_HTML = """
+<ul>
+  <li><a class="job-link" href="/jobs/1" data-id="1">Engineer</a></li>
+  <li><a class="job-link" href="/jobs/2" data-id="2">Analyst</a></li>
+</ul>
+"""
+
+
+class FakeDriver:
+    """Just enough WebDriver for the snapshot branch of _extract_from_list."""
+
+    current_url = LIST_URL
+
+    def __init__(self, html):
+        self.soup = BeautifulSoup(html, "html.parser")
+
+    def find_elements(self, _by, css):
+        return self.soup.select(css)
+
+    def execute_script(self, script, *args):
+        if script == scraper_module._ITEM_SNAPSHOT_JS:
+            return [str(el) for el in self.soup.select(args[0])]
+        # _BULK_EXTRACT_JS: answer as Chrome does for a rejected selector.
+        return None
+
+
+def _data_extract(extract_steps):
+    plans = compile_steps(
+        {
+            "acme": [
+                {
+                    "action": "data_extract",
+                    "focus_scope": "a.job-link",
+                    "extract_steps": extract_steps,
+                }
+            ]
+        }
+    )
+    return plans["acme"].steps[0]
+
+
+LIST_STEPS = [
+    {
+        "action": "extract",
+        "as_column": "JobID",
+        "xpath": "a.job-link",
+        "attr_target": "data-id",
+    },
+    {"action": "extract", "as_column": "JobTitle", "xpath": "a.job-link"},
+]
+
+
+def test_selectors_naming_the_item_match_in_both_engines(tmp_path):
+    step = _data_extract(LIST_STEPS)
+    scraper = StepScraper(str(tmp_path / "steps.json"))
+
+    browser = scraper._extract_from_list(
+        FakeDriver(LIST_HTML),
+        step.get("focus_scope"),
+        list(step.extract_steps),
+        include_item_delay=False,
+    )
+    http = scraper._extract_from_html_list(
+        page=HttpPage(url=LIST_URL, status=200, text=LIST_HTML), step=step
+    )
+    assert browser == [
+        {"JobID": "1", "JobTitle": "Engineer"},
+        {"JobID": "2", "JobTitle": "Analyst"},
+    ]
+    assert http == browser
+
+
+def test_http_link_css_can_name_the_item(tmp_path, monkeypatch):
+    step = _data_extract(
+        LIST_STEPS
+        + [
+            {"action": "redirect", "link_css": "a.job-link"},
+            {"action": "extract", "as_column": "JobDesc", "xpath": "div.desc"},
+        ]
+    )
+    scraper = StepScraper(str(tmp_path / "steps.json"))
+    fetched = []
+
+    def get_many(urls, **_kwargs):
+        fetched.extend(urls)
+        return [
+            HttpPage(url=url, status=200, text=f"<div class='desc'>About {url}</div>")
+            for url in urls
+        ]
+
+    monkeypatch.setattr(scraper, "_http_get_many", get_many)
+    jobs = scraper._extract_from_html_list(
+        page=HttpPage(url=LIST_URL, status=200, text=LIST_HTML), step=step
+    )
+    assert fetched == [
+        "https://jobs.example.com/jobs/1",
+        "https://jobs.example.com/jobs/2",
+    ]
+    assert jobs[0]["JobDesc"] == "About https://jobs.example.com/jobs/1"
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from app.json_writer import SiteJsonStream, save_site_json
+
+JOBS = [
+    {"JobID": "1", "JobTitle": "Café barista", "JobDesc": "Line one.\nLine two."},
+    {"JobID": "2", "JobTitle": "Engineer", "Tags": ["a", "b"], "Meta": {"k": 1}},
+    {"JobID": "3", "JobTitle": "Analyst", "JobPay": None},
+]
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("chunks", [[], [JOBS], [JOBS[:1], [], JOBS[1:]]])
+def test_stream_writes_the_same_bytes_as_save_site_json(tmp_path, chunks):
+    jobs = [job for chunk in chunks for job in chunk]
+    expected = _read(save_site_json(str(tmp_path / "whole"), "acme", jobs))
+
+    stream = SiteJsonStream(str(tmp_path / "stream"), "acme")
+    for chunk in chunks:
+        stream.write(chunk)
+    assert _read(stream.close()) == expected
+    assert not os.path.exists(stream.out + ".tmp")
+
+
+def test_discard_keeps_the_last_complete_file(tmp_path):
+    out = save_site_json(str(tmp_path), "acme", JOBS)
+    before = _read(out)
+
+    stream = SiteJsonStream(str(tmp_path), "acme")
+    stream.write(JOBS[:1])
+    stream.discard()
+    assert _read(out) == before
+    assert not os.path.exists(out + ".tmp")
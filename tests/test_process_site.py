@@ -0,0 +1,102 @@
+import pytest
+from sqlalchemy import event, select
+
+import run
+from app.models import IntegrationRun, Job, JobChange
+
+
+@pytest.fixture(autouse=True)
+def offline_text(monkeypatch, tmp_path):
+    # Keep normalization off NLTK data and the JSON output out of the repo.
+    monkeypatch.setattr(run, "extract_keywords", lambda desc: [])
+    monkeypatch.setattr(run, "remove_canned_text", lambda jobs: jobs)
+    monkeypatch.setattr(run, "OUTPUT_DIR", str(tmp_path))
+
+
+def _jobs(descs):
+    return [
+        {
+            "JobID": f"J{n}",
+            "JobTitle": f"Job {n}",
+            "JobUrl": f"https://example.com/{n}",
+            "JobDesc": desc,
+        }
+        for n, desc in enumerate(descs)
+    ]
+
+
+def _scrape(session_factory, jobs, *, per_job_commit, use_savepoints=True):
+    with session_factory.begin() as s:
+        run_obj = IntegrationRun(user="test", mode="steps")
+        s.add(run_obj)
+        s.flush()
+        run_id = run_obj.id
+    counters = run._new_counters()
+    with session_factory() as s:
+        run._process_site(
+            s,
+            "acme",
+            jobs,
+            run_id,
+            counters,
+            use_savepoints=use_savepoints,
+            per_job_commit=per_job_commit,
+            logger=run.get_logger(),
+        )
+        s.commit()
+    return counters
+
+
+def _row_gets(session_factory):
+    """Record SELECTs that load one jobs row by primary key."""
+    statements = []
+    engine = session_factory.kw["bind"]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, *_args):
+        if statement.startswith("SELECT") and "WHERE jobs.id = ?" in statement:
+            statements.append(statement)
+
+    return statements
+
+
+@pytest.mark.parametrize(
+    "per_job_commit, use_savepoints", [(True, False), (False, False)]
+)
+def test_row_by_row_updates_load_changed_rows_in_one_query(
+    session_factory, monkeypatch, per_job_commit, use_savepoints
+):
+    monkeypatch.setenv("DB_BULK_UPSERT", "false")
+    _scrape(session_factory, _jobs(["a", "b", "c", "d"]), per_job_commit=True)
+
+    gets = _row_gets(session_factory)
+    counters = _scrape(
+        session_factory,
+        _jobs(["a", "b2", "c2", "d2"]),
+        per_job_commit=per_job_commit,
+        use_savepoints=use_savepoints,
+    )
+    assert gets == []
+    assert counters["updated_count"] == 3
+    assert counters["unchanged_count"] == 1
+
+    with session_factory() as s:
+        descs = dict(s.execute(select(Job.job_id, Job.desc)).all())
+        updates = s.execute(
+            select(JobChange.job_id_text, JobChange.changed_fields).where(
+                JobChange.change_type == "update"
+            )
+        ).all()
+    assert descs == {"J0": "a", "J1": "b2", "J2": "c2", "J3": "d2"}
+    assert sorted(updates) == [("J1", "desc"), ("J2", "desc"), ("J3", "desc")]
+
+
+def test_a_job_listed_twice_updates_its_first_copy(session_factory, monkeypatch):
+    monkeypatch.setenv("DB_BULK_UPSERT", "false")
+    jobs = _jobs(["a", "b"])
+    jobs.append({**jobs[0], "JobDesc": "a2"})
+    counters = _scrape(session_factory, jobs, per_job_commit=True)
+    assert (counters["inserted_count"], counters["updated_count"]) == (2, 1)
+    assert counters["error_count"] == 0
+    with session_factory() as s:
+        assert s.scalar(select(Job.desc).where(Job.job_id == "J0")) == "a2"
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from app import rate_limit
+from app.rate_limit import DomainRateLimiter, parse_retry_after, registrable_domain
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limit.time, "sleep", clock.sleep)
+    return clock
+
+
+@pytest.mark.parametrize(
+    "value, domain",
+    [
+        ("https://acme.wd5.myworkdayjobs.com/en-US/jobs", "myworkdayjobs.com"),
+        ("jobs.example.co.uk:8443", "example.co.uk"),
+        ("http://127.0.0.1:8765/list", "127.0.0.1"),
+        ("Example.COM.", "example.com"),
+        ("", ""),
+    ],
+)
+def test_registrable_domain(value, domain):
+    assert registrable_domain(value) == domain
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after(-3) == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    later = datetime.now(timezone.utc) + timedelta(seconds=120)
+    assert 100 < parse_retry_after(format_datetime(later, usegmt=True)) <= 120
+    earlier = datetime.now(timezone.utc) - timedelta(seconds=120)
+    assert parse_retry_after(format_datetime(earlier, usegmt=True)) == 0.0
+
+
+def test_acquire_spends_the_burst_then_waits_for_refill(clock):
+    limiter = DomainRateLimiter(rps=2, burst=2)
+    url = "https://a.example.com/jobs"
+    assert limiter.acquire(url) == 0.0
+    assert limiter.acquire("https://b.example.com/") == 0.0
+    assert limiter.acquire(url) == pytest.approx(0.5)
+    # Other domains have their own bucket.
+    assert limiter.acquire("https://other.org/") == 0.0
+
+
+def test_zero_rps_and_disabled_limiters_never_wait(clock):
+    assert DomainRateLimiter(rps=0).acquire("https://example.com/") == 0.0
+    limiter = DomainRateLimiter(rps=1, enabled=False)
+    assert limiter.observe("https://example.com/", 429) == 0.0
+    assert [limiter.acquire("https://example.com/") for _ in range(3)] == [0.0] * 3
+
+
+def test_backoff_grows_per_strike_and_resets_on_success(clock):
+    limiter = DomainRateLimiter(rps=0, backoff_sec=5, backoff_max_sec=12)
+    url = "https://example.com/"
+    assert limiter.observe(url, 429) == 5
+    assert limiter.observe(url, 503) == 10
+    assert limiter.observe(url, 429) == 12  # capped
+    assert limiter.acquire(url) == pytest.approx(12)
+
+    assert limiter.observe(url, 404) == 0.0  # neither a strike nor a reset
+    assert limiter.observe(url, 429) == 12
+    clock.now += 60
+    assert limiter.observe(url, 200) == 0.0
+    assert limiter.observe(url, 429) == 5
+
+
+def test_retry_after_overrides_the_backoff(clock):
+    limiter = DomainRateLimiter(rps=0, backoff_sec=5, backoff_max_sec=60)
+    assert limiter.observe("https://example.com/", 429, retry_after="30") == 30
+    assert limiter.observe("https://example.com/", 429, retry_after="600") == 60
+
+
+def test_configure_keeps_the_slowest_rate_for_a_domain(clock):
+    limiter = DomainRateLimiter(rps=10, burst=1)
+    limiter.configure("https://a.example.com/", rps=1)
+    limiter.configure("https://b.example.com/", rps=4)
+    url = "https://example.com/"
+    assert limiter.acquire(url) == 0.0
+    assert limiter.acquire(url) == pytest.approx(1.0)
@@ -0,0 +1,37 @@
+import run
+
+JOB = {
+    "JobID": "42",
+    "JobTitle": "Engineer",
+    "JobUrl": "https://example.com/42",
+    "JobDesc": "<p>Build things.</p>",
+    "JobPay": "$100k",
+    "Location": "Remote",
+    "Team": "Core",
+}
+
+
+def test_raw_hash_ignores_field_order_and_internal_fields():
+    reordered = dict(reversed(list(JOB.items())))
+    assert run._raw_hash(reordered) == run._raw_hash(JOB)
+    assert run._raw_hash({**JOB, "__page": 3}) == run._raw_hash(JOB)
+    # JobID picks the row; it is not content.
+    assert run._raw_hash({**JOB, "JobID": "43"}) == run._raw_hash(JOB)
+
+
+def test_raw_hash_changes_with_any_scraped_field():
+    base = run._raw_hash(JOB)
+    for key, value in [
+        ("JobTitle", "Engineer II"),
+        ("JobDesc", "<p>Build more things.</p>"),
+        ("JobPay", None),
+        ("Location", "Austin"),
+        ("Benefits", "Dental"),
+    ]:
+        assert run._raw_hash({**JOB, key: value}) != base, key
+
+
+def test_normalizer_version_bump_invalidates_every_hash(monkeypatch):
+    before = run._raw_hash(JOB)
+    monkeypatch.setattr(run, "NORMALIZER_VERSION", run.NORMALIZER_VERSION + 1)
+    assert run._raw_hash(JOB) != before
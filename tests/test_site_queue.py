@@ -0,0 +1,159 @@
+from datetime import timedelta
+
+from sqlalchemy import select, update
+
+from app.db import utc_now_naive
+from app.models import SiteQueueItem
+from app.site_queue import (
+    LeaseKeeper,
+    claim_site,
+    claimed_elsewhere,
+    enqueue_sites,
+    finish_site,
+    next_site,
+    release_site,
+    unfinished_count,
+)
+
+
+def _item(session_factory, run_id, site):
+    with session_factory() as s:
+        return s.execute(
+            select(SiteQueueItem).where(
+                SiteQueueItem.run_id == run_id, SiteQueueItem.site == site
+            )
+        ).scalar_one()
+
+
+def _expire(session_factory, run_id, site):
+    with session_factory.begin() as s:
+        s.execute(
+            update(SiteQueueItem)
+            .where(SiteQueueItem.run_id == run_id, SiteQueueItem.site == site)
+            .values(lease_expires_at=utc_now_naive() - timedelta(seconds=1))
+        )
+
+
+def _claim(session_factory, run_id, worker, max_attempts=3):
+    return claim_site(
+        session_factory, run_id, worker, lease_sec=60, max_attempts=max_attempts
+    )
+
+
+def test_enqueue_sites_adds_each_site_once(session_factory, run_id):
+    with session_factory.begin() as s:
+        assert enqueue_sites(s, run_id, ["a", "b", "a"]) == 2
+    with session_factory.begin() as s:
+        assert enqueue_sites(s, run_id, ["b", "c"]) == 1
+    with session_factory() as s:
+        assert unfinished_count(s, run_id) == 3
+
+
+def test_claim_hands_out_sites_in_queue_order_then_none(session_factory, run_id):
+    with session_factory.begin() as s:
+        enqueue_sites(s, run_id, ["a", "b"])
+
+    assert _claim(session_factory, run_id, "w1") == "a"
+    assert _claim(session_factory, run_id, "w2") == "b"
+    assert _claim(session_factory, run_id, "w1") is None
+
+    item = _item(session_factory, run_id, "a")
+    assert item.status == "claimed"
+    assert item.worker == "w1"
+    assert item.attempts == 1
+    assert item.lease_expires_at > utc_now_naive()
+
+
+def test_live_lease_is_not_reclaimed(session_factory, run_id):
+    with session_factory.begin() as s:
+        enqueue_sites(s, run_id, ["a"])
+    assert _claim(session_factory, run_id, "w1") == "a"
+    assert _claim(session_factory, run_id, "w2") is None
+    with session_factory() as s:
+        assert claimed_elsewhere(s, run_id, "w2") == 1
+        assert claimed_elsewhere(s, run_id, "w1") == 0
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(session_factory, run_id):
+    with session_factory.begin() as s:
+        enqueue_sites(s, run_id, ["a"])
+    assert _claim(session_factory, run_id, "w1") == "a"
+    _expire(session_factory, run_id, "a")
+
+    assert _claim(session_factory, run_id, "w2") == "a"
+    item = _item(session_factory, run_id, "a")
+    assert item.worker == "w2"
+    assert item.attempts == 2
+
+    # The worker that lost the lease cannot finish the site any more.
+    with session_factory.begin() as s:
+        assert not finish_site(s, run_id, "a", "w1")
+    with session_factory.begin() as s:
+        assert finish_site(s, run_id, "a", "w2", error="row errors")
+    item = _item(session_factory, run_id, "a")
+    assert item.status == "done"
+    assert item.lease_expires_at is None
+    assert item.last_error == "row errors"
+
+
+def test_site_over_max_attempts_fails_instead_of_being_claimed(
+    session_factory, run_id
+):
+    with session_factory.begin() as s:
+        enqueue_sites(s, run_id, ["a", "b"])
+    assert _claim(session_factory, run_id, "w1", max_attempts=1) == "a"
+    _expire(session_factory, run_id, "a")
+
+    # "a" used its only attempt, so the next claim skips to "b".
+    assert _claim(session_factory, run_id, "w2", max_attempts=1) == "b"
+    item = _item(session_factory, run_id, "a")
+    assert item.status == "failed"
+    assert item.worker is None
+    assert item.last_error == "lease expired 1 time(s)"
+    with session_factory() as s:
+        assert unfinished_count(s, run_id) == 1
+
+
+def test_release_site_requeues_until_max_attempts(session_factory, run_id):
+    with session_factory.begin() as s:
+        enqueue_sites(s, run_id, ["a"])
+    assert _claim(session_factory, run_id, "w1", max_attempts=2) == "a"
+    release_site(session_factory, run_id, "a", "w1", "boom", max_attempts=2)
+    item = _item(session_factory, run_id, "a")
+    assert (item.status, item.worker, item.last_error) == ("pending", None, "boom")
+
+    assert _claim(session_factory, run_id, "w2", max_attempts=2) == "a"
+    release_site(session_factory, run_id, "a", "w2", "boom again", max_attempts=2)
+    assert _item(session_factory, run_id, "a").status == "failed"
+
+    # Releasing a site the worker does not hold is a no-op.
+    release_site(session_factory, run_id, "a", "w1", "late", max_attempts=2)
+    assert _item(session_factory, run_id, "a").last_error == "boom again"
+
+
+def test_next_site_returns_none_once_nothing_is_held_elsewhere(
+    session_factory, run_id
+):
+    with session_factory.begin() as s:
+        enqueue_sites(s, run_id, ["a"])
+    kwargs = dict(lease_sec=60, max_attempts=3, poll_sec=0)
+    assert next_site(session_factory, run_id, "w1", **kwargs) == "a"
+    # w1 itself holds "a", so there is nothing for w1 to wait for.
+    assert next_site(session_factory, run_id, "w1", **kwargs) is None
+
+
+def test_lease_keeper_renews_only_held_sites(session_factory, run_id):
+    with session_factory.begin() as s:
+        enqueue_sites(s, run_id, ["a", "b"])
+    assert _claim(session_factory, run_id, "w1") == "a"
+    assert _claim(session_factory, run_id, "w1") == "b"
+    _expire(session_factory, run_id, "a")
+    _expire(session_factory, run_id, "b")
+
+    keeper = LeaseKeeper(session_factory, run_id, "w1", lease_sec=60)
+    keeper._held.add("a")
+    keeper.renew()
+
+    now = utc_now_naive()
+    assert _item(session_factory, run_id, "a").lease_expires_at > now
+    assert _item(session_factory, run_id, "b").lease_expires_at < now
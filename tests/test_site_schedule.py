@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import IntegrationRun, JobChange, SiteCheckpoint
+from app.site_schedule import cadence_hours, site_cadences
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+@pytest.fixture
+def history(session_factory):
+    """Record one finished scrape of ``site`` ``days_ago`` before NOW."""
+
+    def add(site, days_ago, *, change=None, site_error=None):
+        with session_factory.begin() as s:
+            run = IntegrationRun(
+                user="test",
+                mode="steps",
+                started_at=NOW - timedelta(days=days_ago),
+            )
+            s.add(run)
+            s.flush()
+            s.add(
+                SiteCheckpoint(
+                    run_id=run.id, site=site, status="done", site_error=site_error
+                )
+            )
+            if change:
+                change_type, source = change
+                s.add(
+                    JobChange(
+                        run_id=run.id,
+                        job_id_text="1",
+                        site=site,
+                        change_type=change_type,
+                        change_source=source,
+                    )
+                )
+
+    return add
+
+
+def _cadences(session_factory, sites):
+    with session_factory() as s:
+        return site_cadences(s, sites, now=NOW)
+
+
+def test_cadence_hours_tiers():
+    assert cadence_hours(0.0, 2, 168) == 0.0  # too little history
+    assert cadence_hours(0.6, 5, 168) == 0.0
+    assert cadence_hours(0.3, 5, 168) == 24.0
+    assert cadence_hours(0.1, 5, 168) == 72.0
+    assert cadence_hours(0.05, 5, 168) == 168
+    assert cadence_hours(0.1, 5, 48) == 48
+
+
+def test_quiet_site_slows_down_and_busy_site_stays_due(session_factory, history):
+    for days_ago in (1, 2, 3, 4):
+        history("quiet", days_ago)
+        history("busy", days_ago, change=("insert", "site"))
+
+    cadences = _cadences(session_factory, ["quiet", "busy", "new"])
+    quiet = cadences["quiet"]
+    assert (quiet.scrapes, quiet.changed, quiet.interval_hours) == (4, 0, 168)
+    assert quiet.last_scraped_at == NOW - timedelta(days=1)
+    assert not quiet.due
+
+    assert cadences["busy"].interval_hours == 0.0
+    assert cadences["busy"].due
+    assert cadences["new"].scrapes == 0
+    assert cadences["new"].due
+
+
+def test_daily_site_is_due_within_the_slack(session_factory, history):
+    history("daily", 0.92, change=("update", "site"))
+    for days_ago in (2, 3, 4):
+        history("daily", days_ago)
+    cadence = _cadences(session_factory, ["daily"])["daily"]
+    assert cadence.interval_hours == 24.0
+    assert cadence.due
+
+
+def test_ai_changes_and_scrapes_with_a_site_error_do_not_count(
+    session_factory, history
+):
+    for days_ago in (2, 3, 4):
+        history("acme", days_ago, change=("update", "ai"))
+    # A scrape cut short neither resets the clock nor counts as quiet.
+    history("acme", 0.5, site_error="time budget exceeded")
+    # Older than SITE_SCHEDULE_WINDOW_DAYS.
+    history("acme", 45, change=("insert", "site"))
+
+    cadence = _cadences(session_factory, ["acme"])["acme"]
+    assert (cadence.scrapes, cadence.changed) == (3, 0)
+    assert cadence.last_scraped_at == NOW - timedelta(days=2)
+    assert cadence.interval_hours == 168
+    assert not cadence.due
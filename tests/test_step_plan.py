@@ -0,0 +1,122 @@
+import json
+import os
+
+import pytest
+
+from app.step_plan import StepPlanError, compile_steps, split_json_path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _errors(data):
+    with pytest.raises(StepPlanError) as info:
+        compile_steps(data)
+    return info.value.errors
+
+
+def test_example_steps_compile():
+    with open(os.path.join(ROOT, "steps.json.example"), encoding="utf-8") as f:
+        plans = compile_steps(json.load(f))
+    plan = plans["crowdstrike"]
+    assert plan.engine == "browser"
+    extract = plan.steps[1]
+    assert extract.focus.select  # a compiled soupsieve selector
+    assert [step.action for step in extract.extract_steps][:4] == [
+        "extract",
+        "extract",
+        "extract",
+        "redirect",
+    ]
+    # Compiled plans still read like the step dicts they came from.
+    assert extract.extract_steps[0].get("as_column") == "JobID"
+    assert extract.extract_steps[0].path == "crowdstrike[1].extract_steps[0]"
+
+
+def test_json_paths_and_regexes_are_compiled_once():
+    plans = compile_steps(
+        {
+            "api": [
+                {
+                    "action": "json_data_extract",
+                    "focus_scope": "jobs",
+                    "extract_steps": [
+                        {"action": "extract", "as_column": "JobID", "key": "a.b>c"}
+                    ],
+                },
+                {
+                    "action": "json_html_data_extract",
+                    "focus_scope": "li",
+                    "html_key": "body.html",
+                    "extract_steps": [
+                        {
+                            "action": "regex_extract",
+                            "using_column": "JobDesc",
+                            "as_column": "JobPay",
+                            "regex_pattern": r"\$(\d+)",
+                        }
+                    ],
+                },
+            ]
+        }
+    )
+    json_step, html_step = plans["api"].steps
+    assert json_step.extract_steps[0].key_path == ("a", "b", "c")
+    assert html_step.html_paths == (("body", "html"),)
+    assert html_step.extract_steps[0].regex.search("pay $120").group(1) == "120"
+    assert split_json_path(None) == ()
+
+
+def test_validation_reports_every_problem_with_its_path():
+    errors = _errors(
+        {
+            "acme": [
+                {"action": "load_url"},
+                {"action": "fly"},
+                {
+                    "action": "data_extract",
+                    "focus_scope": "li[",
+                    "extract_steps": [
+                        {"action": "extract", "as_column": "JobID"},
+                        {
+                            "action": "regex_extract",
+                            "using_column": "JobDesc",
+                            "as_column": "JobPay",
+                            "regex_pattern": r"\d+",
+                        },
+                        {"action": "redirect", "using_column": "JobUrl", "tabs": 0},
+                    ],
+                },
+                {"action": "site_config", "rate_limit_rps": -1, "engine": "curl"},
+            ],
+            "bad": {},
+        }
+    )
+    assert "acme[0].url is required" in errors
+    assert 'acme[1].action "fly" is not supported by StepScraper' in errors
+    assert any(
+        e.startswith("acme[2].focus_scope is not a valid CSS selector") for e in errors
+    )
+    step = "acme[2].extract_steps[0]"
+    assert f"{step}.xpath or {step}.selector is required" in errors
+    assert "acme[2].extract_steps[1].regex_pattern needs a capture group" in errors
+    assert "acme[2].extract_steps[2].tabs must be a positive integer" in errors
+    assert "acme[3].rate_limit_rps must be a non-negative number" in errors
+    assert 'acme[3].engine must be "browser" or "http"' in errors
+    assert "bad must be an array of step objects" in errors
+
+
+def test_http_engine_rejects_browser_only_steps():
+    errors = _errors(
+        {
+            "plain": [
+                {"action": "site_config", "engine": "http"},
+                {"action": "load_url", "url": "https://example.com/"},
+                {"action": "click_button", "selector": "button.more"},
+            ]
+        }
+    )
+    assert errors == ['plain[2].action "click_button" needs engine "browser"']
+
+
+def test_top_level_document_must_be_an_object():
+    assert _errors([]) == ["steps.json must contain a top-level JSON object"]